@@ -0,0 +1,74 @@
+# backend/alembic/env.py
+
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import engine_from_config, pool
+
+from app.core.config import settings
+from app.db.database import Base
+from app.db import models  # noqa: F401 - registers all tables on Base.metadata
+from app.db.partitions import is_log_partition
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+# The database URL always comes from the app settings (.env / environment).
+config.set_main_option("sqlalchemy.url", settings.DATABASE_URL.replace("%", "%%"))
+target_metadata = Base.metadata
+
+
+# Postgres-only full-text search column of health_tips and its index (migration 0007).
+POSTGRES_ONLY = {("column", "search_vector"), ("index", "ix_health_tips_search_vector")}
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    """
+    Leaves medication_logs' partitions (and their indexes) and the
+    Postgres-only objects above out of autogenerate.
+    """
+    if (type_, name) in POSTGRES_ONLY:
+        return False
+    table_name = name if type_ == "table" else getattr(getattr(obj, "table", None), "name", None)
+    return not is_log_partition(table_name)
+
+
+def run_migrations_offline() -> None:
+    """Writes the migration SQL to stdout instead of running it (alembic upgrade --sql)."""
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url"),
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Runs the migrations against the database."""
+    connectable = config.attributes.get("connection")
+    if connectable is not None:
+        # A connection was passed in programmatically; reuse it.
+        context.configure(connection=connectable, target_metadata=target_metadata, include_object=include_object)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+    with connectable.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata, include_object=include_object)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,110 @@
+"""baseline schema (tables created by the old create_all)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16
+
+Databases created before migrations existed already have these tables,
+so each table is only created when it is missing. That lets
+`alembic upgrade head` run on both new and existing databases.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "users" not in existing:
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("full_name", sa.String()),
+            sa.Column("email", sa.String(), nullable=False),
+            sa.Column("hashed_password", sa.String(), nullable=False),
+            sa.Column("is_active", sa.Boolean()),
+            sa.Column("dob", sa.Date()),
+            sa.Column("address", sa.String()),
+            sa.Column("reset_password_token", sa.String(), unique=True, nullable=True),
+            sa.Column("reset_token_expires_at", sa.DateTime(), nullable=True),
+            sa.Column("notifications_enabled", sa.Boolean()),
+        )
+        op.create_index("ix_users_id", "users", ["id"])
+        op.create_index("ix_users_full_name", "users", ["full_name"])
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    if "medications" not in existing:
+        op.create_table(
+            "medications",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("dosage", sa.String(), nullable=False),
+            sa.Column("timing_type", sa.String()),
+            sa.Column("meal_timing", sa.String(), nullable=True),
+            sa.Column("specific_time", sa.Time(), nullable=True),
+            sa.Column("frequency_type", sa.String()),
+            sa.Column("frequency_details", sa.JSON(), nullable=True),
+            sa.Column("last_taken_at", sa.DateTime(), nullable=True),
+            sa.Column("owner_id", sa.Integer(), sa.ForeignKey("users.id")),
+        )
+        op.create_index("ix_medications_id", "medications", ["id"])
+
+    if "medication_logs" not in existing:
+        op.create_table(
+            "medication_logs",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("medication_id", sa.Integer(), sa.ForeignKey("medications.id")),
+            sa.Column("owner_id", sa.Integer(), sa.ForeignKey("users.id")),
+            sa.Column("taken_at", sa.DateTime()),
+        )
+        op.create_index("ix_medication_logs_id", "medication_logs", ["id"])
+
+    if "appointments" not in existing:
+        op.create_table(
+            "appointments",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("doctor_name", sa.String(), nullable=False),
+            sa.Column("appointment_datetime", sa.DateTime(), nullable=False),
+            sa.Column("location", sa.String()),
+            sa.Column("purpose", sa.String()),
+            sa.Column("owner_id", sa.Integer(), sa.ForeignKey("users.id")),
+        )
+        op.create_index("ix_appointments_id", "appointments", ["id"])
+
+    if "emergency_contacts" not in existing:
+        op.create_table(
+            "emergency_contacts",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("contact_name", sa.String(), nullable=False),
+            sa.Column("phone_number", sa.String(), nullable=False),
+            sa.Column("relationship_type", sa.String()),
+            sa.Column("owner_id", sa.Integer(), sa.ForeignKey("users.id")),
+        )
+        op.create_index("ix_emergency_contacts_id", "emergency_contacts", ["id"])
+
+    if "health_tips" not in existing:
+        op.create_table(
+            "health_tips",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("tip_text", sa.Text(), nullable=False),
+            sa.Column("category", sa.String()),
+        )
+        op.create_index("ix_health_tips_id", "health_tips", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("health_tips")
+    op.drop_table("emergency_contacts")
+    op.drop_table("appointments")
+    op.drop_table("medication_logs")
+    op.drop_table("medications")
+    op.drop_table("users")
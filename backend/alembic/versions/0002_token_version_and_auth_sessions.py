@@ -0,0 +1,50 @@
+"""add users.token_version and the auth_sessions table
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16
+
+Before migrations existed, create_all could already have created auth_sessions,
+but it never adds columns to existing tables. So both steps check first.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    user_columns = {column["name"] for column in inspector.get_columns("users")}
+    if "token_version" not in user_columns:
+        op.add_column(
+            "users",
+            sa.Column("token_version", sa.Integer(), nullable=False, server_default="0"),
+        )
+
+    if "auth_sessions" not in inspector.get_table_names():
+        op.create_table(
+            "auth_sessions",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("token_hash", sa.String(length=64), nullable=False),
+            sa.Column("expires_at", sa.DateTime(), nullable=False),
+            sa.Column("created_at", sa.DateTime()),
+        )
+        op.create_index("ix_auth_sessions_id", "auth_sessions", ["id"])
+        op.create_index("ix_auth_sessions_user_id", "auth_sessions", ["user_id"])
+        op.create_index("ix_auth_sessions_token_hash", "auth_sessions", ["token_hash"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_table("auth_sessions")
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("token_version")
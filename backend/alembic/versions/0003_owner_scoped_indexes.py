@@ -0,0 +1,45 @@
+"""index owner_id and the time columns used by list, dashboard and scheduler queries
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16
+
+Every list endpoint filters by owner_id, the dashboard and the scheduler also
+filter medication_logs by taken_at and appointments by appointment_datetime.
+The composite indexes lead with owner_id, so they also serve plain owner_id
+lookups on those two tables.
+Indexes that create_all already made are skipped.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ("ix_medications_owner_id", "medications", ["owner_id"]),
+    ("ix_medication_logs_owner_id_taken_at", "medication_logs", ["owner_id", "taken_at"]),
+    ("ix_medication_logs_owner_id_medication_id_taken_at", "medication_logs", ["owner_id", "medication_id", "taken_at"]),
+    ("ix_medication_logs_medication_id", "medication_logs", ["medication_id"]),
+    ("ix_appointments_owner_id_appointment_datetime", "appointments", ["owner_id", "appointment_datetime"]),
+    ("ix_emergency_contacts_owner_id", "emergency_contacts", ["owner_id"]),
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        if name not in {index["name"] for index in inspector.get_indexes(table)}:
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
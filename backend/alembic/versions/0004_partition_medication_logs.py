@@ -0,0 +1,129 @@
+"""partition medication_logs by month on taken_at (Postgres)
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16
+
+On Postgres, medication_logs becomes a table partitioned by month on
+taken_at, so queries with a taken_at range only read the matching
+partitions, and old months can be detached or archived (app/db/partitions.py).
+- The primary key becomes (id, taken_at), as Postgres requires the partition key in it.
+- A DEFAULT partition catches rows outside the created months.
+- Existing rows are copied over, keeping their ids and the id sequence.
+Other databases (SQLite for local runs) keep a plain table; only
+taken_at becomes NOT NULL there as well.
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Months created ahead of the current one (later ones come from the daily job).
+MONTHS_AHEAD = 3
+
+INDEXES = [
+    ("ix_medication_logs_id", ["id"]),
+    ("ix_medication_logs_owner_id_taken_at", ["owner_id", "taken_at"]),
+    ("ix_medication_logs_owner_id_medication_id_taken_at", ["owner_id", "medication_id", "taken_at"]),
+    ("ix_medication_logs_medication_id", ["medication_id"]),
+]
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_month_partition(month: date) -> None:
+    op.execute(
+        f"CREATE TABLE medication_logs_y{month.year}m{month.month:02d} "
+        f"PARTITION OF medication_logs "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # taken_at is naive UTC; SQLite's CURRENT_TIMESTAMP already is.
+    now_utc = "timezone('UTC', now())" if bind.dialect.name == "postgresql" else "CURRENT_TIMESTAMP"
+    op.execute(f"UPDATE medication_logs SET taken_at = {now_utc} WHERE taken_at IS NULL")
+
+    if bind.dialect.name != "postgresql":
+        with op.batch_alter_table("medication_logs") as batch_op:
+            batch_op.alter_column("taken_at", existing_type=sa.DateTime(), nullable=False)
+        return
+
+    # Index names are per schema, so the old table's ones have to go first.
+    op.execute("ALTER TABLE medication_logs RENAME TO medication_logs_unpartitioned")
+    op.execute("ALTER TABLE medication_logs_unpartitioned RENAME CONSTRAINT medication_logs_pkey TO medication_logs_unpartitioned_pkey")
+    for name, _ in INDEXES:
+        op.drop_index(name, table_name="medication_logs_unpartitioned")
+
+    op.execute("""
+        CREATE TABLE medication_logs (
+            id INTEGER NOT NULL DEFAULT nextval('medication_logs_id_seq'),
+            medication_id INTEGER REFERENCES medications (id),
+            owner_id INTEGER REFERENCES users (id),
+            taken_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            PRIMARY KEY (id, taken_at)
+        ) PARTITION BY RANGE (taken_at)
+    """)
+    op.execute("CREATE TABLE medication_logs_default PARTITION OF medication_logs DEFAULT")
+
+    # One partition per month, from the oldest log up to a few months ahead.
+    oldest = bind.execute(sa.text("SELECT min(taken_at) FROM medication_logs_unpartitioned")).scalar()
+    this_month = datetime.now(timezone.utc).date().replace(day=1)
+    month = oldest.date().replace(day=1) if oldest else this_month
+    while month <= _add_months(this_month, MONTHS_AHEAD):
+        _create_month_partition(month)
+        month = _add_months(month, 1)
+
+    op.execute("""
+        INSERT INTO medication_logs (id, medication_id, owner_id, taken_at)
+        SELECT id, medication_id, owner_id, taken_at FROM medication_logs_unpartitioned
+    """)
+    # Hand the id sequence to the new table before the old one (its owner) is dropped.
+    op.execute("ALTER SEQUENCE medication_logs_id_seq OWNED BY medication_logs.id")
+    op.execute("DROP TABLE medication_logs_unpartitioned")
+
+    # Indexes on the parent are created on every partition (current and future).
+    for name, columns in INDEXES:
+        op.create_index(name, "medication_logs", columns)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        with op.batch_alter_table("medication_logs") as batch_op:
+            batch_op.alter_column("taken_at", existing_type=sa.DateTime(), nullable=True)
+        return
+
+    op.execute("ALTER TABLE medication_logs RENAME TO medication_logs_partitioned")
+    op.execute("ALTER TABLE medication_logs_partitioned RENAME CONSTRAINT medication_logs_pkey TO medication_logs_partitioned_pkey")
+    for name, _ in INDEXES:
+        op.drop_index(name, table_name="medication_logs_partitioned")
+    op.execute("""
+        CREATE TABLE medication_logs (
+            id INTEGER NOT NULL DEFAULT nextval('medication_logs_id_seq') PRIMARY KEY,
+            medication_id INTEGER REFERENCES medications (id),
+            owner_id INTEGER REFERENCES users (id),
+            taken_at TIMESTAMP WITHOUT TIME ZONE
+        )
+    """)
+    op.execute("""
+        INSERT INTO medication_logs (id, medication_id, owner_id, taken_at)
+        SELECT id, medication_id, owner_id, taken_at FROM medication_logs_partitioned
+    """)
+    op.execute("ALTER SEQUENCE medication_logs_id_seq OWNED BY medication_logs.id")
+    # Drops every partition attached to it as well.
+    op.execute("DROP TABLE medication_logs_partitioned")
+    for name, columns in INDEXES:
+        op.create_index(name, "medication_logs", columns)
@@ -0,0 +1,51 @@
+"""add medication_adherence bitmaps, built from the existing logs
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-16
+
+One row per (medication, month) with a bit per IST day on which the
+medication was taken (see app/utils/adherence.py). The rows are backfilled
+from medication_logs; `python -m app.db.rebuild_adherence` redoes that later.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.adherence import bitmaps_from_logs
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    adherence = op.create_table(
+        "medication_adherence",
+        sa.Column("medication_id", sa.Integer(), sa.ForeignKey("medications.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("owner_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("taken_days", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("medication_id", "month"),
+    )
+    op.create_index("ix_medication_adherence_owner_id_month", "medication_adherence", ["owner_id", "month"])
+
+    logs = op.get_bind().execute(sa.text(
+        "SELECT l.medication_id, l.owner_id, l.taken_at FROM medication_logs l "
+        "JOIN medications m ON m.id = l.medication_id"
+    ))
+    rows = [
+        {"medication_id": medication_id, "month": month, "owner_id": owner_id, "taken_days": taken_days}
+        for (medication_id, month), (owner_id, taken_days) in bitmaps_from_logs(logs).items()
+    ]
+    if rows:
+        op.bulk_insert(adherence, rows)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_medication_adherence_owner_id_month", table_name="medication_adherence")
+    op.drop_table("medication_adherence")
@@ -0,0 +1,46 @@
+"""index the sort columns used by keyset pagination of the list endpoints
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-16
+
+List endpoints now page with "WHERE (sort columns) > cursor ORDER BY sort
+columns LIMIT n". The owner indexes get the sort columns appended, so each
+page is a single index range scan; the old indexes are a prefix of the new
+ones and are dropped. Health tips get (category, id) for the category filter.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (old index, new index, table, new columns, old columns)
+REPLACED = [
+    ("ix_medications_owner_id", "ix_medications_owner_id_id", "medications",
+     ["owner_id", "id"], ["owner_id"]),
+    ("ix_appointments_owner_id_appointment_datetime", "ix_appointments_owner_id_appointment_datetime_id", "appointments",
+     ["owner_id", "appointment_datetime", "id"], ["owner_id", "appointment_datetime"]),
+    ("ix_emergency_contacts_owner_id", "ix_emergency_contacts_owner_id_id", "emergency_contacts",
+     ["owner_id", "id"], ["owner_id"]),
+]
+
+
+def upgrade() -> None:
+    for old_name, new_name, table, columns, _ in REPLACED:
+        op.create_index(new_name, table, columns)
+        op.drop_index(old_name, table_name=table)
+    op.create_index("ix_health_tips_category_id", "health_tips", ["category", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_health_tips_category_id", table_name="health_tips")
+    for old_name, new_name, table, _, old_columns in reversed(REPLACED):
+        op.create_index(old_name, table, old_columns)
+        op.drop_index(new_name, table_name=table)
@@ -0,0 +1,45 @@
+"""full-text search column and index on health_tips (Postgres)
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+
+GET /tips/search matches tips with Postgres full-text search. health_tips
+gets a stored generated column, search_vector = to_tsvector('english',
+tip_text), with a GIN index on it. The index finds the matching tips and
+ts_rank reads the stored vector instead of parsing every matching tip again.
+The column is Postgres-only, so it isn't in the model (alembic/env.py leaves
+it out of autogenerate); crud_tip refers to it by name.
+SQLite (local runs) gets nothing here: searches there use the in-process
+inverted index of the tip pool (utils/tip_pool.py).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMN_NAME = "search_vector"
+INDEX_NAME = "ix_health_tips_search_vector"
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute(
+        f"ALTER TABLE health_tips ADD COLUMN {COLUMN_NAME} tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('english', tip_text)) STORED"
+    )
+    op.execute(f"CREATE INDEX {INDEX_NAME} ON health_tips USING gin ({COLUMN_NAME})")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+    op.execute(f"ALTER TABLE health_tips DROP COLUMN IF EXISTS {COLUMN_NAME}")
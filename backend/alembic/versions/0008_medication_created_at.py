@@ -0,0 +1,33 @@
+"""add medications.created_at, so adherence only counts days since a medication was added
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17
+
+Existing medications get the time of their first logged dose; ones that were
+never taken stay NULL (unknown), and adherence counts them over the whole window.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("medications", sa.Column("created_at", sa.DateTime(), nullable=True))
+    op.execute(
+        "UPDATE medications SET created_at = ("
+        "SELECT MIN(l.taken_at) FROM medication_logs l WHERE l.medication_id = medications.id)"
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("medications") as batch_op:
+        batch_op.drop_column("created_at")
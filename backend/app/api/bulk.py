@@ -0,0 +1,59 @@
+# backend/app/api/bulk.py
+
+"""
+Shared validation for the bulk create endpoints (POST /<resource>/bulk).
+
+The body is a JSON list. Each item is validated on its own, so one bad item
+doesn't hide the others: if any item is invalid, the whole batch is rejected
+with HTTP 422 and a list of {"index", "errors"} for every invalid item, and
+nothing is written. Otherwise all items are inserted in one statement.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Type, TypeVar
+
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+
+from app.schemas.bulk import BulkItemError
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+
+def _messages(exc: ValidationError) -> List[str]:
+    return [
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" if error["loc"] else error["msg"]
+        for error in exc.errors()
+    ]
+
+
+def validate_items(
+    items: List[Dict[str, Any]],
+    schema: Type[SchemaT],
+    check: Optional[Callable[[SchemaT], Optional[str]]] = None,
+) -> List[SchemaT]:
+    """
+    Parses every item with 'schema', then runs 'check' (extra rules that return
+    an error message or None). Raises 422 listing all invalid items.
+    """
+    parsed, errors = [], []
+    for index, item in enumerate(items):
+        try:
+            item_in = schema.model_validate(item)
+        except ValidationError as exc:
+            errors.append(BulkItemError(index=index, errors=_messages(exc)))
+            continue
+        problem = check(item_in) if check else None
+        if problem:
+            errors.append(BulkItemError(index=index, errors=[problem]))
+            continue
+        parsed.append(item_in)
+
+    if errors:
+        raise HTTPException(
+            status_code=422,
+            detail={
+                "msg": f"{len(errors)} of {len(items)} items are invalid; nothing was created.",
+                "errors": [error.model_dump() for error in errors],
+            },
+        )
+    return parsed
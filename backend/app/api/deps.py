@@ -2,52 +2,172 @@
 
 from app.db.database import get_db# backend/app/api/deps.py
 
-from fastapi import Depends, HTTPException, status
+import hashlib
+import secrets
+import time
+from typing import Optional
+
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import ValidationError
 
 from app.core.config import settings
 from app.core import security
-from app.db.database import get_db
+from app.db.database import get_db, get_async_db, read_session
 from app.db import models
 from app.crud import crud_user
-from app.schemas import token as token_schema
+from app.schemas import token as token_schema, user as user_schema
+from app.utils.cache import TTLCache
 
 # This scheme tells FastAPI where to look for the token (in the Authorization header)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"/api/v1/auth/login/access-token")
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> models.User:
+# --- Decoded Token Cache ---
+# The frontend sends the same bearer token on every rerun. Verified tokens
+# are kept here, keyed by a SHA-256 digest of the token (so raw tokens are
+# not kept as keys), until the token's own 'exp'.
+token_cache = TTLCache(
+    maxsize=settings.TOKEN_CACHE_MAX_ENTRIES, ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+)
+
+
+def _decode_token(token: str) -> token_schema.TokenData:
     """
-    Dependency to get the current user from a JWT token.
-    1. Decodes the token.
-    2. Validates the token data.
-    3. Fetches the user from the database.
+    Verifies a JWT and returns its claims, reusing the cached result for a
+    token that was already verified.
+
+    Raises:
+        JWTError, ValidationError: If the token is invalid or expired.
     """
-    try:
+    key = hashlib.sha256(token.encode()).digest()
+    token_data = token_cache.get(key)
+    if token_data is None:
+        # Decode the JWT to get the payload (this also checks 'exp')
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        # Decode the JWT to get the payload
-       
-        # Extract the email from the payload's 'sub' (subject) field
-        token_data = token_schema.TokenData(email=payload.get("sub"))
+        token_data = token_schema.TokenData(
+            email=payload.get("sub"),
+            user_id=payload.get("uid"),
+            token_version=payload.get("ver"),
+        )
+        remaining = payload.get("exp", 0) - time.time()
+        if remaining > 0:
+            token_cache.set(key, token_data, ttl=remaining)
+    return token_data
+
+async def _authenticate(db: AsyncSession, token: str) -> user_schema.UserSnapshot:
+    """
+    Shared token check used by the auth dependencies below.
+    1. Decodes the token (or reuses the cached claims of a token seen before).
+    2. Validates the token data (user id and token version claims).
+    3. Fetches a snapshot of the user (from the in-memory cache, or the database on a miss).
+    4. Rejects the token if its version is older than the user's current one
+       (e.g., it was issued before a password reset).
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    try:
+        token_data = _decode_token(token)
     except (JWTError, ValidationError):
         # If the token is invalid or expired, raise an error
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    # Fetch the user from the database using the email from the token
-    user = crud_user.get_user_by_email(db, email=token_data.email)
-    
+        raise credentials_exception
+
+    if token_data.user_id is None or token_data.token_version is None:
+        # Tokens issued before the id/version claims existed
+        raise credentials_exception
+
+    # Fetch the user snapshot using the user id from the token
+    user = await crud_user.get_user_snapshot_async(db, user_id=token_data.user_id)
+
+    if not user:
+        # If a user with that id doesn't exist (e.g., account was deleted)
+        raise HTTPException(status_code=404, detail="User not found")
+
+    if token_data.token_version != user.token_version:
+        # The token was revoked (password reset bumps the version)
+        raise credentials_exception
+
+    # Lets the session pin this user to the primary after a write (read-your-writes).
+    db.info["user_id"] = user.id
+    return user
+
+
+async def get_current_user_id(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)
+) -> int:
+    """
+    Dependency that returns only the current user's id.
+    Use this for endpoints that just need an owner filter. The id comes from
+    the token claims, and the version check is served from the user cache,
+    so normally there is no database round trip.
+    It's async so it runs on the event loop instead of taking a threadpool thread.
+    """
+    return (await _authenticate(db, token)).id
+
+
+async def get_current_user(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)
+) -> user_schema.UserSnapshot:
+    """
+    Dependency to get a lightweight snapshot of the current user from a JWT token.
+    Use this when basic profile fields (e.g., full_name) are needed.
+    """
+    return await _authenticate(db, token)
+
+
+async def get_read_db(current_user_id: int = Depends(get_current_user_id)):
+    """
+    Dependency for read-only endpoints: an async session on a read replica,
+    or on the primary if this user wrote something recently (or there are
+    no healthy replicas). Don't write through it.
+    """
+    async with read_session(user_id=current_user_id) as db:
+        yield db
+
+
+def get_current_db_user(
+    db: Session = Depends(get_db),
+    current_user: user_schema.UserSnapshot = Depends(get_current_user),
+) -> models.User:
+    """
+    Dependency that loads the full ORM User for the current user.
+    Only use this where the whole profile is needed (e.g., reading or updating it).
+    """
+    user = crud_user.get_user(db, user_id=current_user.id)
     if not user:
-        # If a user with that email doesn't exist (e.g., account was deleted)
         raise HTTPException(status_code=404, detail="User not found")
-        
-    return user
\ No newline at end of file
+    # Profile updates go through this session, so they pin the user to the primary too.
+    db.info["user_id"] = current_user.id
+    return user
+
+
+def get_user_db(
+    db: Session = Depends(get_db), current_user_id: int = Depends(get_current_user_id)
+) -> Session:
+    """
+    Dependency for sync endpoints that write for a logged-in user: a session on
+    the primary that pins the user to it after the commit (read-your-writes),
+    like the async sessions do.
+    """
+    db.info["user_id"] = current_user_id
+    return db
+
+
+def require_metrics_token(x_metrics_token: Optional[str] = Header(default=None)) -> None:
+    """
+    Dependency for the internal endpoints: the X-Metrics-Token header must match
+    settings.INTERNAL_METRICS_TOKEN. Without a configured token they don't exist (404);
+    a missing or wrong token is 401.
+    """
+    expected = settings.INTERNAL_METRICS_TOKEN
+    if not expected:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_metrics_token is None or not secrets.compare_digest(x_metrics_token.encode(), expected.encode()):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
@@ -0,0 +1,70 @@
+# backend/app/api/pagination.py
+
+"""
+Keyset (cursor) pagination for the list endpoints.
+
+A page is requested with ?limit=N&cursor=...; the cursor for the next page
+comes back in the X-Next-Cursor response header (absent on the last page).
+The body stays a plain JSON list, so old clients that ignore the header
+still work (they just get the first page).
+
+A cursor is the sort key of the last row of the previous page, base64-encoded.
+The next page is "rows after that key" (a row-value comparison on indexed
+columns), so every page costs the same no matter how deep it is, unlike OFFSET.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Query, Response
+
+from app.core.config import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], types: Sequence[type]) -> Optional[Tuple]:
+    """
+    Decodes a cursor into its sort key values, converted to 'types' (None if no cursor).
+    Raises HTTP 400 if the cursor wasn't made by encode_cursor for this ordering.
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("wrong number of values")
+        return tuple(
+            datetime.fromisoformat(value) if value_type is datetime else value_type(value)
+            for value, value_type in zip(values, types)
+        )
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor.")
+
+
+def page_limit(
+    limit: int = Query(None, ge=1, description="Page size (default and maximum come from settings).")
+) -> int:
+    """Dependency for the ?limit= parameter, capped at PAGE_SIZE_MAX."""
+    return min(limit or settings.PAGE_SIZE_DEFAULT, settings.PAGE_SIZE_MAX)
+
+
+def finish_page(response: Response, rows: List, limit: int, sort_key: Callable[[Any], Sequence]) -> List:
+    """
+    Takes the rows fetched with limit + 1, sets X-Next-Cursor if there is
+    another page, and returns this page's rows.
+    """
+    if len(rows) <= limit:
+        return rows
+    page = rows[:limit]
+    response.headers[NEXT_CURSOR_HEADER] = encode_cursor(sort_key(page[-1]))
+    return page
+
@@ -1,8 +1,9 @@
 # backend/app/api/v1/api.py (FINAL VERSION - WITH TIPS ROUTER)
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from .endpoints.auth import router as auth_router
 
+from app.api import deps
 from app.api.v1.endpoints import (
     users, 
     auth, 
@@ -10,7 +11,9 @@ from app.api.v1.endpoints import (
     medications,
     appointments,
     contacts,
-    tips # <-- Naye tips endpoint ko yahan import karna hai
+    tips, # <-- Naye tips endpoint ko yahan import karna hai
+    export,
+    internal
 )
 
 # Create the main router for API version 1
@@ -23,6 +26,12 @@ api_router.include_router(dashboard.router, prefix="/dashboard", tags=["Dashboar
 api_router.include_router(medications.router, prefix="/medications", tags=["Medications"])
 api_router.include_router(appointments.router, prefix="/appointments", tags=["Appointments"])
 api_router.include_router(contacts.router, prefix="/contacts", tags=["Contacts"])
+api_router.include_router(export.router, prefix="/export", tags=["Export"])
 api_router.include_router(tips.router, prefix="/tips", tags=["Health Tips"]) # <-- Naye tips router ko yahan jodna hai
+# Internal metrics sirf INTERNAL_METRICS_TOKEN wale header ke saath (warna 404)
+api_router.include_router(
+    internal.router, prefix="/internal", tags=["Internal"],
+    dependencies=[Depends(deps.require_metrics_token)], include_in_schema=False,
+)
 api_router.include_router(auth_router, prefix="/auth", tags=["Auth"])
 
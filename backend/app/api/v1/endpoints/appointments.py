@@ -1,55 +1,71 @@
 # backend/app/api/v1/endpoints/appointments.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Body, Depends, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional
+from datetime import datetime
 
-from app.api import deps
-from app.db import models
-from app.crud import crud_appointment, crud_user # We need crud_appointment for a helper
+from app.api import bulk, deps, pagination
+from app.core.config import settings
+from app.crud import crud_appointment
 from app.schemas import appointment as appointment_schema
 
 router = APIRouter()
 
-# Helper function to get and verify an appointment
-def get_appointment_and_verify_owner(db: Session, appt_id: int, current_user: models.User) -> models.Appointment:
-    appointment = db.query(models.Appointment).filter(models.Appointment.id == appt_id).first()
-    if not appointment:
-        raise HTTPException(status_code=404, detail="Appointment not found")
-    if appointment.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
-    return appointment
-
 @router.get("/", response_model=List[appointment_schema.Appointment])
-def read_appointments(
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user)
+async def read_appointments(
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user_id: int = Depends(deps.get_current_user_id),
+    limit: int = Depends(pagination.page_limit),
+    cursor: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
 ):
-    """Retrieve all appointments for the current logged-in user."""
-    return crud_appointment.get_appointments_by_user(db, owner_id=current_user.id)
+    """
+    Retrieve the current user's appointments, latest first, one page at a time.
+    'start'/'end' optionally keep only appointments in [start, end).
+    """
+    appointments = await crud_appointment.get_appointments_by_user(
+        db, owner_id=current_user_id, limit=limit + 1,
+        after=pagination.decode_cursor(cursor, (datetime, int)), start=start, end=end
+    )
+    return pagination.finish_page(
+        response, appointments, limit, lambda appt: (appt.appointment_datetime, appt.id)
+    )
 
 @router.post("/", response_model=appointment_schema.Appointment, status_code=status.HTTP_201_CREATED)
-def create_appointment(
+async def create_appointment(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     appointment_in: appointment_schema.AppointmentCreate,
-    current_user: models.User = Depends(deps.get_current_user)
+    current_user_id: int = Depends(deps.get_current_user_id)
 ):
     """Create a new appointment for the current logged-in user."""
-    return crud_appointment.create_user_appointment(
-        db=db, appointment=appointment_in, owner_id=current_user.id
+    return await crud_appointment.create_user_appointment(
+        db=db, appointment=appointment_in, owner_id=current_user_id
     )
 
+@router.post("/bulk", response_model=List[appointment_schema.Appointment], status_code=status.HTTP_201_CREATED)
+async def create_appointments_bulk(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    appointments_in: List[Dict[str, Any]] = Body(..., min_length=1, max_length=settings.BULK_CREATE_MAX_ITEMS),
+    current_user_id: int = Depends(deps.get_current_user_id)
+):
+    """
+    Create several appointments at once, in one transaction.
+    If any item is invalid, nothing is created and the 422 lists the errors per item index.
+    """
+    appointments = bulk.validate_items(appointments_in, appointment_schema.AppointmentCreate)
+    return await crud_appointment.create_user_appointments(db, appointments=appointments, owner_id=current_user_id)
+
 @router.delete("/{appt_id}", response_model=appointment_schema.Appointment)
-def delete_appointment(
+async def delete_appointment(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     appt_id: int,
-    current_user: models.User = Depends(deps.get_current_user)
+    current_user_id: int = Depends(deps.get_current_user_id)
 ):
-    """Delete an appointment for the current user."""
-    appointment = get_appointment_and_verify_owner(db, appt_id, current_user)
-    
-    db.delete(appointment)
-    db.commit()
-    return appointment
\ No newline at end of file
+    """Delete an appointment for the current user (404 if it doesn't exist, 403 if it isn't theirs)."""
+    return await crud_appointment.appointments.delete(db, appt_id, owner_id=current_user_id)
\ No newline at end of file
@@ -2,34 +2,99 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status, Body
 from fastapi.security import OAuth2PasswordRequestForm
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import Any
 import secrets
 from datetime import datetime, timedelta, timezone
-from app.db import models
 from app.api import deps
 from app.core import security
 from app.core.config import settings
-from app.crud import crud_user
+from app.crud import crud_user, crud_session
 from app.schemas import token as token_schema, user as user_schema
 from app.utils.email_utils import send_password_reset_email
 
 router = APIRouter()
 
+
+def _create_user_access_token(user) -> str:
+    """Creates an access token with the user's email, id and token version claims."""
+    return security.create_access_token(
+        data={"sub": user.email, "uid": user.id, "ver": user.token_version}
+    )
+
+
 # ... (login_access_token function remains the same) ...
 @router.post("/login/access-token", response_model=token_schema.Token)
-def login_access_token(
+async def login_access_token(
     db: Session = Depends(deps.get_db),
     form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
-    """OAuth2 compatible token login, get an access token for future requests."""
-    user = crud_user.get_user_by_email(db, email=form_data.username)
-    if not user or not security.verify_password(form_data.password, user.hashed_password):
+    """
+    OAuth2 compatible token login, get an access token for future requests.
+    The password check runs in the hashing pool, not the shared threadpool.
+    Hashes made under an older hashing policy are replaced transparently.
+    """
+    user = await run_in_threadpool(crud_user.get_user_by_email, db, email=form_data.username)
+    is_valid, new_hash = (
+        await security.verify_and_update_password_async(form_data.password, user.hashed_password)
+        if user else (False, None)
+    )
+    if not is_valid:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect email or password", headers={"WWW-Authenticate": "Bearer"})
     elif not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
-    access_token = security.create_access_token(data={"sub": user.email})
-    return {"access_token": access_token, "token_type": "bearer"}
+    if new_hash:
+        await run_in_threadpool(crud_user.upgrade_password_hash, db, db_user=user, hashed_password=new_hash)
+    refresh_token = await run_in_threadpool(crud_session.create_session, db, user_id=user.id)
+    return {
+        "access_token": _create_user_access_token(user),
+        "token_type": "bearer",
+        "refresh_token": refresh_token,
+    }
+
+
+@router.post("/refresh", response_model=token_schema.Token)
+def refresh_access_token(
+    refresh_token: str = Body(..., embed=True),
+    db: Session = Depends(deps.get_db)
+) -> Any:
+    """
+    Exchange a refresh token for a new access token (and a new refresh token).
+    This is a single indexed lookup, so there is no bcrypt check like in login.
+    """
+    invalid_token_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    rotated = crud_session.rotate_session(db, refresh_token=refresh_token)
+    if not rotated:
+        raise invalid_token_exception
+    user_id, new_refresh_token = rotated
+
+    user = crud_user.get_user_snapshot(db, user_id=user_id)
+    if not user or not user.is_active:
+        raise invalid_token_exception
+
+    return {
+        "access_token": _create_user_access_token(user),
+        "token_type": "bearer",
+        "refresh_token": new_refresh_token,
+    }
+
+
+@router.post("/logout", status_code=status.HTTP_200_OK)
+def logout(
+    refresh_token: str = Body(..., embed=True),
+    db: Session = Depends(deps.get_db)
+):
+    """
+    Ends the refresh-token session, so the refresh token can't be used again.
+    Access tokens already issued keep working until they expire (they are short-lived).
+    """
+    crud_session.delete_session(db, refresh_token=refresh_token)
+    return {"msg": "Logged out."}
 
 
 # --- NEW FORGOT PASSWORD ENDPOINT ---
@@ -66,7 +131,7 @@ def forgot_password(
 
 # --- NEW RESET PASSWORD ENDPOINT ---
 @router.post("/reset-password", status_code=status.HTTP_200_OK)
-def reset_password(
+async def reset_password(
     token: str = Body(...),
     new_password: str = Body(...),
     db: Session = Depends(deps.get_db)
@@ -75,7 +140,7 @@ def reset_password(
     Reset user's password using a reset token.
     """
     # Find the user by the reset token
-    user = db.query(models.User).filter(models.User.reset_password_token == token).first()
+    user = await run_in_threadpool(crud_user.get_user_by_reset_token, db, token=token)
 
     # --- THIS IS THE FIX ---
     # We must make the expiry time from the database "aware" of the UTC timezone
@@ -97,14 +162,9 @@ def reset_password(
     
     # --- END OF FIX ---
     
-    # Update the user's password
-    user.hashed_password = security.get_password_hash(new_password)
-    # Invalidate the reset token
-    user.reset_password_token = None
-    user.reset_token_expires_at = None
-    
-    db.add(user)
-    db.commit()
+    # Hash the new password in the hashing pool, then save it and invalidate the reset token
+    hashed_password = await security.get_password_hash_async(new_password)
+    await run_in_threadpool(crud_user.update_password, db, db_user=user, hashed_password=hashed_password)
     
     return {"msg": "Password has been reset successfully."}
 
@@ -1,68 +1,77 @@
 # backend/app/api/v1/endpoints/contacts.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Body, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional
 
-from app.api import deps
-from app.db import models
+from app.api import bulk, deps, pagination
+from app.core.config import settings
 from app.crud import crud_contact
 from app.schemas import contact as contact_schema
 
 router = APIRouter()
 
-def get_contact_and_verify_owner(db: Session, contact_id: int, current_user: models.User) -> models.EmergencyContact:
-    """Helper function to get a contact and verify its owner."""
-    contact = db.query(models.EmergencyContact).filter(models.EmergencyContact.id == contact_id).first()
-    if not contact:
-        raise HTTPException(status_code=404, detail="Contact not found")
-    if contact.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
-    return contact
-
 @router.get("/", response_model=List[contact_schema.Contact])
-def read_contacts(
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user)
+async def read_contacts(
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user_id: int = Depends(deps.get_current_user_id),
+    limit: int = Depends(pagination.page_limit),
+    cursor: Optional[str] = None
 ):
     """
-    Retrieve all emergency contacts for the current logged-in user.
+    Retrieve the current user's emergency contacts, one page at a time.
     """
-    contacts = crud_contact.get_contacts_by_user(db, owner_id=current_user.id)
-    return contacts
+    contacts = await crud_contact.get_contacts_by_user(
+        db, owner_id=current_user_id, limit=limit + 1, after=pagination.decode_cursor(cursor, (int,))
+    )
+    return pagination.finish_page(response, contacts, limit, lambda contact: (contact.id,))
 
 
 @router.post("/", response_model=contact_schema.Contact, status_code=status.HTTP_201_CREATED)
-def create_contact(
+async def create_contact(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     contact_in: contact_schema.ContactCreate,
-    current_user: models.User = Depends(deps.get_current_user)
+    current_user_id: int = Depends(deps.get_current_user_id)
 ):
     """
     Create a new emergency contact for the current logged-in user.
     """
     # Optional: Check if the user already has the maximum number of contacts (e.g., 3)
-    # current_contacts = crud_contact.get_contacts_by_user(db, owner_id=current_user.id)
+    # current_contacts = await crud_contact.get_contacts_by_user(db, owner_id=current_user_id)
     # if len(current_contacts) >= 3:
     #     raise HTTPException(status_code=400, detail="Maximum number of emergency contacts reached.")
         
-    contact = crud_contact.create_user_contact(
-        db=db, contact=contact_in, owner_id=current_user.id
+    contact = await crud_contact.create_user_contact(
+        db=db, contact=contact_in, owner_id=current_user_id
     )
     return contact
 
 
+@router.post("/bulk", response_model=List[contact_schema.Contact], status_code=status.HTTP_201_CREATED)
+async def create_contacts_bulk(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    contacts_in: List[Dict[str, Any]] = Body(..., min_length=1, max_length=settings.BULK_CREATE_MAX_ITEMS),
+    current_user_id: int = Depends(deps.get_current_user_id)
+):
+    """
+    Create several emergency contacts at once, in one transaction.
+    If any item is invalid, nothing is created and the 422 lists the errors per item index.
+    """
+    contacts = bulk.validate_items(contacts_in, contact_schema.ContactCreate)
+    return await crud_contact.create_user_contacts(db, contacts=contacts, owner_id=current_user_id)
+
+
 @router.delete("/{contact_id}", response_model=contact_schema.Contact)
-def delete_contact(
+async def delete_contact(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     contact_id: int,
-    current_user: models.User = Depends(deps.get_current_user)
+    current_user_id: int = Depends(deps.get_current_user_id)
 ):
     """
-    Delete an emergency contact for the current user.
+    Delete an emergency contact for the current user (404 if it doesn't exist, 403 if it isn't theirs).
     """
-    contact = get_contact_and_verify_owner(db, contact_id, current_user)
-    deleted_contact = crud_contact.delete_contact(db, db_contact=contact)
-    return deleted_contact
\ No newline at end of file
+    return await crud_contact.contacts.delete(db, contact_id, owner_id=current_user_id)
\ No newline at end of file
@@ -1,108 +1,121 @@
-# backend/app/api/v1/endpoints/dashboard.py (FINAL, GUARANTEED PYTHON-BASED TIMEZONE FIX)
+# backend/app/api/v1/endpoints/dashboard.py
 
-from fastapi import APIRouter, Depends, Response
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from datetime import datetime, timezone # Use Python's built-in timezone for awareness
-import random
-import pytz # Still needed for IST conversion
+from fastapi import APIRouter, Depends
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from datetime import date, datetime
 
 from app.api import deps
 from app.db import models
-from app.crud import crud_contact
+from app.crud import crud_adherence, crud_appointment, crud_contact, crud_tip
+from app.schemas import user as user_schema
+from app.utils.adherence import IST, ist_day_bounds
+from app.utils.dashboard_cache import dashboard_cache
+from app.utils.recurrence import compile_recurrence
 
 router = APIRouter()
 
-@router.get("/")
-def get_dashboard_data(
-    *,
-    response: Response,
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user)
-):
+
+async def _load_dashboard_data(db: AsyncSession, owner_id: int, today_in_ist: date) -> dict:
     """
-    Retrieve dashboard data with a reliable, Python-based timezone conversion.
+    The user's data for today's dashboard, already JSON-encoded so a cached copy
+    doesn't have to be encoded again on every hit.
     """
-    response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-    response.headers["Pragma"] = "no-cache"
-    response.headers["Expires"] = "0"
+    # Aaj ka IST din, naive UTC [start, end) mein (jaise database mein store hai).
+    # Ek baar nikaal lo, phir database se sirf is window ka data maango.
+    day_start, day_end = ist_day_bounds(today_in_ist)
     
-    IST = pytz.timezone('Asia/Kolkata')
-    today_in_ist = datetime.now(IST).date()
-    
-    # --- 1. Get ALL daily medications ---
-    all_daily_meds = db.query(models.Medication).filter(
-        models.Medication.owner_id == current_user.id,
-        # Sahi code (Naya)
-        models.Medication.frequency_type == "Daily"
-    ).all()
+    # --- 1. Medications due today ---
+    # User ki saari dawaiyan ek query mein; aaj kaunsi due hai (Daily, Weekly ka din,
+    # Monthly ki date) yeh wahi recurrence rules batate hain jo reminder job use karta hai.
+    medications = (await db.scalars(
+        select(models.Medication).where(models.Medication.owner_id == owner_id).order_by(models.Medication.id)
+    )).all()
+    due_today_meds = [
+        med for med in medications
+        if compile_recurrence(med.frequency_type, med.frequency_details).is_due(today_in_ist)
+    ]
     
-    # --- YEH FINAL, SABSE ROBUST FIX HAI: Python mein Timezone ko aache se handle karna ---
-    # Hum user ke saare logs le kar unhe Python mein check karenge.
-    all_user_logs = db.query(models.MedicationLog).filter(models.MedicationLog.owner_id == current_user.id).all()
-    
-    taken_today_ids = set() # Use a set to avoid duplicates
-    for log in all_user_logs:
-        timestamp = log.taken_at
-        
-        # Step 1: We know time is saved as UTC. If the DB driver returns a "naive"
-        # datetime (no timezone info), we make it "aware" by setting its tz to UTC.
-        if timestamp.tzinfo is None:
-            timestamp = timestamp.replace(tzinfo=timezone.utc)
+    # Aaj (IST) kaunsi dawai li gayi, yeh adherence bitmaps se ek query mein aata hai
+    # (har dawai ke mahine ka ek row), logs scan karne ki zaroorat nahi.
+    taken_today_ids = set(await crud_adherence.get_taken_ids_on(db, owner_id=owner_id, day=today_in_ist))
 
-        # Step 2: Now that we have a guaranteed UTC-aware datetime, convert it to IST.
-        timestamp_ist = timestamp.astimezone(IST)
-        
-        # Step 3: Compare the date part.
-        if timestamp_ist.date() == today_in_ist:
-            taken_today_ids.add(log.medication_id)
+    # --- 2. Appointments from the start of today (IST), already sorted by time ---
+    # Purane appointments database se aate hi nahi, chahe history kitni bhi lambi ho.
+    upcoming_appointments = await crud_appointment.get_upcoming_appointments(db, owner_id=owner_id, start=day_start)
+    todays_appointments = [appt for appt in upcoming_appointments if appt.appointment_datetime < day_end]
+    
+    # 3. Get emergency contacts
+    emergency_contacts = await crud_contact.get_contacts_by_user(db, owner_id=owner_id)
 
-    # --- 2. Get today's appointments using the same robust logic ---
-    all_appointments = db.query(models.Appointment).filter(
-        models.Appointment.owner_id == current_user.id
-    ).all()
+    # 4. Adherence: streaks aur 7/30/90 din ke trends (purani history din mein ek baar padhi jaati hai)
+    adherence = await crud_adherence.get_adherence_report(
+        db, owner_id=owner_id, today=today_in_ist, taken_today_ids=taken_today_ids, medications=medications
+    )
 
-    todays_appointments = []
-    upcoming_appointments = []
-    for appt in all_appointments:
-        if appt.appointment_datetime:
-            timestamp = appt.appointment_datetime
-            if timestamp.tzinfo is None:
-                timestamp = timestamp.replace(tzinfo=timezone.utc)
-            
-            timestamp_ist = timestamp.astimezone(IST)
-            if timestamp_ist.date() >= today_in_ist:
-                upcoming_appointments.append(appt)
-                if timestamp_ist.date() == today_in_ist:
-                    todays_appointments.append(appt)
-    
-    # Sort appointments by time
-    upcoming_appointments.sort(key=lambda x: x.appointment_datetime)
-    todays_appointments.sort(key=lambda x: x.appointment_datetime)
-    
-    # 3. Get emergency contacts and health tip
-    emergency_contacts = crud_contact.get_contacts_by_user(db, owner_id=current_user.id)
-    random_health_tip = db.query(models.HealthTip).order_by(func.random()).first()
-    
-    # 4. Prepare the final data payload
-    return {
-        "user_full_name": current_user.full_name,
-        "summary": {
-            "personalized_message": f"Namaste, {current_user.full_name.split()[0]}! You have {len(todays_appointments)} appointment(s) today.",
-            "adherence_score": 95, # Dummy score for now
-            "adherence_message": "Keep up the great work!"
-        },
+    data = jsonable_encoder({
         "medications_today": {
-            "all_daily": all_daily_meds,
+            "due_today": due_today_meds,
             "taken_ids": list(taken_today_ids) # Convert set to list for JSON
         },
         "appointments": {
             "today": todays_appointments,
             "upcoming": upcoming_appointments
         },
+        "emergency_contacts": emergency_contacts,
+    })
+    data["adherence"] = adherence  # plain numbers and strings already, no need to encode
+    # Purana key: ab yeh bhi recurrence se filter hota hai (sirf Daily nahi). Naye clients due_today padhein;
+    # all_daily deprecation period ke baad hata diya jayega.
+    data["medications_today"]["all_daily"] = data["medications_today"]["due_today"]
+    return data
+
+
+@router.get("/")
+async def get_dashboard_data(
+    *,
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user: user_schema.UserSnapshot = Depends(deps.get_current_user)
+):
+    """
+    Retrieve dashboard data for the user's current IST day.
+    Served from the per-user dashboard cache when possible; otherwise read from
+    a replica if configured (the primary right after this user's own writes).
+    """
+    today_in_ist = datetime.now(IST).date()
+    # User ka dashboard data cache se (uski apni writes ise turant hata deti hain,
+    # aur IST din badalte hi purana entry miss ho jaata hai).
+    data = dashboard_cache.get(current_user.id, today_in_ist)
+    if data is None:
+        version = dashboard_cache.version(current_user.id)
+        data = await _load_dashboard_data(db, current_user.id, today_in_ist)
+        dashboard_cache.set(current_user.id, today_in_ist, data, version)
+
+    # Tip har baar nayi (pool se, database nahi lagta)
+    random_health_tip = await crud_tip.tip_pool.random_tip(db)
+    
+    # 5. Prepare the final data payload
+    # 'data' is already JSON-ready, so it goes out as a JSONResponse: FastAPI would
+    # otherwise run jsonable_encoder over the whole (cached) payload on every request.
+    return JSONResponse({
+        "user_full_name": current_user.full_name,
+        "summary": {
+            "personalized_message": f"Namaste, {current_user.full_name.split()[0]}! You have {len(data['appointments']['today'])} appointment(s) today.",
+            # Pichhle 30 din mein li gayi scheduled doses ka % (None jab kuch scheduled hi na ho)
+            "adherence_score": data["adherence"]["score"],
+            "adherence_message": data["adherence"]["message"]
+        },
+        "adherence": data["adherence"],
+        "medications_today": data["medications_today"],
+        "appointments": data["appointments"],
         "reminders": { "refills": [] },
         "health_vitals": {},
-        "emergency_contacts": emergency_contacts,
+        "emergency_contacts": data["emergency_contacts"],
         "health_tip": random_health_tip.tip_text if random_health_tip else "Remember to stay active!"
-    }
-
+    }, headers={
+        "Cache-Control": "no-cache, no-store, must-revalidate",
+        "Pragma": "no-cache",
+        "Expires": "0",
+    })
@@ -0,0 +1,84 @@
+# backend/app/api/v1/endpoints/export.py
+
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, Literal, Optional
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+from app.api import deps
+from app.crud import crud_export
+from app.db.database import read_session
+from app.utils.adherence import IST
+
+router = APIRouter()
+
+# Every exported record has these fields (empty where they don't apply).
+EXPORT_FIELDS = ["record_type", "datetime", "name", "dosage", "location", "purpose"]
+
+MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+
+def _ist(moment: datetime) -> str:
+    """Stored naive-UTC timestamp -> IST ISO string, as shown everywhere in the app."""
+    return moment.replace(tzinfo=timezone.utc).astimezone(IST).isoformat()
+
+
+async def _history_records(owner_id: int) -> AsyncIterator[List[Dict[str, Optional[str]]]]:
+    """
+    The user's medication logs, then their appointments, as batches of export records.
+    The session is opened here and not through a dependency, because the body
+    is sent after the endpoint has returned (and its dependencies have closed).
+    """
+    async with read_session(user_id=owner_id) as db:
+        async for rows in crud_export.stream_medication_logs(db, owner_id):
+            yield [
+                {"record_type": "medication_taken", "datetime": _ist(taken_at), "name": name,
+                 "dosage": dosage, "location": None, "purpose": None}
+                for taken_at, name, dosage in rows
+            ]
+        async for rows in crud_export.stream_appointments(db, owner_id):
+            yield [
+                {"record_type": "appointment", "datetime": _ist(appointment_datetime), "name": doctor_name,
+                 "dosage": None, "location": location, "purpose": purpose}
+                for appointment_datetime, doctor_name, location, purpose in rows
+            ]
+
+
+async def _csv_chunks(owner_id: int) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    async for records in _history_records(owner_id):
+        writer.writerows(records)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()  # header only, when there's no history at all
+
+
+async def _ndjson_chunks(owner_id: int) -> AsyncIterator[str]:
+    async for records in _history_records(owner_id):
+        yield "".join(json.dumps(record) + "\n" for record in records)
+
+
+@router.get("/history")
+async def export_history(
+    format: Literal["csv", "ndjson"] = "csv",
+    current_user_id: int = Depends(deps.get_current_user_id),
+):
+    """
+    Download the current user's medication history and appointments as CSV or NDJSON.
+    The file is streamed from a server-side cursor, one batch at a time,
+    so memory stays flat however many years of history there are.
+    """
+    chunks = _csv_chunks(current_user_id) if format == "csv" else _ndjson_chunks(current_user_id)
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="health_history.{format}"'},
+    )
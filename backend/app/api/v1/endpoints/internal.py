@@ -0,0 +1,31 @@
+# backend/app/api/v1/endpoints/internal.py
+
+from fastapi import APIRouter
+
+from app.api import deps
+from app.core.startup_timing import cold_start
+from app.crud import crud_tip, crud_user
+from app.db.database import async_pool_metrics, replica_router, sync_pool_metrics
+from app.utils.dashboard_cache import dashboard_cache
+
+router = APIRouter()
+
+@router.get("/metrics")
+def read_internal_metrics():
+    """
+    Internal operational metrics (in-process cache counters, etc.).
+    The numbers are for this worker process only. Needs the X-Metrics-Token
+    header (see settings.INTERNAL_METRICS_TOKEN).
+    """
+    return {
+        "user_cache": crud_user.user_snapshot_cache.stats(),
+        "token_cache": deps.token_cache.stats(),
+        "tip_pool": crud_tip.tip_pool.stats(),
+        "dashboard_cache": dashboard_cache.stats(),
+        "cold_start": cold_start.stats(),
+        "db_pool": {
+            "sync": sync_pool_metrics.stats(),
+            "async": async_pool_metrics.stats(),
+        },
+        "read_replicas": replica_router.stats(),
+    }
@@ -1,116 +1,179 @@
 # backend/app/api/v1/endpoints/medications.py (VERSION 3.0 - WITH ADVANCED VALIDATION)
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional
 from datetime import datetime, timezone
 
-from app.api import deps
-from app.db import models
-from app.crud import crud_medication
+from app.api import bulk, deps, pagination
+from app.core.config import settings
+from app.crud import crud_adherence, crud_medication
+from app.db.unit_of_work import UnitOfWork
 from app.schemas import medication as medication_schema
+from app.utils.adherence import AdherenceCalendar, IST, ist_date
 
 router = APIRouter()
 
+
+def _medication_problem(medication_in: medication_schema.MedicationCreate) -> Optional[str]:
+    """
+    Timing and frequency rules a new medication must follow.
+    Returns what's wrong with it, or None if it's valid.
+    """
+    # Basic timing validation
+    if medication_in.timing_type == "Specific-Time" and not medication_in.specific_time:
+        return "Specific time is required for this timing type."
+    if medication_in.timing_type == "Meal-Related" and not medication_in.meal_timing:
+        return "Meal timing is required for this timing type."
+
+    # Advanced frequency validation
+    freq_type = medication_in.frequency_type
+    freq_details = medication_in.frequency_details
+
+    if freq_type == "Weekly" and (not isinstance(freq_details, list) or not freq_details):
+        return "For a weekly frequency, you must select at least one day."
+
+    if freq_type == "Monthly" and (not isinstance(freq_details, int) or not (1 <= freq_details <= 31)):
+        return "For a monthly frequency, you must provide a valid day of the month (1-31)."
+    return None
+
+
 @router.get("/", response_model=List[medication_schema.Medication])
-def read_medications(
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user)
+async def read_medications(
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user_id: int = Depends(deps.get_current_user_id),
+    limit: int = Depends(pagination.page_limit),
+    cursor: Optional[str] = None,
+    frequency_type: Optional[str] = None
 ):
     """
-    Retrieve all medications for the current logged-in user.
+    Retrieve the current user's medications, one page at a time (see api/pagination.py).
     """
-    return crud_medication.get_medications_by_user(db, owner_id=current_user.id)
+    medications = await crud_medication.get_medications_by_user(
+        db, owner_id=current_user_id, limit=limit + 1,
+        after=pagination.decode_cursor(cursor, (int,)), frequency_type=frequency_type
+    )
+    return pagination.finish_page(response, medications, limit, lambda med: (med.id,))
 
 
 @router.post("/", response_model=medication_schema.Medication, status_code=status.HTTP_201_CREATED)
-def create_medication(
+async def create_medication(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     medication_in: medication_schema.MedicationCreate,
-    current_user: models.User = Depends(deps.get_current_user)
+    current_user_id: int = Depends(deps.get_current_user_id)
 ):
     """
     Create a new medication with validation for advanced frequency types.
     """
     # --- YEH NAYA VALIDATION LOGIC HAI ---
-    
-    # Basic timing validation
-    if medication_in.timing_type == "Specific-Time" and not medication_in.specific_time:
-        raise HTTPException(status_code=400, detail="Specific time is required for this timing type.")
-    if medication_in.timing_type == "Meal-Related" and not medication_in.meal_timing:
-        raise HTTPException(status_code=400, detail="Meal timing is required for this timing type.")
+    problem = _medication_problem(medication_in)
+    if problem:
+        raise HTTPException(status_code=400, detail=problem)
 
-    # Advanced frequency validation
-    freq_type = medication_in.frequency_type
-    freq_details = medication_in.frequency_details
-    
-    if freq_type == "Weekly" and (not isinstance(freq_details, list) or not freq_details):
-        raise HTTPException(status_code=400, detail="For a weekly frequency, you must select at least one day.")
-    
-    if freq_type == "Monthly" and (not isinstance(freq_details, int) or not (1 <= freq_details <= 31)):
-        raise HTTPException(status_code=400, detail="For a monthly frequency, you must provide a valid day of the month (1-31).")
-
-    return crud_medication.create_user_medication(
-        db=db, medication=medication_in, owner_id=current_user.id
+    return await crud_medication.create_user_medication(
+        db=db, medication=medication_in, owner_id=current_user_id
     )
 
 
+@router.post("/bulk", response_model=List[medication_schema.Medication], status_code=status.HTTP_201_CREATED)
+async def create_medications_bulk(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    medications_in: List[Dict[str, Any]] = Body(..., min_length=1, max_length=settings.BULK_CREATE_MAX_ITEMS),
+    current_user_id: int = Depends(deps.get_current_user_id)
+):
+    """
+    Create several medications at once (e.g., while onboarding), in one transaction.
+    Every item gets the same checks as POST /; if any item fails, nothing is
+    created and the 422 response lists the errors per item index.
+    """
+    medications = bulk.validate_items(medications_in, medication_schema.MedicationCreate, check=_medication_problem)
+    return await crud_medication.create_user_medications(db, medications=medications, owner_id=current_user_id)
+
+
 @router.put("/{med_id}", response_model=medication_schema.Medication)
-def update_medication(
+async def update_medication(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     med_id: int,
     medication_in: medication_schema.MedicationUpdate,
-    current_user: models.User = Depends(deps.get_current_user)
+    current_user_id: int = Depends(deps.get_current_user_id)
 ):
     """
     Update a medication's details for the current user.
     """
-    db_medication = crud_medication.get_medication_by_id(db, medication_id=med_id)
-    if not db_medication or db_medication.owner_id != current_user.id:
-        raise HTTPException(status_code=404, detail="Medication not found")
-    
-    return crud_medication.update_medication(db, db_medication=db_medication, medication_in=medication_in)
+    return await crud_medication.medications.update(
+        db, med_id, owner_id=current_user_id, values=medication_in.model_dump(exclude_unset=True)
+    )
 
 
 @router.delete("/{med_id}", response_model=medication_schema.Medication)
-def delete_medication(
+async def delete_medication(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     med_id: int,
-    current_user: models.User = Depends(deps.get_current_user)
+    current_user_id: int = Depends(deps.get_current_user_id)
 ):
     """
     Delete a medication for the current user.
     """
-    db_medication = crud_medication.get_medication_by_id(db, medication_id=med_id)
-    if not db_medication or db_medication.owner_id != current_user.id:
-        raise HTTPException(status_code=404, detail="Medication not found")
-        
-    return crud_medication.delete_medication(db, db_medication=db_medication)
+    return await crud_medication.medications.delete(db, med_id, owner_id=current_user_id)
 
 
 @router.post("/{med_id}/taken", response_model=medication_schema.MedicationLog)
-def mark_medication_as_taken(
+async def mark_medication_as_taken(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     med_id: int,
-    current_user: models.User = Depends(deps.get_current_user)
+    current_user_id: int = Depends(deps.get_current_user_id)
 ):
     """
     Mark a medication as taken by creating a new log entry.
+    The log, the adherence bit and last_taken_at are written in one transaction.
     """
-    db_medication = crud_medication.get_medication_by_id(db, medication_id=med_id)
-    if not db_medication or db_medication.owner_id != current_user.id:
-        raise HTTPException(status_code=404, detail="Medication not found")
-    
-    log_entry = crud_medication.create_medication_log(
-        db=db, medication_id=med_id, owner_id=current_user.id
-    )
-    
-    update_data = medication_schema.MedicationUpdate(last_taken_at=datetime.now(timezone.utc))
-    crud_medication.update_medication(db, db_medication=db_medication, medication_in=update_data)
-    
+    taken_at = datetime.now(timezone.utc)
+    async with UnitOfWork(db):
+        # The owner-scoped UPDATE is also the 404 check, so there's no SELECT first.
+        await crud_medication.medications.update(
+            db, med_id, owner_id=current_user_id, values={"last_taken_at": taken_at}
+        )
+        log_entry = await crud_medication.create_medication_log(
+            db=db, medication_id=med_id, owner_id=current_user_id, taken_at=taken_at
+        )
+
     return log_entry
 
+
+@router.get("/{med_id}/adherence", response_model=medication_schema.MedicationAdherence)
+async def read_medication_adherence(
+    *,
+    db: AsyncSession = Depends(deps.get_read_db),
+    med_id: int,
+    days: int = Query(30, ge=1, le=366),
+    current_user_id: int = Depends(deps.get_current_user_id)
+):
+    """
+    Taken today, current streak and adherence ratio over the last 'days' days,
+    answered from the adherence bitmaps (a few rows) instead of the log.
+    """
+    db_medication = await crud_medication.medications.get(db, med_id, owner_id=current_user_id)
+
+    today = datetime.now(IST).date()
+    adherence = AdherenceCalendar(
+        await crud_adherence.get_months(db, medication_id=med_id, until=today),
+        db_medication.frequency_type,
+        db_medication.frequency_details,
+        since=ist_date(db_medication.created_at) if db_medication.created_at else None,
+    )
+    taken_doses, scheduled_doses = adherence.counts(today, days)
+    return {
+        "medication_id": med_id,
+        "days": days,
+        "taken_today": adherence.taken_on(today),
+        "current_streak": adherence.streak(today),
+        "taken_doses": taken_doses,
+        "scheduled_doses": scheduled_doses,
+        "adherence_ratio": adherence.ratio(today, days),
+    }
@@ -1,11 +1,11 @@
 # backend/app/api/v1/endpoints/tips.py (Nayi File)
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 
-from app.api import deps
+from app.api import deps, pagination
 from app.db import models
 from app.crud import crud_tip
 from app.schemas import tip as tip_schema
@@ -16,11 +16,11 @@ router = APIRouter()
 @router.post("/", response_model=tip_schema.Tip, status_code=status.HTTP_201_CREATED)
 def create_new_tip(
     *,
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_user_db),
     tip_in: tip_schema.TipCreate,
     # Yahan hum yeh check kar sakte hain ki current user admin hai ya nahi
     # Abhi ke liye, koi bhi logged-in user tip create kar sakta hai
-    current_user: models.User = Depends(deps.get_current_user) 
+    current_user_id: int = Depends(deps.get_current_user_id) 
 ):
     """
     Database mein ek nayi health tip create karta hai.
@@ -33,26 +33,54 @@ def create_new_tip(
 
 
 @router.get("/", response_model=List[tip_schema.Tip])
-def get_all_tips(
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user)
+async def get_all_tips(
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user_id: int = Depends(deps.get_current_user_id),
+    limit: int = Depends(pagination.page_limit),
+    cursor: Optional[str] = None,
+    category: Optional[str] = None
 ):
     """
-    Database se saari health tips ko get karta hai.
+    Database se health tips page-by-page get karta hai (agla page X-Next-Cursor header se).
     """
-    return crud_tip.get_all_tips(db)
+    tips = await crud_tip.get_all_tips_async(
+        db, limit=limit + 1, after=pagination.decode_cursor(cursor, (int,)), category=category
+    )
+    return pagination.finish_page(response, tips, limit, lambda tip: (tip.id,))
+
+
+@router.get("/search", response_model=List[tip_schema.Tip])
+async def search_tips(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="Words to look for in the tip text."),
+    category: Optional[str] = None,
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user_id: int = Depends(deps.get_current_user_id),
+    limit: int = Depends(pagination.page_limit),
+    cursor: Optional[str] = None
+):
+    """
+    Tips ko text (aur optional category) se search karta hai, sabse relevant pehle.
+    Results page-by-page aate hain (agla page X-Next-Cursor header se).
+    """
+    tips = await crud_tip.search_tips_async(
+        db, q, limit=limit + 1, after=pagination.decode_cursor(cursor, (float, int)), category=category
+    )
+    return pagination.finish_page(response, tips, limit, lambda tip: (tip.rank, tip.id))
 
 
 @router.get("/random", response_model=tip_schema.Tip)
-def get_random_tip(
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user)
+async def get_random_tip(
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user_id: int = Depends(deps.get_current_user_id),
+    category: Optional[str] = None
 ):
     """
-    Database se ek random health tip get karta hai.
-    Dashboard is endpoint ka istemal karega.
+    Ek random health tip (category dene par sirf usi category se).
+    Tip memory ke tip pool se aati hai (crud_tip.tip_pool), database sirf pool load karne par lagta hai.
     """
-    random_tip = db.query(models.HealthTip).order_by(func.random()).first()
+    random_tip = await crud_tip.tip_pool.random_tip(db, category=category)
     if not random_tip:
         # Agar database mein koi tip na ho, toh ek default tip bhejna
         return models.HealthTip(id=0, tip_text="Remember to stay hydrated and have a great day!", category="General")
@@ -62,9 +90,9 @@ def get_random_tip(
 @router.delete("/{tip_id}", response_model=tip_schema.Tip)
 def delete_tip_by_id(
     *,
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_user_db),
     tip_id: int,
-    current_user: models.User = Depends(deps.get_current_user)
+    current_user_id: int = Depends(deps.get_current_user_id)
 ):
     """
     Ek specific tip ko uske ID se delete karta hai.
@@ -1,9 +1,11 @@
 # backend/app/api/v1/endpoints/users.py
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.api import deps
+from app.core import security
 from app.db import models
 from app.crud import crud_user
 from app.schemas import user as user_schema
@@ -12,28 +14,32 @@ router = APIRouter()
 
 # This endpoint remains for registration (creating a new user)
 @router.post("/", response_model=user_schema.User, status_code=status.HTTP_201_CREATED)
-def create_user(
+async def create_user(
     *,
     db: Session = Depends(deps.get_db),
     user_in: user_schema.UserCreate
 ):
     """
     Create a new user.
+    The password is hashed in the hashing pool, not the shared threadpool.
     """
-    user = crud_user.get_user_by_email(db, email=user_in.email)
+    user = await run_in_threadpool(crud_user.get_user_by_email, db, email=user_in.email)
     if user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="The user with this email already exists in the system.",
         )
-    user = crud_user.create_user(db=db, user=user_in)
+    hashed_password = await security.get_password_hash_async(user_in.password)
+    user = await run_in_threadpool(
+        crud_user.create_user, db=db, user=user_in, hashed_password=hashed_password
+    )
     return user
 
 
 # --- NEW ENDPOINT TO GET CURRENT USER'S PROFILE ---
 @router.get("/me", response_model=user_schema.User)
 def read_user_me(
-    current_user: models.User = Depends(deps.get_current_user)
+    current_user: models.User = Depends(deps.get_current_db_user)
 ):
     """
     Get current user's profile.
@@ -48,7 +54,7 @@ def update_user_me(
     *,
     db: Session = Depends(deps.get_db),
     user_in: user_schema.UserUpdate,
-    current_user: models.User = Depends(deps.get_current_user)
+    current_user: models.User = Depends(deps.get_current_db_user)
 ):
     """
     Update current user's profile.
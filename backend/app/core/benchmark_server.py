@@ -0,0 +1,149 @@
+# backend/app/core/benchmark_server.py
+
+"""
+Shared pieces of the load benchmarks (login_benchmark, and the async vs
+sync benchmark in app/db): they start the API in its own uvicorn process,
+like startup_timing does, on a scratch SQLite database unless a database
+URL is given, and drive it with concurrent httpx clients.
+
+httpx comes from requirements-dev.txt.
+"""
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+PASSWORD = "benchmark-password"
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def server_environment(database_url: Optional[str] = None, **overrides: str) -> Dict[str, str]:
+    """
+    Environment for a benchmark server: a fresh SQLite file (or 'database_url',
+    which should be a database you don't mind filling with test users), no read
+    replicas and no rate limits, since one client IP sends every login.
+    """
+    if database_url is None:
+        database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='health-companion-bench-'), 'app.db')}"
+    env = dict(os.environ)
+    env.update({"DATABASE_URL": database_url, "READ_REPLICA_URLS": "", "RATE_LIMIT_ENABLED": "false"})
+    env.update(overrides)
+    return env
+
+
+class BenchmarkServer:
+    """
+    `uvicorn <target>` in its own process on a free port. 'target' is an app
+    ("app.main:app") or, with factory=True, a function that builds one.
+    The database is migrated first.
+    """
+
+    def __init__(self, target: str, env: Dict[str, str], factory: bool = False, timeout: float = 60.0):
+        self.port = _free_port()
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        migrate = subprocess.run([sys.executable, "-m", "app.db.migrate"], env=env, capture_output=True, text=True)
+        if migrate.returncode != 0:
+            raise RuntimeError(f"Migrating the benchmark database failed:\n{migrate.stderr}")
+        command = [sys.executable, "-m", "uvicorn", target, "--port", str(self.port), "--log-level", "warning"]
+        if factory:
+            command.append("--factory")
+        self.process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL)
+        self._wait_until_ready(timeout)
+
+    def _wait_until_ready(self, timeout: float) -> None:
+        started = time.perf_counter()
+        while time.perf_counter() - started < timeout:
+            if self.process.poll() is not None:
+                raise RuntimeError("The benchmark server exited before serving a request.")
+            try:
+                with urllib.request.urlopen(f"{self.base_url}/", timeout=1) as response:
+                    if response.status == 200:
+                        return
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.05)
+        self.stop()
+        raise RuntimeError(f"The benchmark server didn't answer within {timeout} seconds.")
+
+    def rss_mb(self) -> Optional[float]:
+        """Resident memory of the server process (Linux only, None elsewhere)."""
+        try:
+            with open(f"/proc/{self.process.pid}/status") as status:
+                for line in status:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1]) / 1024
+        except OSError:
+            pass
+        return None
+
+    def stop(self) -> None:
+        self.process.terminate()
+        self.process.wait()
+
+    def __enter__(self) -> "BenchmarkServer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+
+async def create_users(client: httpx.AsyncClient, count: int, prefix: str = "bench") -> List[Tuple[str, Dict[str, str]]]:
+    """Signs up 'count' users and logs each in. Returns (email, auth headers) pairs."""
+    users = []
+    for n in range(count):
+        email = f"{prefix}{n}@example.com"
+        response = await client.post("/api/v1/users/", json={"email": email, "full_name": "Bench User", "password": PASSWORD})
+        response.raise_for_status()
+        response = await client.post("/api/v1/auth/login/access-token", data={"username": email, "password": PASSWORD})
+        response.raise_for_status()
+        users.append((email, {"Authorization": f"Bearer {response.json()['access_token']}"}))
+    return users
+
+
+async def run_workers(
+    concurrency: int,
+    request: Callable[[int], Awaitable[httpx.Response]],
+    stop: Callable[[], bool],
+    pause: float = 0.0,
+) -> Tuple[List[float], Counter]:
+    """
+    Runs 'concurrency' loops that each send request(worker_number) back to back
+    (or 'pause' seconds apart, not timed) until stop() is true. Returns the
+    latencies (seconds) of the 2xx responses and a count of the response status codes.
+    """
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+
+    async def worker(number: int) -> None:
+        while not stop():
+            if pause:
+                await asyncio.sleep(pause)
+            started = time.perf_counter()
+            response = await request(number)
+            elapsed = time.perf_counter() - started
+            statuses[response.status_code] += 1
+            if response.is_success:
+                latencies.append(elapsed)
+
+    await asyncio.gather(*(worker(number) for number in range(concurrency)))
+    return latencies, statuses
@@ -1,6 +1,7 @@
 # backend/app/core/config.py
 
 import os
+from typing import Optional
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
@@ -17,10 +18,114 @@ class Settings(BaseSettings):
     # --- DATABASE SETTINGS ---
     DATABASE_URL: str
 
+    # --- DATABASE CONNECTION POOL ---
+    # Each worker has two engines (sync and async) with a pool each, so one
+    # worker can open up to 2 * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections.
+    # Keep workers * that number below the database's connection limit.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    # Seconds to wait for a free connection before giving up.
+    DB_POOL_TIMEOUT: float = 30
+    # Replace connections older than this many seconds (-1 = never).
+    DB_POOL_RECYCLE: int = 1800
+    # Liveness check before a connection is handed out:
+    # "always" (a round trip on every checkout), "idle" (only when the
+    # connection was idle for DB_POOL_PRE_PING_IDLE_SECONDS) or "off".
+    DB_POOL_PRE_PING_MODE: str = "always"
+    DB_POOL_PRE_PING_IDLE_SECONDS: float = 30
+
+    # --- READ REPLICAS ---
+    # Comma-separated database URLs of read replicas (empty = primary only).
+    # Read-only endpoints are spread over the healthy replicas.
+    READ_REPLICA_URLS: Optional[str] = None
+    READ_REPLICA_HEALTH_CHECK_SECONDS: int = 15
+    READ_REPLICA_HEALTH_CHECK_TIMEOUT: float = 2
+    # After a user writes, their reads stay on the primary this long,
+    # so they see their own changes despite replication lag.
+    READ_YOUR_WRITES_SECONDS: float = 10
+
+    # --- LIST PAGINATION ---
+    # Page size of the list endpoints when ?limit= isn't given, and the largest allowed.
+    PAGE_SIZE_DEFAULT: int = 100
+    PAGE_SIZE_MAX: int = 500
+    # Most items accepted by one POST /<resource>/bulk request.
+    BULK_CREATE_MAX_ITEMS: int = 100
+    # Rows fetched per round trip by the streaming history export.
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # --- HEALTH TIP POOL ---
+    # Each worker keeps all tips in memory for random picks and reloads them
+    # this often (tips added/deleted through the same worker show up at once).
+    TIP_POOL_TTL_SECONDS: int = 300
+    # Postgres tip search ranks at most this many matching tips (read straight
+    # off the GIN index), so a common word doesn't mean ranking the whole table.
+    TIP_SEARCH_MAX_CANDIDATES: int = 500
+
+    # --- MEDICATION LOG PARTITIONS (Postgres) ---
+    # medication_logs is partitioned by month; this many future months are
+    # created ahead of time by the daily maintenance job.
+    MEDICATION_LOG_PARTITIONS_AHEAD: int = 3
+    # Months of logs to keep attached (None = keep everything). Older months are
+    # detached and then kept as plain tables ("detach"), moved to the 'archive'
+    # schema ("archive") or deleted ("drop").
+    MEDICATION_LOG_RETENTION_MONTHS: Optional[int] = None
+    MEDICATION_LOG_RETENTION_ACTION: str = "archive"
+
     # --- JWT AUTHENTICATION SETTINGS ---
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+
+    # --- PASSWORD HASHING POLICY ---
+    # "bcrypt" or "argon2" (argon2id). Existing hashes that don't match the
+    # policy are re-hashed on the user's next successful login.
+    # Use `python -m app.core.hash_benchmark` to pick the cost for this machine.
+    PASSWORD_HASH_SCHEME: str = "bcrypt"
+    BCRYPT_ROUNDS: int = 12
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536  # KiB (64 MiB)
+    ARGON2_PARALLELISM: int = 4
+
+    # --- PASSWORD HASHING POOL SETTINGS ---
+    # Number of worker processes used for hashing (defaults to the CPU count).
+    HASH_POOL_WORKERS: Optional[int] = None
+    # Maximum hashing jobs (running + waiting) before new requests get a 503.
+    HASH_POOL_MAX_PENDING: int = 32
+
+    # --- AUTHENTICATED USER CACHE SETTINGS ---
+    # How long a user's snapshot may be served from memory before it is reloaded.
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAX_ENTRIES: int = 10000
+    # Verified access tokens kept in memory (each one until its 'exp').
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+
+    # --- DASHBOARD CACHE ---
+    # Each worker keeps every user's assembled dashboard for the current IST day.
+    # The user's own writes through the same worker drop it at once; writes through
+    # other workers show up after this many seconds at most.
+    DASHBOARD_CACHE_TTL_SECONDS: int = 30
+    DASHBOARD_CACHE_MAX_ENTRIES: int = 10000
+    # Users whose adherence history (everything before today) is kept in memory.
+    ADHERENCE_CACHE_MAX_ENTRIES: int = 10000
+
+    # --- INTERNAL METRICS ---
+    # Token that /internal/metrics requires in the X-Metrics-Token header.
+    # When empty the endpoint is off (404): its numbers include pool and
+    # replica errors, which can name database hosts.
+    INTERNAL_METRICS_TOKEN: Optional[str] = None
+
+    # --- RATE LIMITING (login & forgot-password) ---
+    RATE_LIMIT_ENABLED: bool = True
+    # e.g. "redis://localhost:6379/0" to share buckets across workers (needs 'redis').
+    # When empty, each worker keeps its own buckets in memory.
+    RATE_LIMIT_STORAGE_URL: Optional[str] = None
+    # Use the first X-Forwarded-For address as the client IP (only behind a trusted proxy).
+    RATE_LIMIT_TRUST_FORWARDED_FOR: bool = False
+    RATE_LIMIT_PER_IP_CAPACITY: int = 20
+    RATE_LIMIT_PER_IP_PER_MINUTE: float = 20
+    RATE_LIMIT_PER_EMAIL_CAPACITY: int = 5
+    RATE_LIMIT_PER_EMAIL_PER_MINUTE: float = 5
 
     # --- EMAIL SETTINGS FOR PASSWORD RESET ---
     MAIL_USERNAME: str
@@ -0,0 +1,129 @@
+# backend/app/core/hash_benchmark.py
+
+"""
+Measures password hashing cost on the current machine, so each deployment
+can pick hashing parameters that keep login latency under budget.
+
+Usage (from the backend directory):
+    python -m app.core.hash_benchmark
+    python -m app.core.hash_benchmark --scheme argon2 --argon2-memory-cost 19456 --argon2-time-cost 2
+    python -m app.core.hash_benchmark --scheme bcrypt --sweep --budget-ms 250
+
+Without options, the hashing policy from settings is measured.
+"""
+
+import argparse
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+from app.core.config import settings
+from app.core.security import build_pwd_context
+
+PASSWORD = "correct horse battery staple"
+
+# Contexts built in this process, keyed by policy (worker processes keep their own).
+_contexts: Dict[Tuple, object] = {}
+
+
+def _context(policy: Tuple):
+    if policy not in _contexts:
+        _contexts[policy] = build_pwd_context(*policy)
+    return _contexts[policy]
+
+
+def _hash_once(policy: Tuple) -> float:
+    """Hashes the sample password once and returns the time taken in seconds."""
+    context = _context(policy)
+    started = time.perf_counter()
+    context.hash(PASSWORD)
+    return time.perf_counter() - started
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def measure(policy: Tuple, iterations: int, workers: int) -> dict:
+    """
+    Measures one hashing policy.
+    Latency is measured one hash at a time. Throughput is measured with
+    'workers' processes hashing in parallel, like the login hashing pool does.
+    """
+    context = _context(policy)
+    stored_hash = context.hash(PASSWORD)
+
+    hash_times = [_hash_once(policy) for _ in range(iterations)]
+    verify_times = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        context.verify(PASSWORD, stored_hash)
+        verify_times.append(time.perf_counter() - started)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Warm up the workers so process start-up is not counted.
+        list(executor.map(_hash_once, [policy] * workers))
+        started = time.perf_counter()
+        list(executor.map(_hash_once, [policy] * (iterations * workers)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "hash_ms_p50": statistics.median(hash_times) * 1000,
+        "hash_ms_p95": _percentile(hash_times, 95) * 1000,
+        "verify_ms_p50": statistics.median(verify_times) * 1000,
+        "verify_ms_p95": _percentile(verify_times, 95) * 1000,
+        "throughput_per_s": iterations * workers / elapsed,
+    }
+
+
+def _describe(policy: Tuple) -> str:
+    scheme, bcrypt_rounds, time_cost, memory_cost, parallelism = policy
+    if scheme == "bcrypt":
+        return f"bcrypt rounds={bcrypt_rounds}"
+    return f"argon2id t={time_cost} m={memory_cost}KiB p={parallelism}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark password hashing parameters on this machine.")
+    parser.add_argument("--scheme", choices=["bcrypt", "argon2"], default=settings.PASSWORD_HASH_SCHEME)
+    parser.add_argument("--bcrypt-rounds", type=int, default=settings.BCRYPT_ROUNDS)
+    parser.add_argument("--argon2-time-cost", type=int, default=settings.ARGON2_TIME_COST)
+    parser.add_argument("--argon2-memory-cost", type=int, default=settings.ARGON2_MEMORY_COST, help="KiB")
+    parser.add_argument("--argon2-parallelism", type=int, default=settings.ARGON2_PARALLELISM)
+    parser.add_argument("--iterations", type=int, default=10, help="Hashes per measurement.")
+    parser.add_argument("--workers", type=int, default=settings.HASH_POOL_WORKERS or os.cpu_count() or 1,
+                        help="Processes used for the throughput measurement.")
+    parser.add_argument("--sweep", action="store_true",
+                        help="Also try neighbouring costs (bcrypt rounds or argon2 time cost).")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="Mark policies whose p95 verify time is over this budget.")
+    args = parser.parse_args()
+
+    base = (args.scheme, args.bcrypt_rounds, args.argon2_time_cost,
+            args.argon2_memory_cost, args.argon2_parallelism)
+    policies = [base]
+    if args.sweep:
+        if args.scheme == "bcrypt":
+            policies = [(args.scheme, rounds) + base[2:] for rounds in range(10, 15)]
+        else:
+            policies = [base[:2] + (time_cost,) + base[3:] for time_cost in range(1, 5)]
+
+    print(f"CPU count: {os.cpu_count()}, throughput workers: {args.workers}, iterations: {args.iterations}")
+    print(f"{'policy':<40}{'hash p50':>10}{'hash p95':>10}{'verify p50':>12}{'verify p95':>12}{'hashes/s':>10}")
+    for policy in policies:
+        result = measure(policy, args.iterations, args.workers)
+        line = (f"{_describe(policy):<40}"
+                f"{result['hash_ms_p50']:>8.1f}ms{result['hash_ms_p95']:>8.1f}ms"
+                f"{result['verify_ms_p50']:>10.1f}ms{result['verify_ms_p95']:>10.1f}ms"
+                f"{result['throughput_per_s']:>10.1f}")
+        if args.budget_ms is not None and result["verify_ms_p95"] > args.budget_ms:
+            line += "  (over budget)"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
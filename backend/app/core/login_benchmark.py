@@ -0,0 +1,115 @@
+# backend/app/core/login_benchmark.py
+
+"""
+Measures dashboard latency while a burst of logins is hashing passwords,
+with hashing in the process pool (the app as deployed) and inline on the
+shared AnyIO threadpool (how it ran before the hashing pool).
+
+Usage (from the backend directory):
+    python -m app.core.login_benchmark
+    python -m app.core.login_benchmark --logins 400 --login-concurrency 32 --dashboard-concurrency 8
+    python -m app.core.login_benchmark --mode pool --database-url postgresql://.../bench
+
+Each mode gets its own server process (see benchmark_server) and database,
+and the hashing cost comes from settings (e.g. BCRYPT_ROUNDS in .env).
+"""
+
+import argparse
+import asyncio
+import itertools
+import time
+
+import httpx
+
+from app.core.benchmark_server import PASSWORD, BenchmarkServer, create_users, percentile, run_workers, server_environment
+
+SERVERS = {
+    "pool": ("app.main:app", False),
+    "inline": ("app.core.login_benchmark:create_inline_hashing_app", True),
+}
+
+
+def create_inline_hashing_app():
+    """The app with password hashing run on the shared AnyIO threadpool instead of the hashing pool."""
+    from starlette.concurrency import run_in_threadpool
+
+    from app.core import security
+    from app.main import app
+
+    async def run_inline(func, *args):
+        return await run_in_threadpool(func, *args)
+
+    security._run_in_hash_pool = run_inline
+    return app
+
+
+async def _measure(base_url: str, mode: str, args) -> dict:
+    limits = httpx.Limits(max_connections=args.login_concurrency + args.dashboard_concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        users = await create_users(client, args.users, prefix=f"login-{mode}-{int(time.time())}-")
+        _, reader_headers = users[0]
+
+        async def dashboard(_):
+            return await client.get("/api/v1/dashboard/", headers=reader_headers)
+
+        started = time.perf_counter()
+        quiet, _ = await run_workers(
+            args.dashboard_concurrency, dashboard, lambda: time.perf_counter() - started > args.quiet_seconds
+        )
+
+        issued = itertools.count()
+        logins_done = False
+
+        async def login(number):
+            email, _ = users[number % len(users)]
+            return await client.post("/api/v1/auth/login/access-token", data={"username": email, "password": PASSWORD})
+
+        async def login_burst():
+            nonlocal logins_done
+            try:
+                return await run_workers(args.login_concurrency, login, lambda: next(issued) >= args.logins)
+            finally:
+                logins_done = True
+
+        started = time.perf_counter()
+        (_, login_statuses), (busy, _) = await asyncio.gather(
+            login_burst(), run_workers(args.dashboard_concurrency, dashboard, lambda: logins_done)
+        )
+        elapsed = time.perf_counter() - started
+
+    return {"quiet": quiet, "busy": busy, "logins_per_s": login_statuses[200] / elapsed,
+            "rejected": login_statuses[503]}
+
+
+def _row(mode: str, phase: str, latencies, logins: str) -> str:
+    p50, p95, p99 = (percentile(latencies, pct) * 1000 for pct in (50, 95, 99))
+    return f"{mode:<8}{phase:<16}{len(latencies):>9}{p50:>9.1f}ms{p95:>9.1f}ms{p99:>9.1f}ms  {logins}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark dashboard latency during a login burst.")
+    parser.add_argument("--mode", choices=["both", *SERVERS], default="both",
+                        help="pool: hashing in the process pool; inline: hashing on the AnyIO threadpool.")
+    parser.add_argument("--logins", type=int, default=200, help="Logins in the burst.")
+    parser.add_argument("--login-concurrency", type=int, default=32)
+    parser.add_argument("--dashboard-concurrency", type=int, default=8)
+    parser.add_argument("--users", type=int, default=16, help="Accounts the logins cycle through.")
+    parser.add_argument("--quiet-seconds", type=float, default=3.0,
+                        help="How long to measure the dashboard alone first.")
+    parser.add_argument("--database-url", default=None,
+                        help="Database to run against (default: a scratch SQLite file per mode).")
+    args = parser.parse_args()
+
+    modes = list(SERVERS) if args.mode == "both" else [args.mode]
+    print(f"{'mode':<8}{'phase':<16}{'requests':>9}{'p50':>11}{'p95':>11}{'p99':>11}  logins")
+    for mode in modes:
+        target, factory = SERVERS[mode]
+        with BenchmarkServer(target, server_environment(args.database_url), factory=factory) as server:
+            result = asyncio.run(_measure(server.base_url, mode, args))
+        print(_row(mode, "dashboard only", result["quiet"], "-"))
+        print(_row(mode, "during logins", result["busy"],
+                   f"{result['logins_per_s']:.1f}/s, {result['rejected']} rejected (503)"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+# backend/app/core/rate_limit.py
+
+import json
+import math
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from app.core.config import settings
+
+
+# --- Bucket Policy ---
+
+@dataclass(frozen=True)
+class BucketPolicy:
+    """A token bucket: holds up to 'capacity' tokens and regains 'refill_per_minute' per minute."""
+    capacity: int
+    refill_per_minute: float
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.refill_per_minute / 60.0
+
+    @property
+    def full_after_seconds(self) -> float:
+        """Time an empty bucket needs to fill up again (after that it can be forgotten)."""
+        return self.capacity / self.refill_per_second
+
+
+# --- Storage Backends ---
+
+class RateLimitStore(ABC):
+    """
+    Storage interface for token buckets.
+    Each call must check and take tokens in one atomic step.
+    """
+
+    @abstractmethod
+    async def consume(self, key: str, policy: BucketPolicy, cost: float = 1.0) -> Tuple[bool, float]:
+        """
+        Takes 'cost' tokens from the bucket at 'key'.
+
+        Returns:
+            (allowed, retry_after_seconds). retry_after is 0 when allowed.
+        """
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """
+    Keeps buckets in this process's memory (one set of buckets per worker).
+    Buckets that have filled up again are the same as new ones, so they are
+    evicted every 'evict_interval' seconds to keep memory bounded.
+    'clock' returns the current time in seconds (tests pass a fake one).
+    """
+
+    def __init__(self, evict_interval: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        self.evict_interval = evict_interval
+        self.clock = clock
+        # key -> [tokens, updated_at, seconds until full]
+        self._buckets: Dict[str, List[float]] = {}
+        self._next_eviction = clock() + evict_interval
+
+    async def consume(self, key: str, policy: BucketPolicy, cost: float = 1.0) -> Tuple[bool, float]:
+        # Runs on the event loop thread only, so no lock is needed.
+        now = self.clock()
+        if now >= self._next_eviction:
+            self.evict_idle(now)
+
+        tokens, updated_at, _ = self._buckets.get(key, (policy.capacity, now, 0))
+        tokens = min(policy.capacity, tokens + (now - updated_at) * policy.refill_per_second)
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        self._buckets[key] = [tokens, now, policy.full_after_seconds]
+        retry_after = 0.0 if allowed else (cost - tokens) / policy.refill_per_second
+        return allowed, retry_after
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """Removes buckets that have been idle long enough to be full again."""
+        now = self.clock() if now is None else now
+        idle = [
+            key for key, (_, updated_at, full_after) in self._buckets.items()
+            if now - updated_at >= full_after
+        ]
+        for key in idle:
+            del self._buckets[key]
+        self._next_eviction = now + self.evict_interval
+        return len(idle)
+
+
+class RedisRateLimitStore(RateLimitStore):
+    """
+    Keeps buckets in a Redis-protocol server (Redis, Valkey, KeyDB, ...), so all
+    workers share the same limits. The bucket update runs as a Lua script,
+    which makes it atomic. Idle keys expire on their own once the bucket would be full.
+    Needs the optional 'redis' package.
+    """
+
+    _SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local cost = tonumber(ARGV[4])
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    local allowed = 0
+    local retry_after = 0
+    if tokens >= cost then
+        tokens = tokens - cost
+        allowed = 1
+    else
+        retry_after = (cost - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+    redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+    return {allowed, tostring(retry_after)}
+    """
+
+    def __init__(self, url: str, key_prefix: str = "ratelimit:"):
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError as exc:
+            raise RuntimeError(
+                "RATE_LIMIT_STORAGE_URL is set but the 'redis' package is not installed."
+            ) from exc
+        self.key_prefix = key_prefix
+        self._client = redis_asyncio.from_url(url)
+        self._script = self._client.register_script(self._SCRIPT)
+
+    async def consume(self, key: str, policy: BucketPolicy, cost: float = 1.0) -> Tuple[bool, float]:
+        allowed, retry_after = await self._script(
+            keys=[self.key_prefix + key],
+            args=[policy.capacity, policy.refill_per_second, time.time(), cost],
+        )
+        return bool(allowed), float(retry_after)
+
+
+def create_store() -> RateLimitStore:
+    """Uses a shared Redis-protocol store if one is configured, else in-process memory."""
+    if settings.RATE_LIMIT_STORAGE_URL:
+        return RedisRateLimitStore(settings.RATE_LIMIT_STORAGE_URL)
+    return MemoryRateLimitStore()
+
+
+# --- ASGI Middleware ---
+
+class RateLimitMiddleware:
+    """
+    Rate-limits CPU-heavy auth endpoints with two token buckets per request:
+    one per client IP, and one per target email (read from the form or JSON body).
+    Requests over either limit get a 429 with a Retry-After header.
+    Other paths pass straight through.
+    """
+
+    # Login posts a form ('username'); forgot-password posts JSON ('email').
+    EMAIL_FIELDS = ("username", "email")
+    # Larger bodies get a 413 without being read to the end.
+    MAX_BODY_BYTES = 64 * 1024
+
+    def __init__(self, app, store: RateLimitStore, paths: Tuple[str, ...],
+                 ip_policy: BucketPolicy, email_policy: BucketPolicy):
+        self.app = app
+        self.store = store
+        self.paths = set(paths)
+        self.ip_policy = ip_policy
+        self.email_policy = email_policy
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        allowed, retry_after = await self.store.consume(f"ip:{path}:{self._client_ip(scope)}", self.ip_policy)
+        if not allowed:
+            await self._reject(send, retry_after)
+            return
+
+        # Read the (small) body to find the email, then replay it to the endpoint.
+        body = await self._read_body(scope, receive, self.MAX_BODY_BYTES)
+        if body is None:
+            # Not a real login form, and it isn't buffered any further.
+            await self._send_json(send, 413, {"detail": "Request body too large."})
+            return
+        email = self._extract_email(scope, body)
+        if email:
+            allowed, retry_after = await self.store.consume(f"email:{path}:{email}", self.email_policy)
+            if not allowed:
+                await self._reject(send, retry_after)
+                return
+
+        body_sent = False
+
+        async def replay_receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        await self.app(scope, replay_receive, send)
+
+    @staticmethod
+    def _client_ip(scope) -> str:
+        if settings.RATE_LIMIT_TRUST_FORWARDED_FOR:
+            for name, value in scope.get("headers", []):
+                if name == b"x-forwarded-for":
+                    return value.decode("latin-1").split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    @staticmethod
+    async def _read_body(scope, receive, limit: int) -> Optional[bytes]:
+        """
+        The whole request body, or None as soon as it's known to be over 'limit'
+        bytes (from Content-Length, or while reading), so at most 'limit' bytes are held.
+        """
+        for name, value in scope.get("headers", []):
+            if name == b"content-length":
+                if value.isdigit() and int(value) > limit:
+                    return None
+                break
+        chunks, size = [], 0
+        while True:
+            message = await receive()
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > limit:
+                return None
+            chunks.append(chunk)
+            if not message.get("more_body", False):
+                break
+        return b"".join(chunks)
+
+    def _extract_email(self, scope, body: bytes) -> Optional[str]:
+        content_type = ""
+        for name, value in scope.get("headers", []):
+            if name == b"content-type":
+                content_type = value.decode("latin-1")
+                break
+        try:
+            if content_type.startswith("application/json"):
+                data = json.loads(body or b"{}")
+                values = {field: data.get(field) for field in self.EMAIL_FIELDS} if isinstance(data, dict) else {}
+            else:
+                form = parse_qs(body.decode("utf-8", errors="ignore"))
+                values = {field: (form.get(field) or [None])[0] for field in self.EMAIL_FIELDS}
+        except ValueError:
+            return None
+        for field in self.EMAIL_FIELDS:
+            value = values.get(field)
+            if isinstance(value, str) and value.strip():
+                return value.strip().lower()
+        return None
+
+    @classmethod
+    async def _reject(cls, send, retry_after: float):
+        await cls._send_json(
+            send, 429, {"detail": "Too many requests. Please try again later."},
+            [(b"retry-after", str(max(1, math.ceil(retry_after))).encode())],
+        )
+
+    @staticmethod
+    async def _send_json(send, status: int, content: dict, headers: Optional[List[Tuple[bytes, bytes]]] = None):
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), *(headers or [])],
+        })
+        await send({"type": "http.response.body", "body": json.dumps(content).encode()})
@@ -1,7 +1,11 @@
 # backend/app/core/security.py
 
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Optional, Tuple
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -11,10 +15,55 @@ from app.core.config import settings
 
 # --- Password Hashing Setup ---
 # We use passlib's CryptContext to handle password hashing.
-# "bcrypt" is the recommended hashing algorithm.
-# The "auto" scheme will automatically use bcrypt for new hashes and also
-# be able to verify passwords hashed with other algorithms if we add more later.
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# The hashing policy (bcrypt or argon2id, and its cost parameters) comes from
+# settings, so each deployment can tune it (see app/core/hash_benchmark.py).
+# Both schemes can always be verified. deprecated="auto" marks every scheme
+# except the configured one as outdated, and min/max rounds are pinned to the
+# configured cost, so needs_update() is True for any hash that doesn't match
+# the current policy. Such hashes are replaced on the next successful login.
+
+def build_pwd_context(
+    scheme: str,
+    bcrypt_rounds: int,
+    argon2_time_cost: int,
+    argon2_memory_cost: int,
+    argon2_parallelism: int,
+) -> CryptContext:
+    """
+    Creates a CryptContext for the given hashing policy.
+
+    Args:
+        scheme: "bcrypt" or "argon2" (argon2id) - used for all new hashes.
+        bcrypt_rounds: bcrypt cost factor (log2 of the iteration count).
+        argon2_time_cost: Number of argon2 passes over memory.
+        argon2_memory_cost: argon2 memory usage in KiB.
+        argon2_parallelism: Number of argon2 lanes.
+    """
+    if scheme not in ("bcrypt", "argon2"):
+        raise ValueError(f"Unsupported PASSWORD_HASH_SCHEME: {scheme!r}")
+    return CryptContext(
+        schemes=["argon2", "bcrypt"],
+        default=scheme,
+        deprecated="auto",
+        bcrypt__rounds=bcrypt_rounds,
+        bcrypt__min_rounds=bcrypt_rounds,
+        bcrypt__max_rounds=bcrypt_rounds,
+        argon2__type="ID",
+        argon2__rounds=argon2_time_cost,
+        argon2__min_rounds=argon2_time_cost,
+        argon2__max_rounds=argon2_time_cost,
+        argon2__memory_cost=argon2_memory_cost,
+        argon2__parallelism=argon2_parallelism,
+    )
+
+
+pwd_context = build_pwd_context(
+    scheme=settings.PASSWORD_HASH_SCHEME,
+    bcrypt_rounds=settings.BCRYPT_ROUNDS,
+    argon2_time_cost=settings.ARGON2_TIME_COST,
+    argon2_memory_cost=settings.ARGON2_MEMORY_COST,
+    argon2_parallelism=settings.ARGON2_PARALLELISM,
+)
 
 
 # --- Security Functions ---
@@ -46,12 +95,93 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifies a password and, if the stored hash doesn't match the current
+    hashing policy, creates a replacement hash.
+
+    Returns:
+        (is_valid, new_hash). new_hash is None when the stored hash is up to date.
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+# --- Hashing Worker Pool ---
+# Password hashing is deliberately slow (~250 ms per bcrypt call). If it runs on the shared
+# AnyIO threadpool, a burst of logins makes every other sync endpoint wait
+# behind it. So async endpoints send hashing to a separate process pool,
+# and the number of waiting jobs is capped so a login spike fails fast
+# with a 503 instead of piling up.
+
+class HashingPoolSaturated(Exception):
+    """Raised when too many hashing jobs are already waiting for a worker."""
+
+
+_hash_executor: Optional[ProcessPoolExecutor] = None
+_hash_pending = 0
+
+
+def _get_hash_executor() -> ProcessPoolExecutor:
+    """Creates the hashing process pool on first use."""
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = ProcessPoolExecutor(
+            max_workers=settings.HASH_POOL_WORKERS or os.cpu_count() or 1,
+            # "spawn" avoids forking a process that already has running threads.
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _hash_executor
+
+
+async def _run_in_hash_pool(func, *args):
+    """
+    Runs a hashing function in the worker pool.
+
+    Raises:
+        HashingPoolSaturated: If HASH_POOL_MAX_PENDING jobs are already queued.
+    """
+    global _hash_pending
+    # The counter is only touched from the event loop thread, so no lock is needed.
+    if _hash_pending >= settings.HASH_POOL_MAX_PENDING:
+        raise HashingPoolSaturated()
+    _hash_pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_hash_executor(), func, *args)
+    finally:
+        _hash_pending -= 1
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Async version of verify_password that runs in the hashing pool."""
+    return await _run_in_hash_pool(verify_password, plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Async version of verify_and_update_password that runs in the hashing pool."""
+    return await _run_in_hash_pool(verify_and_update_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Async version of get_password_hash that runs in the hashing pool."""
+    return await _run_in_hash_pool(get_password_hash, password)
+
+
+def shutdown_hash_pool() -> None:
+    """Stops the hashing worker processes (called on application shutdown)."""
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Creates a new JWT access token.
 
     Args:
-        data: A dictionary containing the data to encode in the token (e.g., user's email).
+        data: A dictionary containing the claims to encode in the token
+              (e.g., user's email, id and token version).
         expires_delta: An optional timedelta object for when the token should expire.
                        If not provided, the default from settings is used.
 
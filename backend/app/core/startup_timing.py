@@ -0,0 +1,105 @@
+# backend/app/core/startup_timing.py
+
+"""
+Cold-start timing: how long a worker takes from importing app.main to
+serving its first 200 response. The numbers are shown on /internal/metrics.
+
+To measure a whole process start (interpreter + imports + first request),
+run from the backend directory:
+
+    python -m app.core.startup_timing
+"""
+
+import time
+from typing import Optional
+
+
+class ColdStartTimer:
+    """Keeps the cold-start timestamps of this worker process (time.perf_counter values)."""
+
+    def __init__(self):
+        self.import_started_at: Optional[float] = None
+        self.ready_at: Optional[float] = None
+        self.first_ok_at: Optional[float] = None
+
+    def mark_import_started(self, at: float) -> None:
+        self.import_started_at = at
+
+    def mark_ready(self) -> None:
+        """Called when app startup (lifespan) has finished."""
+        self.ready_at = time.perf_counter()
+
+    def mark_first_ok(self) -> None:
+        self.first_ok_at = time.perf_counter()
+        print(f"--- Cold start: first 200 response {self._since_import(self.first_ok_at)} ms after import ---")
+
+    def _since_import(self, at: Optional[float]) -> Optional[float]:
+        if at is None or self.import_started_at is None:
+            return None
+        return round((at - self.import_started_at) * 1000, 1)
+
+    def stats(self) -> dict:
+        return {
+            "import_to_ready_ms": self._since_import(self.ready_at),
+            "import_to_first_200_ms": self._since_import(self.first_ok_at),
+        }
+
+
+cold_start = ColdStartTimer()
+
+
+class ColdStartMiddleware:
+    """
+    Records the first 200 response of this worker. After that it only
+    does one attribute check per request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or cold_start.first_ok_at is not None:
+            await self.app(scope, receive, send)
+            return
+
+        async def timed_send(message):
+            if (message["type"] == "http.response.start" and message["status"] == 200
+                    and cold_start.first_ok_at is None):
+                cold_start.mark_first_ok()
+            await send(message)
+
+        await self.app(scope, receive, timed_send)
+
+
+def measure_process_cold_start(port: int = 8765, timeout: float = 60.0) -> float:
+    """
+    Starts `uvicorn app.main:app` in a new process, polls '/' until it returns
+    200, then stops the server. Returns the elapsed time in milliseconds.
+    """
+    import subprocess
+    import sys
+    import urllib.error
+    import urllib.request
+
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if server.poll() is not None:
+                raise RuntimeError("The server exited before serving a request.")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1) as response:
+                    if response.status == 200:
+                        return (time.perf_counter() - started) * 1000
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.02)
+        raise RuntimeError(f"No 200 response within {timeout} seconds.")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    print(f"Cold start (process start to first 200): {measure_process_cold_start():.0f} ms")
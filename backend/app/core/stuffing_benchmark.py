@@ -0,0 +1,155 @@
+# backend/app/core/stuffing_benchmark.py
+
+"""
+Credential-stuffing load check: legitimate logins and dashboard requests
+keep their latency while many attacker IPs try wrong passwords against
+existing accounts. It runs once with the auth rate limits on (as deployed)
+and once with them off, for comparison.
+
+Usage (from the backend directory):
+    python -m app.core.stuffing_benchmark
+    python -m app.core.stuffing_benchmark --attack-concurrency 64 --attacker-ips 50 --seconds 20
+    python -m app.core.stuffing_benchmark --attack-interval 0   # flood instead of a steady rate
+    python -m app.core.stuffing_benchmark --limits on --database-url postgresql://.../bench
+
+Clients are told apart by X-Forwarded-For (the server runs with
+RATE_LIMIT_TRUST_FORWARDED_FOR), so one machine can play many IPs. The
+attack targets its own victim accounts: going after the legitimate users'
+emails would just (and correctly) get those accounts limited too. The
+limits themselves come from settings (RATE_LIMIT_* in .env).
+
+The attack runs at a steady rate (attack concurrency / attack interval
+attempts per second), far more than bcrypt can check. With
+--attack-interval 0 it floods instead, and on a small machine that shares
+its CPU with this script the server is then busy just answering the 429s:
+that's a job for a proxy or firewall in front of it, not the auth limits.
+"""
+
+import argparse
+import asyncio
+import itertools
+import random
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+
+import httpx
+
+from app.core.benchmark_server import PASSWORD, BenchmarkServer, percentile, run_workers, server_environment
+
+LOGIN = "/api/v1/auth/login/access-token"
+
+
+def _ip(group: int, number: int) -> Dict[str, str]:
+    return {"X-Forwarded-For": f"10.{group}.{number // 250}.{number % 250 + 1}"}
+
+
+async def _sign_up(client: httpx.AsyncClient, emails: List[str], ip_group: int) -> List[Dict[str, str]]:
+    """Creates the accounts and logs each in once from its own IP. Returns their auth headers."""
+    headers = []
+    for number, email in enumerate(emails):
+        response = await client.post("/api/v1/users/", json={"email": email, "full_name": "Bench User", "password": PASSWORD})
+        response.raise_for_status()
+        response = await client.post(LOGIN, data={"username": email, "password": PASSWORD}, headers=_ip(ip_group, number))
+        response.raise_for_status()
+        headers.append({"Authorization": f"Bearer {response.json()['access_token']}"})
+    return headers
+
+
+async def _measure(base_url: str, mode: str, args) -> dict:
+    limits = httpx.Limits(max_connections=args.attack_concurrency + args.dashboard_concurrency + 4)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        prefix = f"stuffing-{mode}-{int(time.time())}-"
+        legit_emails = [f"{prefix}user{n}@example.com" for n in range(args.users)]
+        victim_emails = [f"{prefix}victim{n}@example.com" for n in range(args.victims)]
+        legit_headers = await _sign_up(client, legit_emails, ip_group=1)
+        await _sign_up(client, victim_emails, ip_group=2)
+
+        # Legitimate logins come one at a time, each user from their own IP and the
+        # accounts taking turns, so none of them goes over the per-email limit.
+        next_login = itertools.count()
+
+        async def login(_):
+            number = next(next_login) % len(legit_emails)
+            return await client.post(LOGIN, data={"username": legit_emails[number], "password": PASSWORD},
+                                     headers=_ip(1, number))
+
+        async def dashboard(number):
+            return await client.get("/api/v1/dashboard/", headers=legit_headers[number % len(legit_headers)])
+
+        async def legit_traffic(stop):
+            return await asyncio.gather(
+                run_workers(1, login, stop, args.login_interval),
+                run_workers(args.dashboard_concurrency, dashboard, stop, args.dashboard_interval),
+            )
+
+        started = time.perf_counter()
+        quiet = await legit_traffic(lambda: time.perf_counter() - started > args.seconds)
+
+        rng = random.Random(0)
+
+        async def attack(_):
+            email = rng.choice(victim_emails)
+            return await client.post(LOGIN, data={"username": email, "password": "wrong-password"},
+                                     headers=_ip(3, rng.randrange(args.attacker_ips)))
+
+        started = time.perf_counter()
+        busy, (_, attack_statuses) = await asyncio.gather(
+            legit_traffic(lambda: time.perf_counter() - started > args.seconds),
+            run_workers(args.attack_concurrency, attack, lambda: time.perf_counter() - started > args.seconds,
+                        args.attack_interval),
+        )
+        elapsed = time.perf_counter() - started
+
+    return {"quiet": quiet, "busy": busy, "attempts_per_s": sum(attack_statuses.values()) / elapsed,
+            "attack_statuses": attack_statuses}
+
+
+def _row(mode: str, phase: str, kind: str, result: Tuple[List[float], Counter], attack: str = "-") -> str:
+    latencies, statuses = result
+    p50, p95, p99 = (percentile(latencies or [0.0], pct) * 1000 for pct in (50, 95, 99))
+    failed = sum(count for status, count in statuses.items() if status >= 400)
+    return (f"{mode:<7}{phase:<10}{kind:<11}{len(latencies):>9}{failed:>8}"
+            f"{p50:>9.1f}ms{p95:>9.1f}ms{p99:>9.1f}ms  {attack}")
+
+
+def _attack_summary(result: dict) -> str:
+    statuses = result["attack_statuses"]
+    return (f"{result['attempts_per_s']:.0f} attempts/s: {statuses[401]} checked (401), "
+            f"{statuses[429]} limited (429), {statuses[503]} pool full (503)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Legitimate latency during a credential-stuffing burst.")
+    parser.add_argument("--limits", choices=["both", "on", "off"], default="both",
+                        help="Run with the auth rate limits on, off, or both.")
+    parser.add_argument("--seconds", type=float, default=60.0, help="Length of the quiet and the attack phase.")
+    parser.add_argument("--users", type=int, default=20, help="Legitimate accounts.")
+    parser.add_argument("--victims", type=int, default=5, help="Accounts the attack targets.")
+    parser.add_argument("--login-interval", type=float, default=1.0, help="Pause between legitimate logins (seconds).")
+    parser.add_argument("--dashboard-concurrency", type=int, default=2)
+    parser.add_argument("--dashboard-interval", type=float, default=0.1,
+                        help="Pause between dashboard requests, per worker (seconds).")
+    parser.add_argument("--attack-concurrency", type=int, default=32)
+    parser.add_argument("--attack-interval", type=float, default=1.0,
+                        help="Pause between attempts, per attack worker (seconds); 0 floods as fast as the server answers.")
+    parser.add_argument("--attacker-ips", type=int, default=2)
+    parser.add_argument("--database-url", default=None,
+                        help="Database to run against (default: a scratch SQLite file per run).")
+    args = parser.parse_args()
+
+    modes = ["on", "off"] if args.limits == "both" else [args.limits]
+    print(f"{'limits':<7}{'phase':<10}{'traffic':<11}{'requests':>9}{'failed':>8}{'p50':>11}{'p95':>11}{'p99':>11}  attack")
+    for mode in modes:
+        env = server_environment(args.database_url, RATE_LIMIT_ENABLED="true" if mode == "on" else "false",
+                                 RATE_LIMIT_TRUST_FORWARDED_FOR="true")
+        with BenchmarkServer("app.main:app", env) as server:
+            result = asyncio.run(_measure(server.base_url, mode, args))
+        for phase in ("quiet", "busy"):
+            (logins, dashboards), phase_name = result[phase], "quiet" if phase == "quiet" else "attacked"
+            print(_row(mode, phase_name, "login", logins, _attack_summary(result) if phase == "busy" else "-"))
+            print(_row(mode, phase_name, "dashboard", dashboards))
+
+
+if __name__ == "__main__":
+    main()
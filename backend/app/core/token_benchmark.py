@@ -0,0 +1,120 @@
+# backend/app/core/token_benchmark.py
+
+"""
+Measures the per-request cost of the auth dependency (deps._authenticate)
+with and without the decoded-token cache, for different numbers of
+distinct active tokens.
+
+Usage (from the backend directory):
+    python -m app.core.token_benchmark
+    python -m app.core.token_benchmark --tokens 1000 5000 10000 20000 --requests 50000
+    python -m app.core.token_benchmark --max-entries 5000
+
+Users are served from the user snapshot cache, as for any active user, so
+no database is touched. Every token is seen once before timing starts
+(active users), then requests pick tokens at random.
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import List
+
+from app.api import deps
+from app.core import security
+from app.core.config import settings
+from app.crud import crud_user
+from app.db.database import AsyncSessionLocal
+from app.schemas import user as user_schema
+from app.utils.cache import TTLCache
+
+
+class _NoTokenCache:
+    """Stands in for deps.token_cache so every request decodes its JWT."""
+
+    def get(self, key, default=None):
+        return default
+
+    def set(self, key, value, ttl=None):
+        pass
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _make_tokens(count: int) -> List[str]:
+    """Tokens for users 1..count, whose snapshots are put in the user cache."""
+    crud_user.user_snapshot_cache = TTLCache(maxsize=count, ttl=3600)
+    tokens = []
+    for user_id in range(1, count + 1):
+        email = f"user{user_id}@example.com"
+        crud_user.user_snapshot_cache.set(
+            user_id, user_schema.UserSnapshot(id=user_id, email=email, is_active=True, token_version=0)
+        )
+        tokens.append(security.create_access_token(data={"sub": email, "uid": user_id, "ver": 0}))
+    return tokens
+
+
+async def _time_requests(tokens: List[str], order: List[int]) -> List[float]:
+    async with AsyncSessionLocal() as db:  # never connects: users come from the cache
+        for token in tokens:
+            await deps._authenticate(db, token)
+        if isinstance(deps.token_cache, TTLCache):
+            deps.token_cache.hits = deps.token_cache.misses = 0  # count the timed requests only
+        timings = []
+        for index in order:
+            started = time.perf_counter()
+            await deps._authenticate(db, tokens[index])
+            timings.append(time.perf_counter() - started)
+    return timings
+
+
+def measure(tokens: List[str], requests: int, max_entries: int) -> dict:
+    order = [random.randrange(len(tokens)) for _ in range(requests)]
+
+    deps.token_cache = _NoTokenCache()
+    uncached = asyncio.run(_time_requests(tokens, order))
+
+    deps.token_cache = TTLCache(maxsize=max_entries, ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+    cached = asyncio.run(_time_requests(tokens, order))
+    stats = deps.token_cache.stats()
+
+    return {
+        "uncached_us_p50": statistics.median(uncached) * 1e6,
+        "uncached_us_p99": _percentile(uncached, 99) * 1e6,
+        "cached_us_p50": statistics.median(cached) * 1e6,
+        "cached_us_p99": _percentile(cached, 99) * 1e6,
+        "hit_rate": stats["hit_rate"],
+        "size": stats["size"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the auth dependency with and without the token cache.")
+    parser.add_argument("--tokens", type=int, nargs="+", default=[1000, 5000, 10000],
+                        help="Numbers of distinct active tokens to try.")
+    parser.add_argument("--requests", type=int, default=20000, help="Timed requests per token count.")
+    parser.add_argument("--max-entries", type=int, default=settings.TOKEN_CACHE_MAX_ENTRIES,
+                        help="Token cache size (TOKEN_CACHE_MAX_ENTRIES).")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    print(f"Token cache size: {args.max_entries}, timed requests per row: {args.requests}")
+    print(f"{'tokens':>8}{'uncached p50':>14}{'uncached p99':>14}{'cached p50':>12}{'cached p99':>12}"
+          f"{'hit rate':>10}{'cache size':>12}")
+    for count in args.tokens:
+        result = measure(_make_tokens(count), args.requests, args.max_entries)
+        print(f"{count:>8}"
+              f"{result['uncached_us_p50']:>12.1f}us{result['uncached_us_p99']:>12.1f}us"
+              f"{result['cached_us_p50']:>10.1f}us{result['cached_us_p99']:>10.1f}us"
+              f"{result['hit_rate']:>10.1%}{result['size']:>12}")
+
+
+if __name__ == "__main__":
+    main()
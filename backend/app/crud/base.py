@@ -0,0 +1,82 @@
+# backend/app/crud/base.py
+# Async: these methods take an AsyncSession (see db/database.get_async_db).
+
+from typing import Any, Callable, Dict, Generic, NoReturn, Optional, Type, TypeVar
+
+from fastapi import HTTPException
+from sqlalchemy import delete, exists, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.unit_of_work import UnitOfWork
+
+ModelT = TypeVar("ModelT")
+
+
+class OwnerScopedRepository(Generic[ModelT]):
+    """
+    Get/update/delete by id for tables whose rows belong to one user (owner_id).
+
+    The ownership check is part of the SQL (WHERE id = :id AND owner_id = :owner),
+    so a mutation is a single UPDATE/DELETE ... RETURNING instead of a SELECT,
+    a check in Python and then the write. Only when nothing matched is a second,
+    cheap query made to tell "no such row" (404) from "someone else's row" (403).
+    With hide_other_owners=True both cases are 404, so ids of other users' rows
+    aren't revealed. on_change(owner_id) is called after an update/delete commits.
+    """
+
+    def __init__(
+        self,
+        model: Type[ModelT],
+        label: str,
+        hide_other_owners: bool = False,
+        on_change: Optional[Callable[[int], None]] = None,
+    ):
+        self.model = model
+        self.label = label
+        self.hide_other_owners = hide_other_owners
+        self.on_change = on_change
+
+    def _changed(self, uow: UnitOfWork, owner_id: int) -> None:
+        if self.on_change is not None:
+            uow.after_commit(lambda: self.on_change(owner_id))
+
+    def _owned(self, obj_id: int, owner_id: int):
+        return self.model.id == obj_id, self.model.owner_id == owner_id
+
+    async def _not_found(self, db: AsyncSession, obj_id: int) -> NoReturn:
+        if not self.hide_other_owners and await db.scalar(select(exists().where(self.model.id == obj_id))):
+            raise HTTPException(status_code=403, detail="Not enough permissions")
+        raise HTTPException(status_code=404, detail=f"{self.label} not found")
+
+    async def get(self, db: AsyncSession, obj_id: int, owner_id: int) -> ModelT:
+        """The owner's row with this id; raises 404/403 otherwise."""
+        obj = await db.scalar(select(self.model).where(*self._owned(obj_id, owner_id)))
+        return obj if obj is not None else await self._not_found(db, obj_id)
+
+    async def update(self, db: AsyncSession, obj_id: int, owner_id: int, values: Dict[str, Any]) -> ModelT:
+        """UPDATE ... WHERE id AND owner_id RETURNING the row; raises 404/403 if nothing matched."""
+        if not values:
+            return await self.get(db, obj_id, owner_id)
+        async with UnitOfWork(db) as uow:
+            obj = await db.scalar(
+                update(self.model).where(*self._owned(obj_id, owner_id)).values(**values).returning(self.model)
+            )
+            if obj is None:
+                await self._not_found(db, obj_id)
+            self._changed(uow, owner_id)
+            return obj
+
+    async def before_delete(self, db: AsyncSession, obj_id: int, owner_id: int) -> None:
+        """Hook for dependent rows, run in the delete's transaction. Must stay owner-scoped too."""
+
+    async def delete(self, db: AsyncSession, obj_id: int, owner_id: int) -> ModelT:
+        """DELETE ... WHERE id AND owner_id RETURNING the row; raises 404/403 if nothing matched."""
+        async with UnitOfWork(db) as uow:
+            await self.before_delete(db, obj_id, owner_id)
+            obj = await db.scalar(
+                delete(self.model).where(*self._owned(obj_id, owner_id)).returning(self.model)
+            )
+            if obj is None:
+                await self._not_found(db, obj_id)
+            self._changed(uow, owner_id)
+            return obj
@@ -0,0 +1,153 @@
+# backend/app/crud/crud_adherence.py
+# Async: these functions take an AsyncSession (see db/database.get_async_db).
+
+from datetime import date, datetime, timedelta
+from typing import Collection, Dict, List, Optional, Sequence
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db import models
+from app.utils.adherence import (
+    TREND_WINDOWS, AdherenceCalendar, adherence_report, bitmaps_from_logs, day_bit, ist_date, month_start,
+)
+from app.utils.cache import TTLCache
+
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+# --- Adherence history, memoized per user and IST day ---
+# (owner_id, day) -> {medication_id: (schedule, DoseBits up to that day, without its dose)}.
+# Doses are always logged "now", so the past doesn't change during the day: each
+# medication's bitmaps are read and laid out once a day, and only today's dose
+# (get_taken_ids_on) is added per request. A new medication or a changed
+# schedule reloads just that medication. Yesterday's entries age out with the TTL.
+adherence_history_cache = TTLCache(maxsize=settings.ADHERENCE_CACHE_MAX_ENTRIES, ttl=24 * 60 * 60)
+
+
+async def record_dose(db: AsyncSession, medication_id: int, owner_id: int, taken_at: datetime) -> None:
+    """
+    Sets the day's bit in the medication's bitmap for that month.
+    Doesn't commit: it's meant to go in the same transaction as the log row.
+    The upsert ORs the bit in, so concurrent doses can't overwrite each other.
+    """
+    day = ist_date(taken_at)
+    table = models.MedicationAdherence.__table__
+    insert = _INSERTS[db.get_bind().dialect.name]
+    stmt = insert(table).values(
+        medication_id=medication_id, month=month_start(day), owner_id=owner_id, taken_days=day_bit(day)
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.medication_id, table.c.month],
+        set_={"taken_days": table.c.taken_days.op("|")(stmt.excluded.taken_days)},
+    )
+    await db.execute(stmt)
+
+
+async def get_taken_ids_on(db: AsyncSession, owner_id: int, day: date) -> List[int]:
+    """IDs of the user's medications taken on an IST day (one indexed lookup)."""
+    result = await db.scalars(select(models.MedicationAdherence.medication_id).where(
+        models.MedicationAdherence.owner_id == owner_id,
+        models.MedicationAdherence.month == month_start(day),
+        models.MedicationAdherence.taken_days.op("&")(day_bit(day)) != 0,
+    ))
+    return list(result.all())
+
+
+async def get_months(db: AsyncSession, medication_id: int, until: Optional[date] = None) -> Dict[date, int]:
+    """A medication's bitmaps as {month: taken_days}, up to the month of 'until'."""
+    stmt = select(models.MedicationAdherence.month, models.MedicationAdherence.taken_days).where(
+        models.MedicationAdherence.medication_id == medication_id
+    )
+    if until is not None:
+        stmt = stmt.where(models.MedicationAdherence.month <= month_start(until))
+    return {month: taken_days for month, taken_days in (await db.execute(stmt)).all()}
+
+
+async def get_user_months(
+    db: AsyncSession, owner_id: int, medication_ids: Optional[Collection[int]] = None, until: Optional[date] = None
+) -> Dict[int, Dict[date, int]]:
+    """A user's bitmaps as {medication_id: {month: taken_days}} (index: owner_id, month)."""
+    stmt = select(
+        models.MedicationAdherence.medication_id, models.MedicationAdherence.month, models.MedicationAdherence.taken_days
+    ).where(models.MedicationAdherence.owner_id == owner_id)
+    if medication_ids is not None:
+        stmt = stmt.where(models.MedicationAdherence.medication_id.in_(medication_ids))
+    if until is not None:
+        stmt = stmt.where(models.MedicationAdherence.month <= month_start(until))
+    months: Dict[int, Dict[date, int]] = {}
+    for medication_id, month, taken_days in (await db.execute(stmt)).all():
+        months.setdefault(medication_id, {})[month] = taken_days
+    return months
+
+
+async def get_adherence_report(
+    db: AsyncSession, owner_id: int, today: date, taken_today_ids: Collection[int], medications: Optional[Sequence] = None
+) -> dict:
+    """
+    Streaks and 7/30/90-day trends for each of the user's medications and
+    overall (utils/adherence.adherence_report), as of the IST day 'today'.
+    'taken_today_ids' is what get_taken_ids_on returned for today. 'medications'
+    are the user's medications ordered by id, if the caller has already loaded them.
+    """
+    if medications is None:
+        medications = (await db.execute(
+            select(
+                models.Medication.id, models.Medication.name, models.Medication.frequency_type,
+                models.Medication.frequency_details, models.Medication.created_at,
+            ).where(models.Medication.owner_id == owner_id).order_by(models.Medication.id)
+        )).all()
+    schedules = {
+        medication.id: (medication.frequency_type, medication.frequency_details,
+                        ist_date(medication.created_at) if medication.created_at else None)
+        for medication in medications
+    }
+    cached = adherence_history_cache.get((owner_id, today)) or {}
+    histories = {
+        medication_id: history for medication_id, history in cached.items()
+        if medication_id in schedules and history[0] == schedules[medication_id]
+    }
+    stale = [medication_id for medication_id in schedules if medication_id not in histories]
+    if stale:
+        months = await get_user_months(
+            db, owner_id, medication_ids=stale if len(stale) < len(schedules) else None, until=today
+        )
+        window_start = today - timedelta(days=max(TREND_WINDOWS) - 1)
+        for medication_id in stale:
+            frequency_type, frequency_details, since = schedules[medication_id]
+            taken_months = months.get(medication_id, {})
+            calendar = AdherenceCalendar(taken_months, frequency_type, frequency_details, since=since)
+            # From the first month with a dose, so streaks can be longer than the windows
+            first = min([window_start, *taken_months])
+            histories[medication_id] = (schedules[medication_id], calendar.dose_bits(first, today).with_taken_last(False))
+        adherence_history_cache.set((owner_id, today), histories)
+
+    taken_today = set(taken_today_ids)
+    return adherence_report([
+        (medication.id, medication.name, histories[medication.id][1].with_taken_last(medication.id in taken_today))
+        for medication in medications
+    ])
+
+
+async def rebuild_adherence(db: AsyncSession, owner_id: Optional[int] = None) -> int:
+    """
+    Recomputes the bitmaps from medication_logs (all users, or one) and
+    replaces the stored ones. Returns the number of bitmap rows written.
+    """
+    logs = select(models.MedicationLog.medication_id, models.MedicationLog.owner_id, models.MedicationLog.taken_at).join(
+        models.Medication, models.Medication.id == models.MedicationLog.medication_id
+    )
+    clear = delete(models.MedicationAdherence)
+    if owner_id is not None:
+        logs = logs.where(models.MedicationLog.owner_id == owner_id)
+        clear = clear.where(models.MedicationAdherence.owner_id == owner_id)
+
+    bitmaps = bitmaps_from_logs((await db.execute(logs)).all())
+    await db.execute(clear)
+    db.add_all(
+        models.MedicationAdherence(medication_id=medication_id, month=month, owner_id=row_owner_id, taken_days=taken_days)
+        for (medication_id, month), (row_owner_id, taken_days) in bitmaps.items()
+    )
+    await db.commit()
+    return len(bitmaps)
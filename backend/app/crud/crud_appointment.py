@@ -1,32 +1,83 @@
 # backend/app/crud/crud_appointment.py
+# Async: these functions take an AsyncSession (see db/database.get_async_db).
 
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from typing import List
+from sqlalchemy import desc, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Tuple
+from datetime import datetime
 
+from app.crud.base import OwnerScopedRepository
 from app.db import models
+from app.db.unit_of_work import UnitOfWork
 from app.schemas import appointment as appointment_schema
+from app.utils.dashboard_cache import dashboard_cache
 
-def get_appointments_by_user(db: Session, owner_id: int) -> List[models.Appointment]:
+# get/update/delete of one appointment, scoped to its owner in SQL.
+# Every change here drops the owner's cached dashboard once it has committed.
+appointments = OwnerScopedRepository(models.Appointment, "Appointment", on_change=dashboard_cache.invalidate)
+
+
+async def get_appointments_by_user(
+    db: AsyncSession,
+    owner_id: int,
+    limit: Optional[int] = None,
+    after: Optional[Tuple[datetime, int]] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> List[models.Appointment]:
     """
-    Retrieves all appointments for a specific user, ordered by most recent first.
+    Retrieves a user's appointments, latest first (index: owner_id, appointment_datetime, id).
+    'after' is the keyset cursor (datetime and id of the previous page's last row),
+    start/end optionally limit appointment_datetime to [start, end).
     """
-    return (
-        db.query(models.Appointment)
-        .filter(models.Appointment.owner_id == owner_id)
-        .order_by(desc(models.Appointment.appointment_datetime))
-        .all()
+    stmt = select(models.Appointment).where(models.Appointment.owner_id == owner_id)
+    if start:
+        stmt = stmt.where(models.Appointment.appointment_datetime >= start)
+    if end:
+        stmt = stmt.where(models.Appointment.appointment_datetime < end)
+    if after:
+        stmt = stmt.where(
+            tuple_(models.Appointment.appointment_datetime, models.Appointment.id) < tuple_(*after)
+        )
+    result = await db.scalars(
+        stmt.order_by(desc(models.Appointment.appointment_datetime), desc(models.Appointment.id)).limit(limit)
     )
+    return list(result.all())
+
 
+async def get_upcoming_appointments(db: AsyncSession, owner_id: int, start: datetime) -> List[models.Appointment]:
+    """
+    A user's appointments at or after 'start', soonest first. Reads only that end
+    of the (owner_id, appointment_datetime, id) index, however long the history is.
+    """
+    result = await db.scalars(
+        select(models.Appointment)
+        .where(models.Appointment.owner_id == owner_id, models.Appointment.appointment_datetime >= start)
+        .order_by(models.Appointment.appointment_datetime, models.Appointment.id)
+    )
+    return list(result.all())
 
-def create_user_appointment(
-    db: Session, appointment: appointment_schema.AppointmentCreate, owner_id: int
+
+async def create_user_appointment(
+    db: AsyncSession, appointment: appointment_schema.AppointmentCreate, owner_id: int
 ) -> models.Appointment:
     """
     Creates a new appointment associated with a user.
     """
-    db_appointment = models.Appointment(**appointment.model_dump(), owner_id=owner_id)
-    db.add(db_appointment)
-    db.commit()
-    db.refresh(db_appointment)
-    return db_appointment
\ No newline at end of file
+    async with UnitOfWork(db) as uow:
+        uow.after_commit(lambda: dashboard_cache.invalidate(owner_id))
+        return await uow.insert(models.Appointment, dict(appointment.model_dump(), owner_id=owner_id))
+
+
+async def create_user_appointments(
+    db: AsyncSession, appointments: List[appointment_schema.AppointmentCreate], owner_id: int
+) -> List[models.Appointment]:
+    """
+    Creates several appointments for a user with one multi-row INSERT ... RETURNING
+    and a single commit. The rows come back in the same order as the input.
+    """
+    async with UnitOfWork(db) as uow:
+        uow.after_commit(lambda: dashboard_cache.invalidate(owner_id))
+        return await uow.insert_many(
+            models.Appointment, [dict(appointment.model_dump(), owner_id=owner_id) for appointment in appointments]
+        )
\ No newline at end of file
@@ -1,35 +1,55 @@
 # backend/app/crud/crud_contact.py
+# Async: these functions take an AsyncSession (see db/database.get_async_db).
 
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Tuple
 
+from app.crud.base import OwnerScopedRepository
 from app.db import models
+from app.db.unit_of_work import UnitOfWork
 from app.schemas import contact as contact_schema
+from app.utils.dashboard_cache import dashboard_cache
 
-def get_contacts_by_user(db: Session, owner_id: int) -> List[models.EmergencyContact]:
+# get/update/delete of one contact, scoped to its owner in SQL.
+# Every change here drops the owner's cached dashboard once it has committed.
+contacts = OwnerScopedRepository(models.EmergencyContact, "Contact", on_change=dashboard_cache.invalidate)
+
+
+async def get_contacts_by_user(
+    db: AsyncSession, owner_id: int, limit: Optional[int] = None, after: Optional[Tuple[int]] = None
+) -> List[models.EmergencyContact]:
     """
-    Retrieves all emergency contacts for a specific user.
+    Retrieves a user's emergency contacts ordered by id (index: owner_id, id).
+    'after' is the keyset cursor (the last id of the previous page).
     """
-    return db.query(models.EmergencyContact).filter(models.EmergencyContact.owner_id == owner_id).all()
+    stmt = select(models.EmergencyContact).where(models.EmergencyContact.owner_id == owner_id)
+    if after:
+        stmt = stmt.where(tuple_(models.EmergencyContact.id) > tuple_(*after))
+    result = await db.scalars(stmt.order_by(models.EmergencyContact.id).limit(limit))
+    return list(result.all())
 
 
-def create_user_contact(
-    db: Session, contact: contact_schema.ContactCreate, owner_id: int
+async def create_user_contact(
+    db: AsyncSession, contact: contact_schema.ContactCreate, owner_id: int
 ) -> models.EmergencyContact:
     """
     Creates a new emergency contact associated with a user.
     """
-    db_contact = models.EmergencyContact(**contact.model_dump(), owner_id=owner_id)
-    db.add(db_contact)
-    db.commit()
-    db.refresh(db_contact)
-    return db_contact
+    async with UnitOfWork(db) as uow:
+        uow.after_commit(lambda: dashboard_cache.invalidate(owner_id))
+        return await uow.insert(models.EmergencyContact, dict(contact.model_dump(), owner_id=owner_id))
 
 
-def delete_contact(db: Session, db_contact: models.EmergencyContact) -> models.EmergencyContact:
+async def create_user_contacts(
+    db: AsyncSession, contacts: List[contact_schema.ContactCreate], owner_id: int
+) -> List[models.EmergencyContact]:
     """
-    Deletes an emergency contact from the database.
+    Creates several contacts for a user with one multi-row INSERT ... RETURNING
+    and a single commit. The rows come back in the same order as the input.
     """
-    db.delete(db_contact)
-    db.commit()
-    return db_contact
\ No newline at end of file
+    async with UnitOfWork(db) as uow:
+        uow.after_commit(lambda: dashboard_cache.invalidate(owner_id))
+        return await uow.insert_many(
+            models.EmergencyContact, [dict(contact.model_dump(), owner_id=owner_id) for contact in contacts]
+        )
\ No newline at end of file
@@ -0,0 +1,48 @@
+# backend/app/crud/crud_export.py
+# Async generators for the history export (api/v1/endpoints/export.py).
+
+from typing import AsyncIterator, List
+
+from sqlalchemy import Row, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db import models
+
+
+async def stream_medication_logs(db: AsyncSession, owner_id: int) -> AsyncIterator[List[Row]]:
+    """
+    Yields a user's medication logs, oldest first, EXPORT_BATCH_SIZE rows at a time:
+    (taken_at, medication name, dosage). Uses a server-side cursor, so only
+    one batch is in memory no matter how much history there is.
+    Logs of deleted medications come through with name/dosage None.
+    """
+    stmt = (
+        select(models.MedicationLog.taken_at, models.Medication.name, models.Medication.dosage)
+        .outerjoin(models.Medication, models.MedicationLog.medication_id == models.Medication.id)
+        .where(models.MedicationLog.owner_id == owner_id)
+        .order_by(models.MedicationLog.taken_at, models.MedicationLog.id)
+        .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+    )
+    result = await db.stream(stmt)
+    async for rows in result.partitions():
+        yield rows
+
+
+async def stream_appointments(db: AsyncSession, owner_id: int) -> AsyncIterator[List[Row]]:
+    """
+    Yields a user's appointments, oldest first, in batches like stream_medication_logs:
+    (appointment_datetime, doctor_name, location, purpose).
+    """
+    stmt = (
+        select(
+            models.Appointment.appointment_datetime, models.Appointment.doctor_name,
+            models.Appointment.location, models.Appointment.purpose,
+        )
+        .where(models.Appointment.owner_id == owner_id)
+        .order_by(models.Appointment.appointment_datetime, models.Appointment.id)
+        .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+    )
+    result = await db.stream(stmt)
+    async for rows in result.partitions():
+        yield rows
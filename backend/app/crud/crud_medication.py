@@ -1,26 +1,64 @@
 # backend/app/crud/crud_medication.py (VERSION 3.0 - HANDLES ADVANCED FREQUENCY)
+# Async: these functions take an AsyncSession (see db/database.get_async_db).
 
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import delete, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Tuple
+from datetime import datetime, timezone
 
 from app.db import models
+from app.crud import crud_adherence
+from app.crud.base import OwnerScopedRepository
+from app.db.unit_of_work import UnitOfWork
 from app.schemas import medication as medication_schema
+from app.utils.dashboard_cache import dashboard_cache
+
+
+class MedicationRepository(OwnerScopedRepository[models.Medication]):
+    async def before_delete(self, db: AsyncSession, obj_id: int, owner_id: int) -> None:
+        # Logs are history, so they stay; they only lose the link to the deleted medication.
+        # Adherence bitmaps go with it. Deleted here rather than left to ON DELETE CASCADE,
+        # so it doesn't depend on the database enforcing foreign keys.
+        await db.execute(
+            delete(models.MedicationAdherence)
+            .where(models.MedicationAdherence.medication_id == obj_id, models.MedicationAdherence.owner_id == owner_id)
+        )
+        await db.execute(
+            update(models.MedicationLog)
+            .where(models.MedicationLog.medication_id == obj_id, models.MedicationLog.owner_id == owner_id)
+            .values(medication_id=None)
+        )
+
+
+# Medications of other users are reported as 404, not 403.
+# Every change here (logs too) drops the owner's cached dashboard once it has committed.
+medications = MedicationRepository(
+    models.Medication, "Medication", hide_other_owners=True, on_change=dashboard_cache.invalidate
+)
 
-def get_medication_by_id(db: Session, medication_id: int) -> Optional[models.Medication]:
-    """
-    Retrieves a single medication by its ID.
-    """
-    return db.query(models.Medication).filter(models.Medication.id == medication_id).first()
 
-def get_medications_by_user(db: Session, owner_id: int) -> List[models.Medication]:
+async def get_medications_by_user(
+    db: AsyncSession,
+    owner_id: int,
+    limit: Optional[int] = None,
+    after: Optional[Tuple[int]] = None,
+    frequency_type: Optional[str] = None,
+) -> List[models.Medication]:
     """
-    Retrieves all medications for a specific user.
+    Retrieves a user's medications ordered by id (index: owner_id, id).
+    'after' is the keyset cursor (the last id of the previous page).
     """
-    return db.query(models.Medication).filter(models.Medication.owner_id == owner_id).all()
+    stmt = select(models.Medication).where(models.Medication.owner_id == owner_id)
+    if frequency_type:
+        stmt = stmt.where(models.Medication.frequency_type == frequency_type)
+    if after:
+        stmt = stmt.where(tuple_(models.Medication.id) > tuple_(*after))
+    result = await db.scalars(stmt.order_by(models.Medication.id).limit(limit))
+    return list(result.all())
 
 
-def create_user_medication(
-    db: Session, medication: medication_schema.MedicationCreate, owner_id: int
+async def create_user_medication(
+    db: AsyncSession, medication: medication_schema.MedicationCreate, owner_id: int
 ) -> models.Medication:
     """
     Creates a new medication associated with a user, including advanced frequency details.
@@ -28,51 +66,39 @@ def create_user_medication(
     # --- YEH BADLAAV HAI ---
     # Ab hum .model_dump() ka istemal kar rahe hain jo naye Pydantic versions ke liye behtar hai
     # aur saare naye fields ko automatically handle karta hai.
-    db_medication = models.Medication(**medication.model_dump(), owner_id=owner_id)
-    db.add(db_medication)
-    db.commit()
-    db.refresh(db_medication)
-    return db_medication
+    async with UnitOfWork(db) as uow:
+        uow.after_commit(lambda: dashboard_cache.invalidate(owner_id))
+        return await uow.insert(models.Medication, dict(medication.model_dump(), owner_id=owner_id))
 
 
-def update_medication(
-    db: Session, db_medication: models.Medication, medication_in: medication_schema.MedicationUpdate
-) -> models.Medication:
+async def create_user_medications(
+    db: AsyncSession, medications: List[medication_schema.MedicationCreate], owner_id: int
+) -> List[models.Medication]:
     """
-    Updates a medication's details, including advanced frequency.
+    Creates several medications for a user with one multi-row INSERT ... RETURNING
+    and a single commit. The rows come back in the same order as the input.
     """
-    # --- YEH BADLAAV HAI ---
-    # Yeh function ab naye frequency_type aur frequency_details fields ko bhi update kar sakta hai.
-    update_data = medication_in.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_medication, key, value)
-    
-    db.add(db_medication)
-    db.commit()
-    db.refresh(db_medication)
-    return db_medication
-
+    async with UnitOfWork(db) as uow:
+        uow.after_commit(lambda: dashboard_cache.invalidate(owner_id))
+        return await uow.insert_many(
+            models.Medication, [dict(medication.model_dump(), owner_id=owner_id) for medication in medications]
+        )
 
-def delete_medication(db: Session, db_medication: models.Medication) -> models.Medication:
-    """
-    Deletes a medication from the database.
-    """
-    db.delete(db_medication)
-    db.commit()
-    return db_medication
 
-def create_medication_log(
-    db: Session, medication_id: int, owner_id: int
+async def create_medication_log(
+    db: AsyncSession, medication_id: int, owner_id: int, taken_at: Optional[datetime] = None
 ) -> models.MedicationLog:
     """
-    Creates a new log entry in the MedicationLog table.
+    Creates a new log entry in the MedicationLog table and sets the day's bit
+    in the adherence bitmap, in one transaction.
     """
-    db_log = models.MedicationLog(
-        medication_id=medication_id,
-        owner_id=owner_id
-    )
-    db.add(db_log)
-    db.commit()
-    db.refresh(db_log)
-    return db_log
+    async with UnitOfWork(db) as uow:
+        uow.after_commit(lambda: dashboard_cache.invalidate(owner_id))
+        db_log = await uow.insert(models.MedicationLog, {
+            "medication_id": medication_id,
+            "owner_id": owner_id,
+            "taken_at": taken_at or datetime.now(timezone.utc),
+        })
+        await crud_adherence.record_dose(db, medication_id=medication_id, owner_id=owner_id, taken_at=db_log.taken_at)
+        return db_log
 
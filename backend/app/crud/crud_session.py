@@ -0,0 +1,104 @@
+# backend/app/crud/crud_session.py
+
+import hashlib
+import secrets
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+from sqlalchemy import delete, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import models
+
+
+def _hash_token(refresh_token: str) -> str:
+    """Refresh tokens are random, so a plain SHA-256 is enough (no bcrypt needed)."""
+    return hashlib.sha256(refresh_token.encode()).hexdigest()
+
+
+def _new_expiry() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+
+
+def create_session(db: Session, user_id: int) -> str:
+    """
+    Starts a new refresh-token session for a user.
+
+    Returns:
+        The raw refresh token (only its hash is stored in the database).
+    """
+    refresh_token = secrets.token_urlsafe(32)
+    db_session = models.AuthSession(
+        user_id=user_id,
+        token_hash=_hash_token(refresh_token),
+        expires_at=_new_expiry(),
+    )
+    db.add(db_session)
+    db.commit()
+    return refresh_token
+
+
+def rotate_session(db: Session, refresh_token: str) -> Optional[Tuple[int, str]]:
+    """
+    Exchanges a refresh token for a new one on the same session.
+    The old token stops working right away.
+
+    It is one conditional UPDATE ... RETURNING, so two requests racing with the
+    same token can't both rotate it: the second one matches no row.
+
+    Returns:
+        (user_id, new_refresh_token), or None if the token is unknown or expired.
+    """
+    new_refresh_token = secrets.token_urlsafe(32)
+    rotated = db.execute(
+        update(models.AuthSession)
+        .where(
+            models.AuthSession.token_hash == _hash_token(refresh_token),
+            models.AuthSession.expires_at > datetime.now(timezone.utc),
+        )
+        .values(token_hash=_hash_token(new_refresh_token), expires_at=_new_expiry())
+        .returning(models.AuthSession.id, models.AuthSession.user_id)
+    ).first()
+    db.commit()
+    if rotated is None:
+        return None
+    return rotated.user_id, new_refresh_token
+
+
+def delete_session(db: Session, refresh_token: str) -> bool:
+    """
+    Ends the session of a refresh token (logout).
+
+    Returns:
+        True if there was such a session.
+    """
+    result = db.execute(
+        delete(models.AuthSession).where(models.AuthSession.token_hash == _hash_token(refresh_token))
+    )
+    db.commit()
+    return result.rowcount > 0
+
+
+def delete_expired_sessions(db: Session) -> int:
+    """
+    Deletes sessions whose refresh token has expired (they can't be rotated any more).
+
+    Returns:
+        How many were deleted.
+    """
+    result = db.execute(
+        delete(models.AuthSession).where(models.AuthSession.expires_at <= datetime.now(timezone.utc))
+    )
+    db.commit()
+    return result.rowcount
+
+
+def revoke_user_sessions(db: Session, user_id: int) -> None:
+    """
+    Deletes all refresh-token sessions of a user (e.g., after a password reset).
+    Does not commit, so it can share the caller's transaction.
+    """
+    db.query(models.AuthSession).filter(models.AuthSession.user_id == user_id).delete(
+        synchronize_session=False
+    )
@@ -1,9 +1,19 @@
 # backend/app/crud/crud_tip.py (Nayi File)
 
+from sqlalchemy import Float, Row, and_, func, literal_column, or_, select, tuple_
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
 from app.db import models
+from app.db.unit_of_work import SyncUnitOfWork
+from app.utils.tip_pool import RankedTip, TipPool
 from app.schemas import tip as tip_schema
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple, Union
+
+# --- Random Tip Pool ---
+# Saari tips memory mein, taaki random tip ke liye poori table sort na karni pade.
+# create_tip/delete_tip isko turant update karte hain; baaki workers ke badlaav TTL ke baad dikhte hain.
+tip_pool = TipPool(ttl=settings.TIP_POOL_TTL_SECONDS)
 
 def create_tip(db: Session, tip: tip_schema.TipCreate) -> models.HealthTip:
     """
@@ -16,21 +26,10 @@ def create_tip(db: Session, tip: tip_schema.TipCreate) -> models.HealthTip:
     Returns:
         The newly created HealthTip object from the database.
     """
-    # TipCreate schema se ek database model object banata hai
-    db_tip = models.HealthTip(
-        tip_text=tip.tip_text,
-        category=tip.category
-    )
-    
-    # Naye tip ko session mein add karta hai
-    db.add(db_tip)
-    
-    # Changes ko database mein save (commit) karta hai
-    db.commit()
-    
-    # db_tip object ko database se aayi nayi information (jaise ID) se refresh karta hai
-    db.refresh(db_tip)
-    
+    # INSERT ... RETURNING: naya ID usi query se wapas aa jaata hai, alag se refresh ki zaroorat nahi
+    with SyncUnitOfWork(db) as uow:
+        db_tip = uow.insert(models.HealthTip, {"tip_text": tip.tip_text, "category": tip.category})
+    tip_pool.add(db_tip)
     return db_tip
 
 # --- Naye Functions Yahan Jode Gaye Hain ---
@@ -47,11 +46,77 @@ def get_all_tips(db: Session) -> List[models.HealthTip]:
     """
     return db.query(models.HealthTip).all()
 
+async def get_all_tips_async(
+    db: AsyncSession,
+    limit: Optional[int] = None,
+    after: Optional[Tuple[int]] = None,
+    category: Optional[str] = None,
+) -> List[models.HealthTip]:
+    """
+    get_all_tips ka async version (read replica session ke saath use hota hai).
+    Tips id ke order mein aati hain; 'after' pichle page ki aakhri id hai (keyset cursor),
+    'category' dene par sirf us category ki tips (index: category, id).
+    """
+    stmt = select(models.HealthTip)
+    if category:
+        stmt = stmt.where(models.HealthTip.category == category)
+    if after:
+        stmt = stmt.where(tuple_(models.HealthTip.id) > tuple_(*after))
+    return list((await db.scalars(stmt.order_by(models.HealthTip.id).limit(limit))).all())
+
+# Postgres par stored tsvector column (migration 0007, GIN index wala). Model mein nahi hai
+# kyunki SQLite par yeh column hota hi nahi, isliye naam se refer karte hain.
+_SEARCH_VECTOR = literal_column("health_tips.search_vector")
+# Column 'english' config se bana hai; query bhi usi se parse honi chahiye.
+_TS_CONFIG = literal_column("'english'")
+
+async def search_tips_async(
+    db: AsyncSession,
+    q: str,
+    limit: int,
+    after: Optional[Tuple[float, int]] = None,
+    category: Optional[str] = None,
+) -> Sequence[Union[RankedTip, Row]]:
+    """
+    'q' se match karne wali tips, sabse relevant pehle (phir id ke order mein).
+    Har result mein 'rank' bhi hota hai; 'after' pichle page ka (rank, id) keyset cursor hai.
+    Postgres par full-text search (search_vector ka GIN index, migration 0007); SQLite par tip pool ka in-memory index.
+    Postgres par sirf pehli TIP_SEARCH_MAX_CANDIDATES matching tips (id ke order mein) rank hoti hain,
+    taaki "water" jaisa common word poori table rank na karwaye.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return await tip_pool.search(db, q, limit=limit, after=after, category=category)
+
+    query = func.websearch_to_tsquery(_TS_CONFIG, q)
+    candidates = select(
+        models.HealthTip.id, models.HealthTip.tip_text, models.HealthTip.category,
+        _SEARCH_VECTOR.label("search_vector"),
+    ).where(_SEARCH_VECTOR.op("@@")(query))
+    if category:
+        # coalesce() rakha hai taaki planner category index ka poora bitmap na banaye (ek category
+        # mein lakhon tips ho sakti hain); matching rows ko heap par hi filter karna sasta padta hai.
+        candidates = candidates.where(func.coalesce(models.HealthTip.category, "") == category)
+    # id ke order mein pehli N: har page (aur har query plan) par wahi candidates, warna page 2
+    # kisi doosre set se rank hota aur rows chhoot ya dohra sakti thi.
+    candidates = candidates.order_by(models.HealthTip.id).limit(settings.TIP_SEARCH_MAX_CANDIDATES).subquery()
+    ranked = select(
+        candidates.c.id, candidates.c.tip_text, candidates.c.category,
+        func.ts_rank(candidates.c.search_vector, query, type_=Float).label("rank"),
+    ).subquery()
+
+    stmt = select(ranked)
+    if after:
+        rank, tip_id = after
+        stmt = stmt.where(or_(ranked.c.rank < rank, and_(ranked.c.rank == rank, ranked.c.id > tip_id)))
+    result = await db.execute(stmt.order_by(ranked.c.rank.desc(), ranked.c.id).limit(limit))
+    return result.all()
+
 def delete_tip(db: Session, db_tip: models.HealthTip) -> models.HealthTip:
     """
     Database se ek specific tip ko delete karta hai.
     """
     db.delete(db_tip)
     db.commit()
+    tip_pool.remove(db_tip.id)
     return db_tip
 
@@ -1,11 +1,25 @@
 # backend/app/crud/crud_user.py (VERSION 2.0 - HANDLES NOTIFICATION PREFERENCE)
 
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from datetime import datetime
 from app.db import models
+from app.db.unit_of_work import SyncUnitOfWork
 from app.schemas import user as user_schema
 from app.core.security import get_password_hash
+from app.core.config import settings
+from app.utils.cache import TTLCache
+from app.crud import crud_session
+
+# --- Authenticated User Cache ---
+# Maps a user id (the token's 'uid' claim) to a UserSnapshot, so the auth
+# dependency does not have to query the users table on every request.
+# Every function below that changes a user removes that user's entry.
+# The cache is per process, so other workers can see old data until the TTL runs out.
+user_snapshot_cache = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_ENTRIES, ttl=settings.USER_CACHE_TTL_SECONDS
+)
 
 def get_user(db: Session, user_id: int) -> Optional[models.User]:
     """Retrieves a user from the database by their ID."""
@@ -17,24 +31,55 @@ def get_user_by_email(db: Session, email: str) -> Optional[models.User]:
     return db.query(models.User).filter(models.User.email == email).first()
 
 
-def create_user(db: Session, user: user_schema.UserCreate) -> models.User:
-    """Creates a new user in the database."""
-    hashed_password = get_password_hash(user.password)
+def get_user_snapshot(db: Session, user_id: int) -> Optional[user_schema.UserSnapshot]:
+    """
+    Returns a cached snapshot of the user, loading it by primary key on a miss.
+    Missing users are not cached.
+    """
+    snapshot = user_snapshot_cache.get(user_id)
+    if snapshot is None:
+        db_user = get_user(db, user_id=user_id)
+        if not db_user:
+            return None
+        snapshot = user_schema.UserSnapshot.model_validate(db_user)
+        user_snapshot_cache.set(user_id, snapshot)
+    return snapshot
+
+
+async def get_user_snapshot_async(db: AsyncSession, user_id: int) -> Optional[user_schema.UserSnapshot]:
+    """Async version of get_user_snapshot, used by the auth dependencies."""
+    snapshot = user_snapshot_cache.get(user_id)
+    if snapshot is None:
+        db_user = await db.get(models.User, user_id)
+        if not db_user:
+            return None
+        snapshot = user_schema.UserSnapshot.model_validate(db_user)
+        user_snapshot_cache.set(user_id, snapshot)
+    return snapshot
+
+
+def create_user(
+    db: Session, user: user_schema.UserCreate, hashed_password: Optional[str] = None
+) -> models.User:
+    """
+    Creates a new user in the database.
+    Async endpoints hash the password in the hashing pool and pass it in as
+    'hashed_password', so it is not hashed a second time here.
+    """
+    if hashed_password is None:
+        hashed_password = get_password_hash(user.password)
     
     # --- YEH BADLAAV HAI ---
     # Ab hum user ki saari jaankari (notifications_enabled sahit) save kar rahe hain.
-    db_user = models.User(
-        email=user.email,
-        full_name=user.full_name,
-        hashed_password=hashed_password,
-        dob=user.dob,
-        address=user.address,
-        notifications_enabled=user.notifications_enabled
-    )
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-    return db_user
+    with SyncUnitOfWork(db) as uow:
+        return uow.insert(models.User, {
+            "email": user.email,
+            "full_name": user.full_name,
+            "hashed_password": hashed_password,
+            "dob": user.dob,
+            "address": user.address,
+            "notifications_enabled": user.notifications_enabled
+        })
 
 
 def update_user(
@@ -44,21 +89,46 @@ def update_user(
     Updates a user's profile information.
     Yeh function pehle se hi naye 'notifications_enabled' field ko handle karne ke liye taiyaar hai.
     """
-    update_data = user_in.model_dump(exclude_unset=True)
-    
-    for key, value in update_data.items():
-        setattr(db_user, key, value)
-        
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    with SyncUnitOfWork(db) as uow:
+        uow.update(db_user, user_in.model_dump(exclude_unset=True))
+    user_snapshot_cache.invalidate(db_user.id)
     return db_user
 
 def set_password_reset_token(db: Session, db_user: models.User, token: str, expires_at: datetime) -> models.User:
     """Sets a password reset token and expiry on a user object."""
-    db_user.reset_password_token = token
-    db_user.reset_token_expires_at = expires_at
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    with SyncUnitOfWork(db) as uow:
+        uow.update(db_user, {"reset_password_token": token, "reset_token_expires_at": expires_at})
+    user_snapshot_cache.invalidate(db_user.id)
+    return db_user
+
+
+def get_user_by_reset_token(db: Session, token: str) -> Optional[models.User]:
+    """Retrieves a user from the database by their password reset token."""
+    return db.query(models.User).filter(models.User.reset_password_token == token).first()
+
+
+def upgrade_password_hash(db: Session, db_user: models.User, hashed_password: str) -> models.User:
+    """
+    Replaces the stored hash with one that matches the current hashing policy.
+    The password itself is unchanged, so tokens and sessions stay valid.
+    """
+    with SyncUnitOfWork(db) as uow:
+        return uow.update(db_user, {"hashed_password": hashed_password})
+
+
+def update_password(db: Session, db_user: models.User, hashed_password: str) -> models.User:
+    """
+    Stores a new password hash and invalidates any pending reset token.
+    The token version is bumped and all refresh-token sessions are deleted
+    in the same transaction, so tokens issued with the old password stop working.
+    """
+    with SyncUnitOfWork(db) as uow:
+        crud_session.revoke_user_sessions(db, user_id=db_user.id)
+        uow.update(db_user, {
+            "hashed_password": hashed_password,
+            "reset_password_token": None,
+            "reset_token_expires_at": None,
+            "token_version": (db_user.token_version or 0) + 1,
+        })
+    user_snapshot_cache.invalidate(db_user.id)
     return db_user
@@ -0,0 +1,149 @@
+# backend/app/db/async_benchmark.py
+
+"""
+Compares the async database path with the old sync one under many
+concurrent connections: sustained requests/s, latency and server memory.
+
+Usage (from the backend directory):
+    python -m app.db.async_benchmark
+    python -m app.db.async_benchmark --connections 500 --seconds 30
+    python -m app.db.async_benchmark --database-url postgresql://.../bench
+
+Both paths list a user's medications with the same query and the same auth
+dependency; only the database layer differs:
+- async: the real GET /api/v1/medications/ (AsyncSession, asyncpg/aiosqlite)
+- sync: the same query on a sync Session (get_db), run on the threadpool
+
+Each path gets a fresh server process (see app/core/benchmark_server), so
+the memory numbers don't mix. Use --database-url to test against Postgres;
+the default scratch SQLite file mostly measures SQLite. The clients run in
+this process, so on a small machine they compete with the server for CPU.
+"""
+
+import argparse
+import asyncio
+import itertools
+import threading
+import time
+from typing import List
+
+import httpx
+
+from app.core.benchmark_server import BenchmarkServer, create_users, percentile, run_workers, server_environment
+
+PATHS = {
+    "async": "/api/v1/medications/",
+    "sync": "/benchmark/sync/medications",
+}
+
+MEDICATION = {"name": "Metformin", "dosage": "500 mg", "timing_type": "Meal-Related",
+              "meal_timing": "After Breakfast", "frequency_type": "Daily"}
+
+
+def create_app():
+    """The app plus the sync version of the medications list."""
+    from fastapi import APIRouter, Depends
+    from sqlalchemy import select
+    from sqlalchemy.orm import Session
+
+    from app.api import deps, pagination
+    from app.db import models
+    from app.main import app
+    from app.schemas import medication as medication_schema
+
+    router = APIRouter()
+
+    @router.get("/sync/medications", response_model=List[medication_schema.Medication])
+    def read_medications_sync(
+        db: Session = Depends(deps.get_db),
+        current_user_id: int = Depends(deps.get_current_user_id),
+        limit: int = Depends(pagination.page_limit),
+    ):
+        stmt = (select(models.Medication).where(models.Medication.owner_id == current_user_id)
+                .order_by(models.Medication.id).limit(limit))
+        return db.scalars(stmt).all()
+
+    app.include_router(router, prefix="/benchmark")
+    return app
+
+
+class _MemorySampler:
+    """Samples the server's resident memory in a background thread."""
+
+    def __init__(self, server: BenchmarkServer, interval: float = 0.2):
+        self.server = server
+        self.interval = interval
+        self.peak_mb = 0.0
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.peak_mb = max(self.peak_mb, self.server.rss_mb() or 0.0)
+
+    def __enter__(self) -> "_MemorySampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+
+async def _measure(server: BenchmarkServer, path: str, args) -> dict:
+    limits = httpx.Limits(max_connections=args.connections, max_keepalive_connections=args.connections)
+    async with httpx.AsyncClient(base_url=server.base_url, limits=limits, timeout=120) as client:
+        users = await create_users(client, args.users, prefix=f"async-bench-{int(time.time())}-")
+        for _, headers in users:
+            for _ in range(args.medications):
+                (await client.post("/api/v1/medications/", headers=headers, json=MEDICATION)).raise_for_status()
+        headers = itertools.cycle([headers for _, headers in users])
+
+        async def request(_):
+            return await client.get(path, headers=next(headers))
+
+        started = time.perf_counter()
+        await run_workers(args.connections, request, lambda: time.perf_counter() - started > args.warmup_seconds)
+
+        idle_mb = server.rss_mb()
+        with _MemorySampler(server) as memory:
+            started = time.perf_counter()
+            latencies, statuses = await run_workers(
+                args.connections, request, lambda: time.perf_counter() - started > args.seconds
+            )
+            elapsed = time.perf_counter() - started
+
+    return {"rps": len(latencies) / elapsed, "latencies": latencies,
+            "errors": sum(count for status, count in statuses.items() if status >= 400),
+            "idle_mb": idle_mb, "peak_mb": memory.peak_mb}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the async database path against the sync one.")
+    parser.add_argument("--path", choices=["both", *PATHS], default="both")
+    parser.add_argument("--connections", type=int, default=500, help="Concurrent client connections.")
+    parser.add_argument("--seconds", type=float, default=15.0, help="Length of each measured run.")
+    parser.add_argument("--warmup-seconds", type=float, default=3.0)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--medications", type=int, default=10, help="Medications per user.")
+    parser.add_argument("--database-url", default=None,
+                        help="Database to run against (default: a scratch SQLite file per path).")
+    args = parser.parse_args()
+
+    paths = list(PATHS) if args.path == "both" else [args.path]
+    print(f"Connections: {args.connections}, {args.seconds:.0f} s per path")
+    print(f"{'path':<8}{'req/s':>9}{'p50':>11}{'p99':>11}{'errors':>8}{'RSS idle':>11}{'RSS peak':>11}")
+    for path in paths:
+        env = server_environment(args.database_url)
+        with BenchmarkServer("app.db.async_benchmark:create_app", env, factory=True) as server:
+            result = asyncio.run(_measure(server, PATHS[path], args))
+        latencies = result["latencies"] or [0.0]
+        idle = f"{result['idle_mb']:.0f} MB" if result["idle_mb"] is not None else "n/a"
+        peak = f"{result['peak_mb']:.0f} MB" if result["peak_mb"] else "n/a"
+        print(f"{path:<8}{result['rps']:>9.0f}"
+              f"{percentile(latencies, 50) * 1000:>9.1f}ms{percentile(latencies, 99) * 1000:>9.1f}ms"
+              f"{result['errors']:>8}{idle:>11}{peak:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,231 @@
 # backend/app/db/database.py
 
-from sqlalchemy import create_engine
+import asyncio
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 # Import the settings object from our config file
 from app.core.config import settings
+from app.db.pool import PoolMetrics, instrument_engine, pool_options
+from app.utils.cache import TTLCache
 
 # Create the SQLAlchemy engine
 # The engine is the starting point for any SQLAlchemy application. It's the
 # 'home base' for the actual database and its DBAPI.
-# The pool_pre_ping=True argument helps in handling stale database connections.
+# Pool size, overflow, timeout, recycle and the pre-ping mode come from
+# settings (see db/pool.py); pool events feed the metrics below.
+sync_pool_metrics = PoolMetrics("sync")
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True
+    **pool_options(make_url(settings.DATABASE_URL), sync_pool_metrics)
 )
+instrument_engine(engine, sync_pool_metrics)
+
+
+def enforce_sqlite_foreign_keys(engine) -> None:
+    """
+    SQLite ignores foreign keys (and so ON DELETE CASCADE) unless each
+    connection turns them on. Without it, deleting a medication would leave
+    its adherence rows behind for a new medication that reuses the id.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+enforce_sqlite_foreign_keys(engine)
+
+
+# --- Async Engine ---
+# Async endpoints use an AsyncSession, so a request waiting on the database
+# does not hold a threadpool thread. Same database, async driver:
+# asyncpg for Postgres, aiosqlite for local SQLite files.
+def to_async_url(database_url: str) -> URL:
+    """Converts a sync DATABASE_URL into the matching async-driver URL."""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend == "postgresql":
+        url = url.set(drivername="postgresql+asyncpg")
+        # asyncpg doesn't understand libpq's 'sslmode'; it takes 'ssl' instead.
+        if "sslmode" in url.query:
+            query = dict(url.query)
+            query["ssl"] = query.pop("sslmode")
+            url = url.set(query=query)
+    elif backend == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    return url
+
+
+async_pool_metrics = PoolMetrics("async")
+async_engine = create_async_engine(
+    to_async_url(settings.DATABASE_URL),
+    **pool_options(to_async_url(settings.DATABASE_URL), async_pool_metrics)
+)
+instrument_engine(async_engine.sync_engine, async_pool_metrics)
+enforce_sqlite_foreign_keys(async_engine.sync_engine)
+
+
+
+class PrimarySession(Session):
+    """
+    Session class behind SessionLocal and AsyncSessionLocal (sessions on the primary).
+    When a session that wrote data commits, its user is pinned to the
+    primary for a short time (see ReplicaRouter), so the user's next reads
+    see their own writes even if the replicas are lagging.
+    The auth dependencies store the user's id in session.info["user_id"].
+    """
+
+
+@event.listens_for(PrimarySession, "after_flush")
+def _note_write(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(PrimarySession, "do_orm_execute")
+def _note_write_statement(orm_execute_state):
+    # The unit of work writes with INSERT/UPDATE ... RETURNING statements,
+    # which never go through a flush.
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _pin_writer_to_primary(session):
+    if session.info.pop("wrote", False) and session.info.get("user_id") is not None:
+        replica_router.pin_to_primary(session.info["user_id"])
+
 
 # Create a SessionLocal class
 # Each instance of the SessionLocal class will be a database session.
 # The class itself is not a database session yet, but when we create an
 # instance of it (e.g., db = SessionLocal()), that instance is the session.
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False for the same reason as AsyncSessionLocal below: committed
+# rows come back from INSERT/UPDATE ... RETURNING and don't need reloading.
+# Sync writers (tips, profile updates) pin their user to the primary like the async ones.
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine, class_=PrimarySession
+)
+
+# expire_on_commit=False: objects stay readable after commit, without another
+# (async) round trip, when the endpoint returns them.
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False, sync_session_class=PrimarySession
+)
+
+
+# --- Read Replicas ---
+# With READ_REPLICA_URLS set, read-only endpoints (the GET listings and the
+# dashboard) use deps.get_read_db, which picks a healthy replica round-robin.
+# Everything else, and any user who wrote something in the last
+# READ_YOUR_WRITES_SECONDS, stays on the primary.
+
+class Replica:
+    """One read replica: its async engine, session factory and health state."""
+
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.metrics = PoolMetrics(name)
+        async_url = to_async_url(url)
+        self.engine = create_async_engine(async_url, **pool_options(async_url, self.metrics))
+        instrument_engine(self.engine.sync_engine, self.metrics)
+        enforce_sqlite_foreign_keys(self.engine.sync_engine)
+        self.session_factory = async_sessionmaker(self.engine, autoflush=False, expire_on_commit=False)
+        self.healthy = True
+        self.last_checked_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.reads = 0
+
+    def mark_unhealthy(self, error: Exception) -> None:
+        self.healthy = False
+        self.last_error = f"{type(error).__name__}: {error}"[:200]
+
+
+class ReplicaRouter:
+    """
+    Chooses where read-only sessions go.
+    - Healthy replicas are used round-robin. A replica is marked unhealthy
+      when a health check or a query on it fails, and healthy again when a
+      later health check passes.
+    - Users pinned by a recent write, and all reads when no replica is
+      healthy, go to the primary.
+    Pins are kept per worker process.
+    """
+
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(f"replica-{i}", url) for i, url in enumerate(urls)]
+        self._next = itertools.count()
+        self._pinned_users = TTLCache(maxsize=100000, ttl=settings.READ_YOUR_WRITES_SECONDS)
+        self.primary_reads = 0
+
+    def pin_to_primary(self, user_id: int) -> None:
+        if self.replicas:
+            self._pinned_users.set(user_id, True)
+
+    def pick(self, user_id: Optional[int] = None) -> Optional[Replica]:
+        """Returns the replica to read from, or None to read from the primary."""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy or (user_id is not None and self._pinned_users.get(user_id)):
+            self.primary_reads += 1
+            return None
+        replica = healthy[next(self._next) % len(healthy)]
+        replica.reads += 1
+        return replica
+
+    async def check_health(self) -> None:
+        """Runs 'SELECT 1' on every replica (run periodically by the scheduler)."""
+        async def check(replica: Replica):
+            try:
+                async with replica.engine.connect() as connection:
+                    await asyncio.wait_for(
+                        connection.execute(text("SELECT 1")),
+                        timeout=settings.READ_REPLICA_HEALTH_CHECK_TIMEOUT,
+                    )
+                replica.healthy, replica.last_error = True, None
+            except Exception as exc:
+                replica.mark_unhealthy(exc)
+            replica.last_checked_at = time.time()
+
+        await asyncio.gather(*(check(replica) for replica in self.replicas))
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    def stats(self) -> dict:
+        return {
+            "primary_reads": self.primary_reads,
+            "pinned_users": self._pinned_users.stats()["size"],
+            "replicas": [
+                {
+                    "name": replica.name,
+                    "healthy": replica.healthy,
+                    "reads": replica.reads,
+                    "last_checked_at": replica.last_checked_at,
+                    "last_error": replica.last_error,
+                    "pool": replica.metrics.stats(),
+                }
+                for replica in self.replicas
+            ],
+        }
+
+
+replica_router = ReplicaRouter(
+    [url.strip() for url in (settings.READ_REPLICA_URLS or "").split(",") if url.strip()]
+)
 
 # Create a Base class
 # We will inherit from this class to create each of the database models (ORM models).
@@ -37,4 +242,37 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    """
+    Async version of get_db for async endpoints.
+    The session only opens a connection when it's first used.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+@asynccontextmanager
+async def read_session(user_id: Optional[int] = None):
+    """
+    Async session for read-only work. It goes to a read replica when one is
+    configured and healthy, and to the primary otherwise, or when 'user_id'
+    wrote something recently (read-your-writes).
+    Never write through this session.
+    """
+    replica = replica_router.pick(user_id)
+    if replica is None:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+
+    async with replica.session_factory() as db:
+        try:
+            yield db
+        except DBAPIError as exc:
+            # A failing replica is skipped until a health check passes again.
+            if exc.connection_invalidated or isinstance(exc, (OperationalError, InterfaceError)):
+                replica.mark_unhealthy(exc)
+            raise
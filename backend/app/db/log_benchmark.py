@@ -0,0 +1,282 @@
+# backend/app/db/log_benchmark.py
+
+"""
+Shows that the dashboard and the "today" / "this week" log queries don't
+slow down as medication_logs grows. It fills the log with synthetic doses
+in steps, each step reaching further into the past, and times the queries
+after every step.
+
+It also compares the adherence report (streaks, 7/30/90-day trends) built
+from the adherence bitmaps with the same report built by scanning the
+user's medication_logs rows: latency, peak Python memory per report and,
+at the end, the on-disk size of both tables.
+
+Usage (from the backend directory):
+    python -m app.db.log_benchmark
+    python -m app.db.log_benchmark --rows 1000000 10000000 50000000 --users 10000 \\
+        --database-url postgresql://.../log_bench
+
+--rows are cumulative log sizes. Without --database-url it runs on a
+scratch SQLite file; 50M rows is meant for Postgres, where the history
+also gets its monthly partitions and the partitions each query touches
+are counted from its plan. Don't point it at a database you care about:
+it adds users, medications and logs.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+SECONDS_PER_DAY = 86400
+CHUNK_ROWS = 1_000_000
+
+_SQLITE_FILL = """
+WITH RECURSIVE n(i) AS (SELECT :first UNION ALL SELECT i + 1 FROM n WHERE i < :last)
+INSERT INTO medication_logs (medication_id, owner_id, taken_at)
+SELECT :first_medication + i % :users, :first_user + i % :users,
+       strftime('%Y-%m-%d %H:%M:%S', :anchor, '-' || ((i / :users) * :interval) || ' seconds') || '.000000'
+FROM n
+"""
+
+_POSTGRES_FILL = """
+INSERT INTO medication_logs (medication_id, owner_id, taken_at)
+SELECT :first_medication + i % :users, :first_user + i % :users,
+       CAST(:anchor AS timestamp) - (i / :users) * :interval * interval '1 second'
+FROM generate_series(CAST(:first AS bigint), CAST(:last AS bigint)) AS i
+"""
+
+
+def _history(rows: int, users: int, interval: int) -> timedelta:
+    """How far back the log reaches once it has 'rows' rows."""
+    return timedelta(seconds=(rows // users) * interval)
+
+
+def _create_owners(engine, users: int, created_at: datetime):
+    """Adds the synthetic users with one daily medication each. Returns (first user id, first medication id)."""
+    from sqlalchemy import insert
+
+    from app.db import models
+
+    stamp = int(time.time())
+    with engine.begin() as connection:
+        user_ids = connection.execute(insert(models.User).returning(models.User.id, sort_by_parameter_order=True), [
+            {"email": f"log-bench-{stamp}-{n}@example.com", "full_name": "Log Bench", "hashed_password": "-",
+             "is_active": True}
+            for n in range(users)
+        ]).scalars().all()
+        medication_ids = connection.execute(
+            insert(models.Medication).returning(models.Medication.id, sort_by_parameter_order=True), [
+                {"name": "Metformin", "dosage": "500 mg", "timing_type": "Meal-Related",
+                 "meal_timing": "After Breakfast", "frequency_type": "Daily", "owner_id": user_id,
+                 "created_at": created_at}
+                for user_id in user_ids
+            ]).scalars().all()
+    for ids in (user_ids, medication_ids):
+        # The fill statements map row i to user/medication number i % users.
+        if list(ids) != list(range(ids[0], ids[0] + users)):
+            raise SystemExit("The new users/medications didn't get consecutive ids; use an otherwise idle database.")
+    return user_ids[0], medication_ids[0]
+
+
+def _fill(engine, first: int, last: int, users: int, first_user: int, first_medication: int,
+          anchor: datetime, interval: int) -> None:
+    """Inserts log rows first..last (inclusive), in chunks."""
+    from sqlalchemy import text
+
+    from app.db.partitions import add_months, ensure_partitions, is_partitioned
+
+    postgres = engine.dialect.name == "postgresql"
+    for start in range(first, last + 1, CHUNK_ROWS):
+        end = min(last, start + CHUNK_ROWS - 1)
+        with engine.begin() as connection:
+            if postgres and is_partitioned(connection):
+                oldest = (anchor - _history(end, users, interval)).date().replace(day=1)
+                ensure_partitions(connection, oldest, add_months(anchor.date().replace(day=1), 1))
+            connection.execute(text(_POSTGRES_FILL if postgres else _SQLITE_FILL), {
+                "first": start, "last": end, "users": users, "first_user": first_user,
+                "first_medication": first_medication, "interval": interval,
+                "anchor": anchor if postgres else anchor.strftime("%Y-%m-%d %H:%M:%S"),
+            })
+    with engine.connect() as connection:
+        connection.execution_options(isolation_level="AUTOCOMMIT").exec_driver_sql("ANALYZE")
+
+
+async def _timed(repeat: int, make_call) -> float:
+    """Median time of 'repeat' calls, in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await make_call()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+async def _peak_kb(make_call) -> float:
+    """Peak Python memory allocated during one call, in KB."""
+    tracemalloc.start()
+    try:
+        await make_call()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+async def _report_from_logs(db, owner_id: int, today, medications) -> dict:
+    """The adherence report the log-scan way: every dose of the user read from medication_logs per request."""
+    from sqlalchemy import select
+
+    from app.db import models
+    from app.utils.adherence import TREND_WINDOWS, AdherenceCalendar, adherence_report, bitmaps_from_logs, ist_date
+
+    logs = await db.execute(
+        select(models.MedicationLog.medication_id, models.MedicationLog.owner_id, models.MedicationLog.taken_at)
+        .where(models.MedicationLog.owner_id == owner_id)
+    )
+    months = {}
+    for (medication_id, month), (_, taken_days) in bitmaps_from_logs(logs.all()).items():
+        months.setdefault(medication_id, {})[month] = taken_days
+    window_start = today - timedelta(days=max(TREND_WINDOWS) - 1)
+    report = []
+    for medication in medications:
+        taken_months = months.get(medication.id, {})
+        calendar = AdherenceCalendar(taken_months, medication.frequency_type, medication.frequency_details,
+                                     since=ist_date(medication.created_at))
+        report.append((medication.id, medication.name, calendar.dose_bits(min([window_start, *taken_months]), today)))
+    return adherence_report(report)
+
+
+def _table_mb(engine, table: str) -> float:
+    """On-disk size of a table with its indexes (and partitions), in MB."""
+    with engine.connect() as connection:
+        if engine.dialect.name == "postgresql":
+            size = connection.exec_driver_sql(
+                "SELECT coalesce(sum(pg_total_relation_size(relid)), pg_total_relation_size(%(table)s)) "
+                "FROM pg_partition_tree(%(table)s)", {"table": table}
+            ).scalar()
+        else:
+            size = connection.exec_driver_sql(
+                "SELECT sum(pgsize) FROM dbstat WHERE name IN "
+                "(SELECT name FROM sqlite_master WHERE tbl_name = ?)", (table,)
+            ).scalar()
+    return (size or 0) / 1024 / 1024
+
+
+def _partitions_touched(engine, stmt) -> str:
+    """Number of medication_logs partitions in the statement's plan (Postgres), '-' elsewhere."""
+    from app.db.partitions import is_log_partition
+
+    if engine.dialect.name != "postgresql":
+        return "-"
+    compiled = stmt.compile(engine)
+    with engine.connect() as connection:
+        plan = connection.exec_driver_sql("EXPLAIN " + str(compiled), compiled.params).scalars().all()
+    names = {word for line in plan for word in line.split() if is_log_partition(word)}
+    return str(len(names))
+
+
+async def _run(args) -> None:
+    from sqlalchemy import select
+
+    from app.api.v1.endpoints.dashboard import _load_dashboard_data
+    from app.crud import crud_adherence
+    from app.crud.crud_adherence import adherence_history_cache
+    from app.db import models
+    from app.db.database import AsyncSessionLocal, async_engine, engine
+    from app.utils.adherence import IST, ist_day_bounds
+
+    interval = SECONDS_PER_DAY // args.doses_per_day
+    anchor = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+    oldest = anchor - _history(max(args.rows), args.users, interval) - timedelta(days=1)
+    first_user, first_medication = _create_owners(engine, args.users, created_at=oldest)
+    owner_id = first_user  # the timed user; every user has the same history
+    today = datetime.now(IST).date()
+    today_start, today_end = ist_day_bounds(today)
+    week_start = ist_day_bounds(today - timedelta(days=6))[0]
+
+    def logs_between(start, end):
+        return (select(models.MedicationLog)
+                .where(models.MedicationLog.owner_id == owner_id,
+                       models.MedicationLog.taken_at >= start, models.MedicationLog.taken_at < end)
+                .order_by(models.MedicationLog.taken_at))
+
+    print(f"Database: {engine.dialect.name}, users: {args.users}, doses per user per day: {args.doses_per_day}")
+    print(f"{'log rows':>12}{'history':>10}{'fill':>9}{'dashboard':>12}{'logs today':>12}{'logs week':>12}"
+          f"{'partitions (week)':>19}{'report: bitmaps':>17}{'log scan':>12}{'peak mem: bitmaps':>19}{'log scan':>12}")
+    filled = 0
+    try:
+        for rows in sorted(args.rows):
+            started = time.perf_counter()
+            _fill(engine, filled, rows - 1, args.users, first_user, first_medication, anchor, interval)
+            fill_seconds = time.perf_counter() - started
+            filled = rows
+            async with AsyncSessionLocal() as db:
+                # The dashboard reads the adherence bitmaps, which normally grow with each dose.
+                await crud_adherence.rebuild_adherence(db, owner_id=owner_id)
+                dashboard_ms = await _timed(args.repeat, lambda: _load_dashboard_data(db, owner_id, today))
+                today_ms = await _timed(args.repeat, lambda: db.scalars(logs_between(today_start, today_end)))
+                week_ms = await _timed(args.repeat, lambda: db.scalars(logs_between(week_start, today_end)))
+
+                # The adherence report on its own, uncached (the first dashboard of the day builds it)
+                medications = (await db.scalars(
+                    select(models.Medication).where(models.Medication.owner_id == owner_id).order_by(models.Medication.id)
+                )).all()
+                taken_today = await crud_adherence.get_taken_ids_on(db, owner_id=owner_id, day=today)
+
+                async def from_bitmaps():
+                    adherence_history_cache.clear()
+                    return await crud_adherence.get_adherence_report(
+                        db, owner_id=owner_id, today=today, taken_today_ids=taken_today, medications=medications
+                    )
+
+                async def from_logs():
+                    return await _report_from_logs(db, owner_id, today, medications)
+
+                bitmaps_report, logs_report = await from_bitmaps(), await from_logs()
+                if bitmaps_report["medications"][0]["trend"] != logs_report["medications"][0]["trend"]:
+                    raise SystemExit("The bitmap and log-scan reports differ.")
+                bitmaps_ms, logs_ms = await _timed(args.repeat, from_bitmaps), await _timed(args.repeat, from_logs)
+                bitmaps_kb, logs_kb = await _peak_kb(from_bitmaps), await _peak_kb(from_logs)
+            years = _history(rows, args.users, interval).days / 365.25
+            print(f"{rows:>12,}{years:>8.1f} y{fill_seconds:>8.0f}s{dashboard_ms:>10.2f}ms{today_ms:>10.2f}ms"
+                  f"{week_ms:>10.2f}ms{_partitions_touched(engine, logs_between(week_start, today_end)):>19}"
+                  f"{bitmaps_ms:>15.2f}ms{logs_ms:>10.2f}ms{bitmaps_kb:>16.0f} KB{logs_kb:>9.0f} KB")
+
+        # Storage: bitmaps for every synthetic user, next to the log they summarize
+        async with AsyncSessionLocal() as db:
+            for user_id in range(first_user, first_user + args.users):
+                await crud_adherence.rebuild_adherence(db, owner_id=user_id)
+        print(f"On disk: medication_logs {_table_mb(engine, 'medication_logs'):.1f} MB, "
+              f"medication_adherence {_table_mb(engine, 'medication_adherence'):.2f} MB")
+    finally:
+        await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark dashboard and log queries as the medication log grows.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000, 3_000_000],
+                        help="Cumulative medication_logs sizes to measure at.")
+    parser.add_argument("--users", type=int, default=500, help="Synthetic users sharing the log rows.")
+    parser.add_argument("--doses-per-day", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per query (the median is shown).")
+    parser.add_argument("--database-url", default=None,
+                        help="Database to fill (default: a scratch SQLite file).")
+    args = parser.parse_args()
+
+    # Settings are read when 'app' is first imported, so the database is chosen before that.
+    os.environ["DATABASE_URL"] = args.database_url or (
+        f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='health-companion-bench-'), 'app.db')}"
+    )
+    os.environ["READ_REPLICA_URLS"] = ""
+    from app.db import migrate
+
+    migrate.main()
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# backend/app/db/migrate.py
+
+"""
+Creates or upgrades the database schema. Run it once per deploy, before
+starting the API workers:
+
+    python -m app.db.migrate
+
+It runs `alembic upgrade head` using the settings' DATABASE_URL, then
+makes sure the upcoming medication_logs partitions exist (Postgres).
+Databases created before migrations existed are upgraded in place.
+"""
+
+import os
+
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+
+from app.db.database import engine
+from app.db.partitions import maintain_log_partitions
+from app.db.schema import EXPECTED_SCHEMA_REVISION, get_schema_revision
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def get_alembic_config() -> Config:
+    """Loads backend/alembic.ini with absolute paths, so this works from any directory."""
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    return config
+
+
+def main() -> None:
+    config = get_alembic_config()
+    head = ScriptDirectory.from_config(config).get_current_head()
+    if head != EXPECTED_SCHEMA_REVISION:
+        raise SystemExit(
+            f"Newest migration is {head!r} but app/db/schema.py expects "
+            f"{EXPECTED_SCHEMA_REVISION!r}. Update EXPECTED_SCHEMA_REVISION."
+        )
+
+    before = get_schema_revision(engine)
+    command.upgrade(config, "head")
+    print(f"--- Database schema: {before or 'empty'} -> {get_schema_revision(engine)} ---")
+    maintain_log_partitions()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,30 @@
 # backend/app/db/models.py (VERSION 3.0 - ADVANCED REMINDERS)
 
 from sqlalchemy import (
-    Boolean, Column, Integer, String, DateTime, Date, ForeignKey, Text, Time, JSON
+    Boolean, Column, Integer, String, DateTime, Date, ForeignKey, Text, Time, JSON, Index
 )
 from sqlalchemy.orm import relationship
+from sqlalchemy.types import TypeDecorator
 import datetime
 
 from .database import Base
 
+
+class UTCDateTime(TypeDecorator):
+    """
+    A DateTime column stored as naive UTC (TIMESTAMP WITHOUT TIME ZONE).
+    Timezone-aware values are converted to UTC before they are sent, because
+    asyncpg refuses aware datetimes for these columns (psycopg2 accepted them).
+    """
+    impl = DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        return value
+
+
 class User(Base):
     __tablename__ = "users"
     id = Column(Integer, primary_key=True, index=True)
@@ -18,20 +35,48 @@ class User(Base):
     dob = Column(Date)
     address = Column(String)
     reset_password_token = Column(String, unique=True, nullable=True)
-    reset_token_expires_at = Column(DateTime, nullable=True)
+    reset_token_expires_at = Column(UTCDateTime, nullable=True)
     
     # --- YEH NAYA COLUMN HAI ---
     # User ko email reminders chahiye ya nahi, isko control karne ke liye
     notifications_enabled = Column(Boolean, default=True)
+
+    # Access tokens carry this number; bumping it (e.g., on password reset)
+    # revokes every token issued before.
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
     
     medications = relationship("Medication", back_populates="owner")
     appointments = relationship("Appointment", back_populates="owner")
     contacts = relationship("EmergencyContact", back_populates="owner")
     medication_logs = relationship("MedicationLog", back_populates="owner")
+    sessions = relationship("AuthSession", back_populates="user")
 
 
+class AuthSession(Base):
+    """
+    A refresh-token session. Only a SHA-256 hash of the refresh token is stored.
+    The unique index on token_hash makes a refresh a single indexed lookup.
+    """
+    __tablename__ = "auth_sessions"
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=False)
+    token_hash = Column(String(64), unique=True, index=True, nullable=False)
+    expires_at = Column(UTCDateTime, nullable=False)
+    created_at = Column(UTCDateTime, default=lambda: datetime.datetime.now(datetime.timezone.utc))
+    user = relationship("User", back_populates="sessions")
+
+
+# Every list endpoint, the dashboard and the scheduler filter by owner_id
+# (and often a time range), so those columns are indexed below. List
+# endpoints page with keyset cursors, so each index also ends with the
+# list's sort columns (e.g., owner_id, id).
+# Schema changes go through Alembic migrations (backend/alembic/versions).
+
 class Medication(Base):
     __tablename__ = "medications"
+    __table_args__ = (
+        Index("ix_medications_owner_id_id", "owner_id", "id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     dosage = Column(String, nullable=False)
@@ -47,7 +92,9 @@ class Medication(Base):
     # Is naye column mein frequency ki details save hongi (e.g., ["Monday"], 15)
     frequency_details = Column(JSON, nullable=True) 
 
-    last_taken_at = Column(DateTime, nullable=True)
+    last_taken_at = Column(UTCDateTime, nullable=True)
+    # Adherence counts scheduled days from here on (NULL for old rows never taken: unknown)
+    created_at = Column(UTCDateTime, nullable=True, default=lambda: datetime.datetime.now(datetime.timezone.utc))
     owner_id = Column(Integer, ForeignKey("users.id"))
     owner = relationship("User", back_populates="medications")
     logs = relationship("MedicationLog", back_populates="medication")
@@ -55,20 +102,49 @@ class Medication(Base):
 
 class MedicationLog(Base):
     __tablename__ = "medication_logs"
+    __table_args__ = (
+        Index("ix_medication_logs_owner_id_taken_at", "owner_id", "taken_at"),
+        Index("ix_medication_logs_owner_id_medication_id_taken_at", "owner_id", "medication_id", "taken_at"),
+        # Deleting a medication updates its logs by medication_id.
+        Index("ix_medication_logs_medication_id", "medication_id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     medication_id = Column(Integer, ForeignKey("medications.id"))
     owner_id = Column(Integer, ForeignKey("users.id"))
-    taken_at = Column(DateTime, default=lambda: datetime.datetime.now(datetime.timezone.utc))
+    # On Postgres the table is partitioned by month on taken_at (db/partitions.py),
+    # so queries should filter on a taken_at range whenever they can.
+    taken_at = Column(UTCDateTime, nullable=False, default=lambda: datetime.datetime.now(datetime.timezone.utc))
     medication = relationship("Medication", back_populates="logs")
     owner = relationship("User", back_populates="medication_logs")
 
+
+class MedicationAdherence(Base):
+    """
+    Adherence bitmap: bit (day - 1) of taken_days is set if the medication was
+    taken on that IST day of 'month' (see utils/adherence.py). Kept in step
+    with medication_logs and rebuildable from it. A medication's rows are
+    deleted with it (ON DELETE CASCADE; on SQLite the app's engines turn
+    foreign keys on for that, see db/database.py).
+    """
+    __tablename__ = "medication_adherence"
+    __table_args__ = (
+        Index("ix_medication_adherence_owner_id_month", "owner_id", "month"),
+    )
+    medication_id = Column(Integer, ForeignKey("medications.id", ondelete="CASCADE"), primary_key=True)
+    month = Column(Date, primary_key=True)  # first day of the month
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    taken_days = Column(Integer, nullable=False, default=0, server_default="0")
+
 # --- Baaki ke models (Appointment, EmergencyContact, HealthTip) pehle jaise hi रहेंगे ---
 
 class Appointment(Base):
     __tablename__ = "appointments"
+    __table_args__ = (
+        Index("ix_appointments_owner_id_appointment_datetime_id", "owner_id", "appointment_datetime", "id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     doctor_name = Column(String, nullable=False)
-    appointment_datetime = Column(DateTime, nullable=False)
+    appointment_datetime = Column(UTCDateTime, nullable=False)
     location = Column(String)
     purpose = Column(String)
     owner_id = Column(Integer, ForeignKey("users.id"))
@@ -76,6 +152,9 @@ class Appointment(Base):
 
 class EmergencyContact(Base):
     __tablename__ = "emergency_contacts"
+    __table_args__ = (
+        Index("ix_emergency_contacts_owner_id_id", "owner_id", "id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     contact_name = Column(String, nullable=False)
     phone_number = Column(String, nullable=False)
@@ -85,6 +164,10 @@ class EmergencyContact(Base):
 
 class HealthTip(Base):
     __tablename__ = "health_tips"
+    __table_args__ = (
+        # Tips list filtered by category, paged by id
+        Index("ix_health_tips_category_id", "category", "id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     tip_text = Column(Text, nullable=False)
     category = Column(String, default="General")
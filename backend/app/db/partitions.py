@@ -0,0 +1,145 @@
+# backend/app/db/partitions.py
+
+"""
+Monthly partitions of medication_logs (Postgres only, see migration 0004).
+
+maintain_log_partitions() runs daily from the scheduler and once after
+`python -m app.db.migrate`. It:
+- creates the partitions for the current month and the next
+  MEDICATION_LOG_PARTITIONS_AHEAD months, so new logs never land in the
+  DEFAULT partition;
+- applies the retention policy. Months older than
+  MEDICATION_LOG_RETENTION_MONTHS are detached from medication_logs and then
+  "detach": kept as standalone tables, "archive": moved to the
+  'archive' schema, or "drop": deleted.
+On other databases (e.g., SQLite) it does nothing.
+"""
+
+import re
+from datetime import date, datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.core.config import settings
+from app.db.database import engine
+
+LOG_TABLE = "medication_logs"
+ARCHIVE_SCHEMA = "archive"
+RETENTION_ACTIONS = ("detach", "archive", "drop")
+_PARTITION_NAME = re.compile(rf"^{LOG_TABLE}_y(\d{{4}})m(\d{{2}})$")
+
+
+def add_months(month: date, months: int) -> date:
+    """Returns the first day of the month 'months' after 'month'."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{LOG_TABLE}_y{month.year}m{month.month:02d}"
+
+
+def is_log_partition(table_name: Optional[str]) -> bool:
+    """True for the tables backing medication_logs' partitions (not in the models)."""
+    return bool(table_name) and (
+        table_name == f"{LOG_TABLE}_default" or bool(_PARTITION_NAME.match(table_name))
+    )
+
+
+def is_partitioned(connection: Connection) -> bool:
+    if connection.dialect.name != "postgresql":
+        return False
+    return bool(connection.execute(text(
+        "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+        "WHERE c.relname = :table AND pg_table_is_visible(c.oid)"
+    ), {"table": LOG_TABLE}).scalar())
+
+
+def attached_months(connection: Connection) -> List[date]:
+    """Months that currently have a partition attached (the DEFAULT one is left out)."""
+    names = connection.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :table AND pg_table_is_visible(p.oid)"
+    ), {"table": LOG_TABLE}).scalars()
+    months = []
+    for name in names:
+        match = _PARTITION_NAME.match(name)
+        if match:
+            months.append(date(int(match.group(1)), int(match.group(2)), 1))
+    return sorted(months)
+
+
+def ensure_partitions(connection: Connection, first_month: date, last_month: date) -> List[str]:
+    """
+    Creates any missing monthly partitions from first_month to last_month (inclusive).
+    Rows of that month already sitting in the DEFAULT partition are moved into
+    the new partition (Postgres refuses to create it otherwise).
+    """
+    existing = set(attached_months(connection))
+    created = []
+    month = first_month
+    while month <= last_month:
+        if month not in existing:
+            bounds = {"start": month, "end": add_months(month, 1)}
+            stray_rows = connection.execute(text(
+                f"DELETE FROM {LOG_TABLE}_default WHERE taken_at >= :start AND taken_at < :end "
+                f"RETURNING id, medication_id, owner_id, taken_at"
+            ), bounds).mappings().all()
+            connection.execute(text(
+                f"CREATE TABLE {partition_name(month)} PARTITION OF {LOG_TABLE} "
+                f"FOR VALUES FROM ('{bounds['start'].isoformat()}') TO ('{bounds['end'].isoformat()}')"
+            ))
+            if stray_rows:
+                connection.execute(text(
+                    f"INSERT INTO {LOG_TABLE} (id, medication_id, owner_id, taken_at) "
+                    f"VALUES (:id, :medication_id, :owner_id, :taken_at)"
+                ), [dict(row) for row in stray_rows])
+            created.append(partition_name(month))
+        month = add_months(month, 1)
+    return created
+
+
+def apply_retention(connection: Connection, this_month: date, retention_months: int, action: str) -> List[str]:
+    """
+    Detaches the partitions of months that are older than the retention window,
+    then keeps, archives or drops them according to 'action'.
+    """
+    if action not in RETENTION_ACTIONS:
+        raise ValueError(f"MEDICATION_LOG_RETENTION_ACTION must be one of {RETENTION_ACTIONS}")
+    cutoff = add_months(this_month, -retention_months)
+    removed = []
+    for month in attached_months(connection):
+        if month >= cutoff:
+            continue
+        name = partition_name(month)
+        connection.execute(text(f"ALTER TABLE {LOG_TABLE} DETACH PARTITION {name}"))
+        if action == "archive":
+            connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+            connection.execute(text(f"ALTER TABLE {name} SET SCHEMA {ARCHIVE_SCHEMA}"))
+        elif action == "drop":
+            connection.execute(text(f"DROP TABLE {name}"))
+        removed.append(name)
+    return removed
+
+
+def maintain_log_partitions(today: Optional[date] = None) -> dict:
+    """Creates upcoming partitions and applies the retention policy (a no-op off Postgres)."""
+    this_month = (today or datetime.now(timezone.utc).date()).replace(day=1)
+    with engine.begin() as connection:
+        if not is_partitioned(connection):
+            return {"partitioned": False}
+        created = ensure_partitions(
+            connection, this_month, add_months(this_month, settings.MEDICATION_LOG_PARTITIONS_AHEAD)
+        )
+        removed = []
+        if settings.MEDICATION_LOG_RETENTION_MONTHS is not None:
+            removed = apply_retention(
+                connection, this_month,
+                settings.MEDICATION_LOG_RETENTION_MONTHS, settings.MEDICATION_LOG_RETENTION_ACTION,
+            )
+    if created or removed:
+        print(f"--- medication_logs partitions: created {created}, retired {removed} ---")
+    return {"partitioned": True, "created": created, "retired": removed}
@@ -0,0 +1,174 @@
+# backend/app/db/pool.py
+
+"""
+Connection pool setup and instrumentation for the database engines.
+
+- pool_options() builds the create_engine() pool arguments from Settings.
+- PoolMetrics collects checkout wait time, in-use/overflow counts and
+  invalidations for one engine; the numbers are on /internal/metrics.
+- With DB_POOL_PRE_PING_MODE="idle", a connection is only pinged when it
+  has been idle for DB_POOL_PRE_PING_IDLE_SECONDS, instead of on every checkout.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import URL
+from sqlalchemy.exc import DisconnectionError, TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import settings
+
+PRE_PING_MODES = ("always", "idle", "off")
+
+
+class PoolMetrics:
+    """Thread-safe counters for one engine's connection pool."""
+
+    def __init__(self, name: str, wait_samples: int = 1000):
+        self.name = name
+        self.pool = None  # set by instrument_engine()
+        self.checkouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.idle_pings = 0
+        self.failed_pings = 0
+        self.max_wait_ms = 0.0
+        # The most recent checkout wait times, for percentiles.
+        self._waits_ms = deque(maxlen=wait_samples)
+        self._lock = threading.Lock()
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        wait_ms = seconds * 1000
+        with self._lock:
+            self._waits_ms.append(wait_ms)
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+            if timed_out:
+                self.timeouts += 1
+
+    def increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def stats(self) -> dict:
+        with self._lock:
+            waits = sorted(self._waits_ms)
+            counters = {
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "idle_pings": self.idle_pings,
+                "failed_pings": self.failed_pings,
+            }
+        result = {"pool_class": type(self.pool).__name__ if self.pool else None}
+        if isinstance(self.pool, QueuePool):
+            result.update({
+                "pool_size": self.pool.size(),
+                "max_overflow": self.pool._max_overflow,
+                # Most connections this worker can open with this engine.
+                "capacity": self.pool.size() + max(self.pool._max_overflow, 0),
+                "in_use": self.pool.checkedout(),
+                "idle": self.pool.checkedin(),
+                # Negative while the pool hasn't opened pool_size connections yet.
+                "overflow": self.pool.overflow(),
+            })
+        result.update(counters)
+        result["checkout_wait_ms"] = {
+            "p50": _percentile(waits, 50),
+            "p95": _percentile(waits, 95),
+            "max": round(self.max_wait_ms, 3),
+            "samples": len(waits),
+        }
+        return result
+
+
+def _percentile(ordered, pct: float) -> Optional[float]:
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return round(ordered[index], 3)
+
+
+def _instrumented_pool_class(base: type, metrics: PoolMetrics) -> type:
+    """
+    Returns a subclass of a QueuePool class that times each checkout.
+    It's a new class per engine (bound to that engine's metrics) because
+    pools are re-created from their class and constructor arguments only.
+    """
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            record = base._do_get(self)
+        except PoolTimeoutError:
+            metrics.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        metrics.record_wait(time.perf_counter() - started)
+        return record
+
+    return type(f"Instrumented{base.__name__}", (base,), {"_do_get": _do_get})
+
+
+def pool_options(url: URL, metrics: PoolMetrics) -> dict:
+    """
+    Builds the pool arguments for create_engine()/create_async_engine().
+    Sizing options only apply to queue pools (Postgres, SQLite files with the
+    sync driver); other pools (e.g., aiosqlite's NullPool) keep their defaults.
+    """
+    if settings.DB_POOL_PRE_PING_MODE not in PRE_PING_MODES:
+        raise ValueError(f"DB_POOL_PRE_PING_MODE must be one of {PRE_PING_MODES}")
+
+    options = {"pool_pre_ping": settings.DB_POOL_PRE_PING_MODE == "always"}
+    pool_class = url.get_dialect().get_pool_class(url)
+    if issubclass(pool_class, QueuePool):
+        options.update(
+            poolclass=_instrumented_pool_class(pool_class, metrics),
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    return options
+
+
+def instrument_engine(engine, metrics: PoolMetrics) -> None:
+    """Attaches pool event listeners (counters and the idle pre-ping) to a sync engine."""
+    metrics.pool = engine.pool
+    idle_ping = settings.DB_POOL_PRE_PING_MODE == "idle"
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.increment("connects")
+        connection_record.info["last_used_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.increment("checkouts")
+        metrics.pool = engine.pool  # the pool is replaced when the engine is disposed
+        if not idle_ping:
+            return
+        last_used_at = connection_record.info.get("last_used_at", 0)
+        if time.monotonic() - last_used_at < settings.DB_POOL_PRE_PING_IDLE_SECONDS:
+            return
+        # Idle for a while: the server or a proxy may have closed it.
+        metrics.increment("idle_pings")
+        try:
+            cursor = dbapi_connection.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+        except Exception as exc:
+            metrics.increment("failed_pings")
+            # Makes the pool throw this connection away and try a fresh one.
+            raise DisconnectionError() from exc
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        connection_record.info["last_used_at"] = time.monotonic()
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.increment("invalidations")
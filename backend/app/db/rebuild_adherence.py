@@ -0,0 +1,35 @@
+# backend/app/db/rebuild_adherence.py
+
+"""
+Rebuilds the medication_adherence bitmaps from medication_logs, e.g. after
+logs were fixed by hand or restored from an archive:
+
+    python -m app.db.rebuild_adherence
+    python -m app.db.rebuild_adherence --owner-id 42
+"""
+
+import argparse
+import asyncio
+
+from app.crud import crud_adherence
+from app.db.database import AsyncSessionLocal, async_engine
+
+
+async def _rebuild(owner_id) -> int:
+    try:
+        async with AsyncSessionLocal() as db:
+            return await crud_adherence.rebuild_adherence(db, owner_id=owner_id)
+    finally:
+        await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild adherence bitmaps from the medication log.")
+    parser.add_argument("--owner-id", type=int, default=None, help="Only rebuild this user's bitmaps.")
+    args = parser.parse_args()
+    rows = asyncio.run(_rebuild(args.owner_id))
+    print(f"--- Rebuilt {rows} adherence bitmap(s) ---")
+
+
+if __name__ == "__main__":
+    main()
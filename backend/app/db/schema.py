@@ -0,0 +1,38 @@
+# backend/app/db/schema.py
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+# The Alembic revision this code expects the database to be at.
+# Bump it together with every new migration in backend/alembic/versions.
+# (`python -m app.db.migrate` refuses to run if it doesn't match the newest migration.)
+EXPECTED_SCHEMA_REVISION = "0008"
+
+
+class SchemaVersionError(RuntimeError):
+    """The database schema is missing or at a different revision than the code expects."""
+
+
+def get_schema_revision(engine: Engine):
+    """Returns the database's current Alembic revision, or None if it was never migrated."""
+    with engine.connect() as connection:
+        try:
+            return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+        except (OperationalError, ProgrammingError):
+            # No alembic_version table yet.
+            return None
+
+
+def verify_schema_version(engine: Engine) -> str:
+    """
+    Checks (with a single query) that the database is at EXPECTED_SCHEMA_REVISION.
+    Runs at app startup instead of creating tables, so workers start fast.
+    """
+    revision = get_schema_revision(engine)
+    if revision != EXPECTED_SCHEMA_REVISION:
+        raise SchemaVersionError(
+            f"Database schema is at revision {revision!r}, but this code expects "
+            f"{EXPECTED_SCHEMA_REVISION!r}. Run `python -m app.db.migrate` first."
+        )
+    return revision
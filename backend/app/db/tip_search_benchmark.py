@@ -0,0 +1,236 @@
+# backend/app/db/tip_search_benchmark.py
+
+"""
+Measures tip search (GET /tips/search) over a large synthetic health_tips
+table: the tip pool's in-memory index (what SQLite uses) and, on Postgres,
+the search_vector GIN index too. Then the random tip (the pool against the
+old ORDER BY random() LIMIT 1) and the dashboard that shows one.
+
+Usage (from the backend directory):
+    python -m app.db.tip_search_benchmark
+    python -m app.db.tip_search_benchmark --tips 500000 --database-url postgresql://.../tip_bench
+    python -m app.db.tip_search_benchmark --query "drink water" --query "sleep"
+    python -m app.db.tip_search_benchmark --tips 100000 --skip-search   # random tip and dashboard only
+
+Without --database-url it runs on a scratch SQLite file. Don't point it at
+a database you care about: it adds the tips.
+
+Tip texts are two health words plus filler words drawn with a Zipf-like
+skew, so some queries match a few percent of the table and some match
+only a handful of tips.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import List, Optional
+
+HEALTH_WORDS = (
+    "water sleep walk stretch fruit vegetable protein fiber sugar salt blood pressure heart "
+    "breathing posture balance memory hearing vision teeth skin bones joints calcium vitamin "
+    "sunlight hydration nap yoga meditation friends family garden reading puzzles music tea "
+    "medicine doctor checkup vaccine hygiene handwashing stairs falls shoes lighting rest "
+    "breakfast lunch dinner snack nuts seeds grains beans fish eggs milk curd spices"
+).split()
+CATEGORIES = ("General", "Nutrition", "Exercise", "Mental Health", "Sleep", "Safety")
+FILLER_WORDS = 20000
+WORDS_PER_TIP = 12
+
+
+def _filler(rank: int) -> str:
+    return f"lorem{rank}"
+
+
+def _tip_texts(count: int, rng: random.Random) -> List[str]:
+    weights = [1 / (rank + 1) for rank in range(FILLER_WORDS)]
+    per_tip = WORDS_PER_TIP - 2
+    fillers = rng.choices(range(FILLER_WORDS), weights=weights, k=count * per_tip)
+    texts = []
+    for n in range(count):
+        words = rng.sample(HEALTH_WORDS, 2) + [_filler(rank) for rank in fillers[n * per_tip:(n + 1) * per_tip]]
+        rng.shuffle(words)
+        texts.append(" ".join(words).capitalize() + ".")
+    return texts
+
+
+def _insert_dashboard_user(engine) -> int:
+    """A user with a few medications, appointments and contacts; returns the id."""
+    from datetime import datetime, timedelta
+
+    from sqlalchemy import insert
+
+    from app.db import models
+
+    with engine.begin() as connection:
+        user_id = connection.execute(insert(models.User).values(
+            email=f"tip-bench-{time.time_ns()}@example.com", full_name="Bench User", hashed_password="-",
+        ).returning(models.User.id)).scalar_one()
+        connection.execute(insert(models.Medication), [
+            {"name": f"Medicine {n}", "dosage": "1", "timing_type": "Meal-Related", "meal_timing": "After Breakfast",
+             "frequency_type": "Daily", "owner_id": user_id} for n in range(3)
+        ])
+        connection.execute(insert(models.Appointment), [
+            {"doctor_name": f"Dr. {n}", "appointment_datetime": datetime.utcnow() + timedelta(days=n),
+             "owner_id": user_id} for n in range(2)
+        ])
+        connection.execute(insert(models.EmergencyContact), [
+            {"contact_name": f"Contact {n}", "phone_number": "9800000000", "owner_id": user_id} for n in range(2)
+        ])
+    return user_id
+
+
+def _insert_tips(engine, count: int, seed: int) -> None:
+    from sqlalchemy import insert
+
+    from app.db import models
+
+    rng = random.Random(seed)
+    batch = 10000
+    for start in range(0, count, batch):
+        texts = _tip_texts(min(batch, count - start), rng)
+        with engine.begin() as connection:
+            connection.execute(insert(models.HealthTip), [
+                {"tip_text": text, "category": rng.choice(CATEGORIES)} for text in texts
+            ])
+    with engine.connect() as connection:
+        connection.execution_options(isolation_level="AUTOCOMMIT").exec_driver_sql("ANALYZE")
+
+
+async def _timed(repeat: int, make_call):
+    """(median ms, p95 ms, last result) of 'repeat' calls."""
+    timings, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = await make_call()
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, round(0.95 * len(timings)) - 1)]
+    return statistics.median(timings) * 1000, p95 * 1000, result
+
+
+async def _random_tips_and_dashboard(args, db, pool, user_id: int) -> None:
+    """The random tip from the pool and from ORDER BY random(), and the dashboard around it."""
+    from sqlalchemy import func, select
+
+    from app.api.v1.endpoints import dashboard
+    from app.crud import crud_tip
+    from app.db import models
+    from app.schemas.user import UserSnapshot
+    from app.utils.dashboard_cache import dashboard_cache
+
+    user = UserSnapshot(id=user_id, email="tip-bench@example.com", full_name="Bench User", is_active=True)
+    crud_tip.tip_pool = pool  # the dashboard takes its tip from crud_tip.tip_pool
+
+    def order_by_random(category):
+        stmt = select(models.HealthTip).order_by(func.random()).limit(1)
+        return db.scalar(stmt if category is None else stmt.where(models.HealthTip.category == category))
+
+    async def uncached_dashboard():
+        dashboard_cache.invalidate(user_id)
+        return await dashboard.get_dashboard_data(db=db, current_user=user)
+
+    async def uncached_dashboard_with_old_tip():
+        # What the dashboard did before the pool: the same data plus the random() query
+        response = await uncached_dashboard()
+        await order_by_random(None)
+        return response
+
+    calls = [
+        ("random tip", "pool", lambda: pool.random_tip(db)),
+        ("random tip", "order by random()", lambda: order_by_random(None)),
+        ("random tip [Nutrition]", "pool", lambda: pool.random_tip(db, category="Nutrition")),
+        ("random tip [Nutrition]", "order by random()", lambda: order_by_random("Nutrition")),
+        ("dashboard, cached data", "pool", lambda: dashboard.get_dashboard_data(db=db, current_user=user)),
+        ("dashboard, uncached data", "pool", uncached_dashboard),
+        ("dashboard, uncached data", "order by random()", uncached_dashboard_with_old_tip),
+    ]
+    print(f"{'call':<26}{'tip from':<19}{'p50':>11}{'p95':>11}")
+    for label, source, call in calls:
+        p50, p95, _ = await _timed(args.repeat, call)
+        print(f"{label:<26}{source:<19}{p50:>9.2f}ms{p95:>9.2f}ms")
+
+
+async def _run(args) -> None:
+    from sqlalchemy import func, select
+
+    from app.core.config import settings
+    from app.crud import crud_tip
+    from app.db import models
+    from app.db.database import AsyncSessionLocal, async_engine, engine
+    from app.utils.tip_pool import TipPool
+
+    limit = (args.limit or settings.PAGE_SIZE_DEFAULT) + 1  # the endpoint asks for one extra row
+    started = time.perf_counter()
+    _insert_tips(engine, args.tips, args.seed)
+    user_id = _insert_dashboard_user(engine)
+    print(f"Inserted {args.tips:,} tips in {time.perf_counter() - started:.0f} s ({engine.dialect.name})")
+
+    queries = [(q, None) for q in args.query] or [
+        ("water", None), ("water", "Nutrition"), ("sleep walk", None),
+        (_filler(50), None), (_filler(5000), None), ("nothing matches this", None),
+    ]
+    pool = TipPool(ttl=24 * 3600)
+    try:
+        async with AsyncSessionLocal() as db:
+            total = await db.scalar(select(func.count()).select_from(models.HealthTip))
+            started = time.perf_counter()
+            await pool.search(db, "water", limit=limit)
+            print(f"Tip pool: loaded and indexed {total:,} tips in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+            backends = [("pool", lambda q, category, after: pool.search(db, q, limit=limit, after=after, category=category))]
+            if engine.dialect.name == "postgresql":
+                backends.append(("postgres", lambda q, category, after: crud_tip.search_tips_async(
+                    db, q, limit=limit, after=after, category=category)))
+            if args.skip_search:
+                backends = []
+            else:
+                print(f"{'index':<10}{'query':<28}{'page':>5}{'results':>9}{'p50':>11}{'p95':>11}")
+
+            for name, search in backends:
+                for q, category in queries:
+                    label = q if category is None else f"{q} [{category}]"
+                    after: Optional[tuple] = None
+                    for page in (1, 2):
+                        p50, p95, rows = await _timed(
+                            args.repeat, lambda: search(q, category, after)
+                        )
+                        print(f"{name:<10}{label[:27]:<28}{page:>5}{len(rows):>9}{p50:>9.2f}ms{p95:>9.2f}ms")
+                        if len(rows) < limit:
+                            break
+                        after = (rows[-2].rank, rows[-2].id)  # the last row of the page the client sees
+
+            print()
+            await _random_tips_and_dashboard(args, db, pool, user_id)
+    finally:
+        await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark tip search over a large synthetic tips table.")
+    parser.add_argument("--tips", type=int, default=500_000)
+    parser.add_argument("--query", action="append", default=[], help="Query to time (repeatable).")
+    parser.add_argument("--limit", type=int, default=None, help="Page size (default: PAGE_SIZE_DEFAULT).")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per query.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-search", action="store_true", help="Only time the random tip and the dashboard.")
+    parser.add_argument("--database-url", default=None,
+                        help="Database to fill (default: a scratch SQLite file).")
+    args = parser.parse_args()
+
+    # Settings are read when 'app' is first imported, so the database is chosen before that.
+    os.environ["DATABASE_URL"] = args.database_url or (
+        f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='health-companion-bench-'), 'app.db')}"
+    )
+    os.environ["READ_REPLICA_URLS"] = ""
+    from app.db import migrate
+
+    migrate.main()
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
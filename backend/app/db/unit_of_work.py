@@ -0,0 +1,142 @@
+# backend/app/db/unit_of_work.py
+
+"""
+Unit of work for the write path: one transaction and one COMMIT per user action.
+
+    async with UnitOfWork(db) as uow:
+        log = await uow.insert(models.MedicationLog, {...})
+        await uow.update(db_medication, {"last_taken_at": log.taken_at})
+
+Writes are sent as INSERT/UPDATE ... RETURNING, so the finished row (id,
+defaults) comes back with the write itself and is never reloaded with a
+SELECT. Sessions don't expire objects on commit, so they stay readable.
+
+Units of work nest: crud functions open one, so they commit when called on
+their own; when an endpoint wraps several of them in its own unit, only the
+outermost one commits (or rolls back if the block raised).
+
+uow.after_commit(fn) runs fn once that outermost commit has succeeded (and
+never if it rolled back), e.g. to drop a cache entry only when the new data
+is actually visible to other sessions.
+"""
+
+from typing import Any, Callable, Dict, List, Sequence, Type, TypeVar, Union
+
+from sqlalchemy import insert, inspect, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+ModelT = TypeVar("ModelT")
+
+_DEPTH_KEY = "unit_of_work_depth"
+_AFTER_COMMIT_KEY = "unit_of_work_after_commit"
+
+
+def _enter(db: Union[Session, AsyncSession]) -> None:
+    db.info[_DEPTH_KEY] = db.info.get(_DEPTH_KEY, 0) + 1
+
+
+def _leave(db: Union[Session, AsyncSession]) -> bool:
+    """Returns True if this was the outermost unit of work."""
+    db.info[_DEPTH_KEY] -= 1
+    return db.info[_DEPTH_KEY] == 0
+
+
+def _take_after_commit(db: Union[Session, AsyncSession]) -> List[Callable[[], None]]:
+    """The outermost unit's after-commit callbacks (taken off the session either way)."""
+    return db.info.pop(_AFTER_COMMIT_KEY, [])
+
+
+def insert_stmt(model: Type[ModelT], values: Dict[str, Any]):
+    return insert(model).values(**values).returning(model)
+
+
+def insert_many_stmt(model: Type[ModelT]):
+    """Multi-row INSERT ... RETURNING; rows come back in the order of the parameter list."""
+    return insert(model).returning(model, sort_by_parameter_order=True)
+
+
+def update_stmt(obj: ModelT, values: Dict[str, Any]):
+    """
+    UPDATE of one loaded object by primary key. The session's default
+    synchronize_session sets the new values on 'obj' in place, without a SELECT.
+    """
+    model = type(obj)
+    primary_key = zip(inspect(model).primary_key, inspect(obj).identity)
+    return (
+        update(model)
+        .where(*[column == value for column, value in primary_key])
+        .values(**values)
+        .returning(model)
+    )
+
+
+class UnitOfWork:
+    """Unit of work on an AsyncSession (see module docstring)."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def __aenter__(self) -> "UnitOfWork":
+        _enter(self.db)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        if _leave(self.db):
+            callbacks = _take_after_commit(self.db)
+            if exc_type is None:
+                await self.db.commit()
+                for callback in callbacks:
+                    callback()
+            else:
+                await self.db.rollback()
+        return False
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Runs 'callback' after the outermost unit of work has committed."""
+        self.db.info.setdefault(_AFTER_COMMIT_KEY, []).append(callback)
+
+    async def insert(self, model: Type[ModelT], values: Dict[str, Any]) -> ModelT:
+        return await self.db.scalar(insert_stmt(model, values))
+
+    async def insert_many(self, model: Type[ModelT], rows: Sequence[Dict[str, Any]]) -> List[ModelT]:
+        return list((await self.db.scalars(insert_many_stmt(model), rows)).all())
+
+    async def update(self, obj: ModelT, values: Dict[str, Any]) -> ModelT:
+        if values:
+            await self.db.scalar(update_stmt(obj, values))
+        return obj
+
+
+class SyncUnitOfWork:
+    """The same for the sync Session used by the user, auth and tip endpoints."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def __enter__(self) -> "SyncUnitOfWork":
+        _enter(self.db)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if _leave(self.db):
+            callbacks = _take_after_commit(self.db)
+            if exc_type is None:
+                self.db.commit()
+                for callback in callbacks:
+                    callback()
+            else:
+                self.db.rollback()
+        return False
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Runs 'callback' after the outermost unit of work has committed."""
+        self.db.info.setdefault(_AFTER_COMMIT_KEY, []).append(callback)
+
+    def insert(self, model: Type[ModelT], values: Dict[str, Any]) -> ModelT:
+        return self.db.scalar(insert_stmt(model, values))
+
+    def update(self, obj: ModelT, values: Dict[str, Any]) -> ModelT:
+        if values:
+            self.db.scalar(update_stmt(obj, values))
+        return obj
@@ -1,5 +1,8 @@
 # backend/app/main.py (FINAL, COMPLETE & DEPLOYMENT-READY VERSION)
 
+import time
+_import_started_at = time.perf_counter()  # cold-start clock starts here
+
 import sys
 import os
 
@@ -10,20 +13,29 @@ if backend_dir not in sys.path:
     sys.path.append(backend_dir)
 # --- END OF FIX ---
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 from app.api.v1.api import api_router
+from app.api.pagination import NEXT_CURSOR_HEADER
 from app.core.config import settings
-from app.db.database import engine, Base
-from app.utils.scheduler import send_daily_reminders
+from app.core import security
+from app.core.rate_limit import BucketPolicy, RateLimitMiddleware, create_store
+from app.core.startup_timing import ColdStartMiddleware, cold_start
+from app.db.database import engine, async_engine, replica_router
+from app.db.partitions import maintain_log_partitions
+from app.db.schema import verify_schema_version
+from app.utils.scheduler import prune_expired_sessions, send_daily_reminders
+
+cold_start.mark_import_started(_import_started_at)
 
 # --- Database Initialization ---
-# This creates all tables defined in models.py when the app starts
-Base.metadata.create_all(bind=engine)
+# Tables are NOT created here any more. The schema is created/upgraded once
+# per deploy with `python -m app.db.migrate`; startup only checks its version.
 
 # --- Scheduler Setup ---
 scheduler = AsyncIOScheduler()
@@ -32,6 +44,8 @@ scheduler = AsyncIOScheduler()
 async def lifespan(app: FastAPI):
     """Handles application startup and shutdown events."""
     print("--- Starting up application and scheduler ---")
+    # One cheap query: fail fast if migrations haven't been run.
+    verify_schema_version(engine)
     # Schedule the job to run every day at 8:00 AM India time
     scheduler.add_job(
         send_daily_reminders, 
@@ -42,11 +56,42 @@ async def lifespan(app: FastAPI):
         id="daily_reminder_job",
         replace_existing=True
     )
+    # Creates next months' medication_logs partitions and applies retention (Postgres)
+    scheduler.add_job(
+        maintain_log_partitions,
+        'cron',
+        hour=1,
+        minute=0,
+        timezone='Asia/Kolkata',
+        id="log_partition_maintenance_job",
+        replace_existing=True
+    )
+    # Expired refresh-token sessions can't be used any more, so they are deleted every hour
+    scheduler.add_job(
+        prune_expired_sessions,
+        'interval',
+        hours=1,
+        id="expired_session_prune_job",
+        replace_existing=True
+    )
+    if replica_router.replicas:
+        # Re-checks read replicas so failed ones come back into rotation
+        scheduler.add_job(
+            replica_router.check_health,
+            'interval',
+            seconds=settings.READ_REPLICA_HEALTH_CHECK_SECONDS,
+            id="replica_health_check",
+            replace_existing=True
+        )
     scheduler.start()
+    cold_start.mark_ready()
     yield
     # On shutdown
     print("--- Shutting down application and scheduler ---")
     scheduler.shutdown()
+    security.shutdown_hash_pool()
+    await async_engine.dispose()
+    await replica_router.dispose()
 
 # --- FastAPI Application Instance ---
 app = FastAPI(
@@ -70,8 +115,36 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"], # Allows all methods (GET, POST, etc.)
     allow_headers=["*"], # Allows all headers
+    expose_headers=[NEXT_CURSOR_HEADER], # List endpoints send the next page's cursor here
 )
 
+# --- Rate Limiting for CPU-heavy Auth Endpoints ---
+# Each login attempt costs a bcrypt check and each forgot-password request
+# sends an email, so both are limited per client IP and per target email.
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(
+        RateLimitMiddleware,
+        store=create_store(),
+        paths=("/api/v1/auth/login/access-token", "/api/v1/auth/forgot-password"),
+        ip_policy=BucketPolicy(settings.RATE_LIMIT_PER_IP_CAPACITY, settings.RATE_LIMIT_PER_IP_PER_MINUTE),
+        email_policy=BucketPolicy(settings.RATE_LIMIT_PER_EMAIL_CAPACITY, settings.RATE_LIMIT_PER_EMAIL_PER_MINUTE),
+    )
+
+# --- Cold Start Timing ---
+# Records when this worker sends its first 200 (see /internal/metrics).
+app.add_middleware(ColdStartMiddleware)
+
+# --- Hashing Pool Backpressure ---
+# When the password hashing pool is full, tell the client to retry shortly
+# instead of letting requests queue up behind bcrypt.
+@app.exception_handler(security.HashingPoolSaturated)
+async def hashing_pool_saturated_handler(request: Request, exc: security.HashingPoolSaturated):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server is busy, please try again in a moment."},
+        headers={"Retry-After": "1"},
+    )
+
 # --- Static File Serving (for future image uploads) ---
 # Create the directory if it doesn't exist to prevent errors on startup
 os.makedirs("uploaded_images", exist_ok=True) 
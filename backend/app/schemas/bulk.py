@@ -0,0 +1,11 @@
+# backend/app/schemas/bulk.py
+
+from pydantic import BaseModel
+from typing import List
+
+
+# --- Per-item error of a bulk create request ---
+# 'index' is the item's position in the request list.
+class BulkItemError(BaseModel):
+    index: int
+    errors: List[str]
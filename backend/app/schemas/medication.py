@@ -67,3 +67,13 @@ class MedicationLog(BaseModel):
     class Config:
         from_attributes = True
 
+
+# --- Schema for a medication's adherence summary (from the adherence bitmaps) ---
+class MedicationAdherence(BaseModel):
+    medication_id: int
+    days: int
+    taken_today: bool
+    current_streak: int
+    taken_doses: int
+    scheduled_doses: int
+    adherence_ratio: Optional[float] = None  # None if nothing was due in the window
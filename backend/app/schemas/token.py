@@ -10,11 +10,16 @@ class Token(BaseModel):
     """
     access_token: str
     token_type: str
+    # Long-lived token for POST /auth/refresh (rotated on every use)
+    refresh_token: Optional[str] = None
 
 
 class TokenData(BaseModel):
     """
     Schema for the data contained within a JWT token.
-    This will hold the user's identifier (e.g., email).
+    This holds the user's email ('sub'), primary key ('uid') and
+    token version ('ver', bumped to revoke old tokens).
     """
-    email: Optional[str] = None
\ No newline at end of file
+    email: Optional[str] = None
+    user_id: Optional[int] = None
+    token_version: Optional[int] = None
\ No newline at end of file
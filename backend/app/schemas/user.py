@@ -39,6 +39,22 @@ class UserUpdate(BaseModel):
     notifications_enabled: Optional[bool] = None
 
 
+# Lightweight, read-only view of the logged-in user.
+# This is what the auth dependency caches in memory, so it only holds the
+# fields most endpoints need (no password hash, dob or address).
+class UserSnapshot(BaseModel):
+    id: int
+    email: EmailStr
+    full_name: Optional[str] = None
+    is_active: bool
+    notifications_enabled: Optional[bool] = True
+    token_version: int = 0
+
+    class Config:
+        from_attributes = True
+        frozen = True
+
+
 # Schema for reading/returning user data (e.g., in a GET response)
 # This schema should NEVER include the password.
 class User(UserBase):
@@ -0,0 +1,269 @@
+# backend/app/utils/adherence.py
+
+"""
+Adherence bitmaps: one integer per (medication, month) where bit (day - 1)
+is set if the medication was taken on that day. Days are IST calendar days,
+like everywhere else in the app.
+
+The bitmaps live in the medication_adherence table and are kept in step
+with medication_logs (crud_adherence.record_dose). medication_logs stays the
+source of truth; bitmaps_from_logs() rebuilds them from it.
+
+For windows longer than a month the month bitmaps are laid out end to end as
+one (big) integer per medication (DoseBits), so a 90-day ratio or a streak
+over years of history is a mask, a shift and a bit_count(), not a day loop.
+"""
+
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pytz
+
+from .recurrence import compile_recurrence
+
+IST = pytz.timezone("Asia/Kolkata")
+
+
+def ist_date(moment: datetime) -> date:
+    """The IST calendar day of a timestamp (naive values are UTC, as stored)."""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(IST).date()
+
+
+def ist_day_bounds(day: date) -> Tuple[datetime, datetime]:
+    """
+    The IST calendar day as a [start, end) range of naive UTC timestamps (as stored),
+    so "what happened on this day" is an index range scan instead of converting every row.
+    """
+    start = IST.localize(datetime.combine(day, datetime.min.time())).astimezone(timezone.utc).replace(tzinfo=None)
+    return start, start + timedelta(days=1)
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def day_bit(day: date) -> int:
+    return 1 << (day.day - 1)
+
+
+def scheduled_mask(month: date, frequency_type: Optional[str], frequency_details=None) -> int:
+    """
+    Bits for the days of 'month' on which a medication is due, using the same
+    rules as the reminder job (utils/recurrence). "As Needed" (and unknown)
+    frequencies are never due.
+    """
+    return compile_recurrence(frequency_type, frequency_details).month_mask(month)
+
+
+def bitmaps_from_logs(logs: Iterable[Tuple[int, int, datetime]]) -> Dict[Tuple[int, date], Tuple[int, int]]:
+    """
+    Builds the bitmaps from (medication_id, owner_id, taken_at) log rows.
+    Returns {(medication_id, month): (owner_id, taken_days)}.
+    """
+    bitmaps: Dict[Tuple[int, date], Tuple[int, int]] = {}
+    for medication_id, owner_id, taken_at in logs:
+        if medication_id is None or taken_at is None:
+            continue
+        day = ist_date(taken_at)
+        key = (medication_id, month_start(day))
+        _, taken_days = bitmaps.get(key, (owner_id, 0))
+        bitmaps[key] = (owner_id, taken_days | day_bit(day))
+    return bitmaps
+
+
+def spread_months(months: Dict[date, int], first: date, last: date) -> int:
+    """
+    Lays month bitmaps ({month: bits}) out as one integer for the days
+    first..last: bit i is the day first + i. Months outside the range are ignored.
+    """
+    bits = 0
+    for month, month_bits in months.items():
+        if month > last:
+            continue
+        offset = (month - first).days
+        # (a month that ended before 'first' is shifted out completely)
+        bits |= month_bits << offset if offset >= 0 else month_bits >> -offset
+    return bits & ((1 << ((last - first).days + 1)) - 1)
+
+
+@dataclass(frozen=True)
+class DoseBits:
+    """
+    The days first..last on which a dose was scheduled / taken, bit i being
+    day first + i (see spread_months). 'last' is "today" for the answers below.
+    """
+    first: date
+    last: date
+    scheduled: int
+    taken: int
+
+    @property
+    def length(self) -> int:
+        return (self.last - self.first).days + 1
+
+    def counts(self, days: int) -> Tuple[int, int]:
+        """(scheduled days taken, scheduled days) in the last 'days' days."""
+        days = min(days, self.length)
+        due = self.scheduled & (((1 << days) - 1) << (self.length - days))
+        return (self.taken & due).bit_count(), due.bit_count()
+
+    def streak(self) -> int:
+        """
+        Scheduled days in a row (ending on 'last') on which the dose was taken.
+        'last' only counts once taken; a dose still due then doesn't break the streak.
+        """
+        last_bit = 1 << (self.length - 1)
+        scheduled = self.scheduled if self.taken & last_bit else self.scheduled & ~last_bit
+        missed = scheduled & ~self.taken
+        # Everything scheduled after the latest miss was taken
+        return (scheduled >> missed.bit_length()).bit_count()
+
+    def taken_on_last(self) -> bool:
+        return bool(self.taken >> (self.length - 1) & 1)
+
+    def settled(self) -> "DoseBits":
+        """
+        The same days, except that a dose due on 'last' and not taken yet isn't
+        counted as scheduled: it's still pending, not missed.
+        """
+        if self.taken_on_last():
+            return self
+        return replace(self, scheduled=self.scheduled & ~(1 << (self.length - 1)))
+
+    def with_taken_last(self, taken: bool) -> "DoseBits":
+        """The same days with the last day's taken bit set or cleared."""
+        last_bit = 1 << (self.length - 1)
+        return replace(self, taken=self.taken | last_bit if taken else self.taken & ~last_bit)
+
+
+def combine_dose_bits(all_bits: List[DoseBits]) -> DoseBits:
+    """
+    All medications as one DoseBits (they must share 'last'): a day is scheduled
+    if any dose was due and taken only if every due dose was taken.
+    """
+    first = min(bits.first for bits in all_bits)
+    scheduled = missed = 0
+    for bits in all_bits:
+        shift = (bits.first - first).days
+        due = bits.scheduled << shift
+        scheduled |= due
+        missed |= due & ~(bits.taken << shift)
+    return DoseBits(first, all_bits[0].last, scheduled, scheduled & ~missed)
+
+
+class AdherenceCalendar:
+    """
+    One medication's bitmaps ({month: taken_days}) plus its schedule.
+    All answers come from bit operations on a handful of integers.
+    Days before 'since' (when the medication was added, if known) aren't scheduled.
+    """
+
+    def __init__(
+        self,
+        taken_months: Dict[date, int],
+        frequency_type: Optional[str] = "Daily",
+        frequency_details=None,
+        since: Optional[date] = None,
+    ):
+        self.taken_months = taken_months
+        self.frequency_type = frequency_type
+        self.frequency_details = frequency_details
+        self.since = since
+        self.rule = compile_recurrence(frequency_type, frequency_details)
+
+    def scheduled(self, month: date) -> int:
+        return self.rule.month_mask(month)
+
+    def taken_on(self, day: date) -> bool:
+        return bool(self.taken_months.get(month_start(day), 0) & day_bit(day))
+
+    def dose_bits(self, first: date, last: date) -> DoseBits:
+        """The schedule and the taken days over first..last as a DoseBits."""
+        scheduled = self.rule.day_bits(first, last)
+        if self.since is not None and self.since > first:
+            scheduled &= ~((1 << (self.since - first).days) - 1)
+        return DoseBits(first, last, scheduled, spread_months(self.taken_months, first, last))
+
+    def counts(self, last_day: date, days: int) -> Tuple[int, int]:
+        """(scheduled days taken, scheduled days) in the 'days' days ending on last_day."""
+        return self.dose_bits(last_day - timedelta(days=days - 1), last_day).counts(days)
+
+    def ratio(self, last_day: date, days: int) -> Optional[float]:
+        """Share of scheduled doses taken over the window; None if nothing was due."""
+        taken, scheduled = self.counts(last_day, days)
+        return round(taken / scheduled, 4) if scheduled else None
+
+    def streak(self, today: date) -> int:
+        """
+        Scheduled days in a row (ending today) on which the dose was taken.
+        Today only counts once taken; a dose still due today doesn't break the streak.
+        """
+        if not self.taken_months:
+            return 0
+        return self.dose_bits(min(min(self.taken_months), today), today).streak()
+
+
+# --- Adherence report (dashboard): every medication, and all of them together ---
+TREND_WINDOWS = (7, 30, 90)
+
+
+def _trend(counts: Dict[int, Tuple[int, int]]) -> List[dict]:
+    return [
+        {
+            "days": days,
+            "taken_doses": taken,
+            "scheduled_doses": scheduled,
+            "adherence_ratio": round(taken / scheduled, 4) if scheduled else None,
+        }
+        for days, (taken, scheduled) in counts.items()
+    ]
+
+
+def adherence_message(score: Optional[int]) -> str:
+    if score is None:
+        return "No doses due yet. Your adherence score will show up here."
+    if score >= 90:
+        return "Keep up the great work!"
+    if score >= 75:
+        return "Good going, just a few doses missed."
+    if score >= 50:
+        return "You've missed some doses lately. Reminders can help!"
+    return "Let's get back on track, one dose at a time."
+
+
+def adherence_report(medications: List[Tuple[int, str, DoseBits]]) -> dict:
+    """
+    Streak and 7/30/90-day trends per medication and overall, from each
+    medication's DoseBits (all ending today). The score is the overall
+    30-day share of scheduled doses taken, as a percentage. Doses still due
+    today don't count against it until the day is over.
+    """
+    per_medication = []
+    totals = {days: (0, 0) for days in TREND_WINDOWS}
+    for medication_id, name, bits in medications:
+        settled = bits.settled()
+        counts = {days: settled.counts(days) for days in TREND_WINDOWS}
+        for days, (taken, scheduled) in counts.items():
+            totals[days] = (totals[days][0] + taken, totals[days][1] + scheduled)
+        per_medication.append({
+            "medication_id": medication_id,
+            "name": name,
+            "taken_today": bits.taken_on_last(),
+            "current_streak": bits.streak(),
+            "trend": _trend(counts),
+        })
+    taken, scheduled = totals[30]
+    score = round(100 * taken / scheduled) if scheduled else None
+    return {
+        "score": score,
+        "message": adherence_message(score),
+        "overall": {
+            # Days in a row on which every scheduled dose was taken
+            "current_streak": combine_dose_bits([bits for _, _, bits in medications]).streak() if medications else 0,
+            "trend": _trend(totals),
+        },
+        "medications": per_medication,
+    }
@@ -0,0 +1,91 @@
+# backend/app/utils/cache.py
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    A small, thread-safe, in-process LRU cache whose entries also expire after a TTL.
+
+    Sync endpoints run in a threadpool, so every operation takes a lock.
+    Hit and miss counters are kept so callers can check how well the cache works.
+    Expired entries are dropped when they are read, and all of them are swept
+    out at most once every 'purge_interval' seconds when new entries are added.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, purge_interval: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.purge_interval = purge_interval
+        self.hits = 0
+        self.misses = 0
+        # key -> (expires_at, value), oldest (least recently used) first
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_purge = time.monotonic() + purge_interval
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns the cached value, or 'default' if it is missing or expired."""
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[0] <= now:
+                if item is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Stores a value, optionally with its own TTL in seconds.
+        The least recently used entry is dropped when the cache is full.
+        """
+        now = time.monotonic()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if now >= self._next_purge:
+                self._purge_expired(now)
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def purge_expired(self) -> int:
+        """Removes every expired entry and returns how many were removed."""
+        with self._lock:
+            return self._purge_expired(time.monotonic())
+
+    def _purge_expired(self, now: float) -> int:
+        expired = [key for key, (expires_at, _) in self._data.items() if expires_at <= now]
+        for key in expired:
+            del self._data[key]
+        self._next_purge = now + self.purge_interval
+        return len(expired)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Removes a single entry, if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Removes all entries (the counters are kept)."""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        """Returns size and hit/miss counters for the metrics endpoint."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
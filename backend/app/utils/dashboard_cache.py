@@ -0,0 +1,85 @@
+# backend/app/utils/dashboard_cache.py
+
+import itertools
+import threading
+from datetime import date
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.utils.cache import TTLCache
+
+
+class DashboardCache:
+    """
+    Per-user cache of the assembled dashboard (everything except the random tip),
+    for one IST day: an entry from yesterday is a miss, so the dashboard rolls
+    over at IST midnight on its own.
+
+    Writes to a user's medications, logs, appointments and contacts call
+    invalidate(owner_id) after they commit. Each call also gives the user a new
+    version; a payload is only stored if the version didn't change while it
+    was being read, so a read that raced a write can't put old data back.
+
+    Versions are kept in a bounded TTLCache too (same size and TTL as the
+    entries), and are never reused: they come from one counter. A version that
+    was evicted meanwhile just means the payload isn't stored.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._versions = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._next_version = itertools.count(1)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def version(self, owner_id: int) -> int:
+        """Take this before reading the data for set()."""
+        with self._lock:
+            version = self._versions.get(owner_id)
+            if version is None:
+                version = next(self._next_version)
+                self._versions.set(owner_id, version)
+            return version
+
+    def get(self, owner_id: int, day: date) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(owner_id)
+        with self._lock:
+            if entry is None or entry[0] != day:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def set(self, owner_id: int, day: date, payload: Dict[str, Any], version: int) -> None:
+        with self._lock:
+            if self._versions.get(owner_id) == version:
+                self._entries.set(owner_id, (day, payload))
+
+    def invalidate(self, owner_id: int) -> None:
+        with self._lock:
+            self._versions.set(owner_id, next(self._next_version))
+            self._entries.invalidate(owner_id)
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        """Size and hit/miss counters for the metrics endpoint."""
+        entries = self._entries.stats()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": entries["size"],
+                "maxsize": entries["maxsize"],
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+            }
+
+
+# Shared by the dashboard endpoint and the crud functions that change its data.
+# Per process, like the other caches: other workers' writes show up after the TTL.
+dashboard_cache = DashboardCache(
+    maxsize=settings.DASHBOARD_CACHE_MAX_ENTRIES, ttl=settings.DASHBOARD_CACHE_TTL_SECONDS
+)
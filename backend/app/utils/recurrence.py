@@ -0,0 +1,145 @@
+# backend/app/utils/recurrence.py
+
+"""
+Medication schedules (frequency_type + frequency_details) compiled into a
+small Recurrence rule, shared by the dashboard, the adherence engine and the
+reminder job:
+
+    Daily       every day
+    Weekly      frequency_details = ["Monday", "Thursday"]  (weekday names)
+    Monthly     frequency_details = 15  (day of the month; months without it are skipped)
+    anything else ("As Needed", ...) is never due
+
+A rule is a weekday mask plus a day of the month, so "is it due on D" is a bit
+test, and the due days of a whole range come out as one integer (bit i = the
+day first + i) built from a repeated 7-bit week pattern, not a loop over days.
+ScheduleIndex answers "which of these medications are due on D" for many
+medications at once from weekday and day-of-month tables.
+"""
+
+import calendar
+from dataclasses import dataclass
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Dict, List, Optional, Set
+
+WEEKDAYS = list(calendar.day_name)  # "Monday" ... "Sunday", as stored in frequency_details
+ALL_WEEKDAYS = 0b1111111
+
+
+def next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def _week_pattern(weekdays: int, first: date) -> int:
+    """The weekday mask turned so that bit 0 is first's weekday (bit j = first + j days)."""
+    shift = first.weekday()
+    return ((weekdays >> shift) | (weekdays << (7 - shift))) & ALL_WEEKDAYS
+
+
+@dataclass(frozen=True)
+class Recurrence:
+    """A compiled schedule: bit w of 'weekdays' is set if due on weekday w (Monday = 0),
+    'month_day' is the day of the month for Monthly schedules (0 otherwise)."""
+    weekdays: int = 0
+    month_day: int = 0
+
+    def is_due(self, day: date) -> bool:
+        return bool(self.weekdays >> day.weekday() & 1) or day.day == self.month_day
+
+    def day_bits(self, first: date, last: date) -> int:
+        """Due days in first..last as one integer: bit i is the day first + i."""
+        days = (last - first).days + 1
+        if days <= 0:
+            return 0
+        bits = 0
+        if self.weekdays:
+            # The week's pattern repeated: multiplying by 1 + 2^7 + 2^14 + ... copies it every 7 bits
+            weeks = -(-days // 7)
+            bits = _week_pattern(self.weekdays, first) * (((1 << (7 * weeks)) - 1) // ALL_WEEKDAYS)
+        if self.month_day:
+            month = first.replace(day=1)
+            while month <= last:
+                following = next_month(month)
+                if self.month_day <= (following - month).days:
+                    offset = (month - first).days + self.month_day - 1
+                    if offset >= 0:
+                        bits |= 1 << offset
+                month = following
+        return bits & ((1 << days) - 1)
+
+    def month_mask(self, month: date) -> int:
+        """Due days of one month (given by its 1st): bit (day - 1), like the adherence bitmaps."""
+        return self.day_bits(month, next_month(month) - timedelta(days=1))
+
+    def occurrences(self, first: date, last: date) -> List[date]:
+        """The due days in first..last, in order."""
+        return _dates(self.day_bits(first, last), first)
+
+
+NEVER = Recurrence()
+DAILY = Recurrence(weekdays=ALL_WEEKDAYS)
+
+
+def compile_recurrence(frequency_type: Optional[str], frequency_details=None) -> Recurrence:
+    """The Recurrence of a medication's frequency_type / frequency_details."""
+    if isinstance(frequency_details, list):
+        # Hashable, for the cache (weekday names are all a Weekly schedule uses)
+        frequency_details = tuple(detail for detail in frequency_details if isinstance(detail, str))
+    elif not isinstance(frequency_details, int):
+        frequency_details = None
+    return _compile(frequency_type, frequency_details)
+
+
+@lru_cache(maxsize=1024)
+def _compile(frequency_type: Optional[str], frequency_details) -> Recurrence:
+    if frequency_type == "Daily":
+        return DAILY
+    if frequency_type == "Weekly" and isinstance(frequency_details, tuple):
+        weekdays = 0
+        for weekday, name in enumerate(WEEKDAYS):
+            if name in frequency_details:
+                weekdays |= 1 << weekday
+        return Recurrence(weekdays=weekdays)
+    if frequency_type == "Monthly" and isinstance(frequency_details, int) and 1 <= frequency_details <= 31:
+        return Recurrence(month_day=int(frequency_details))
+    return NEVER
+
+
+def _dates(bits: int, first: date) -> List[date]:
+    dates = []
+    while bits:
+        low = bits & -bits
+        dates.append(first + timedelta(days=low.bit_length() - 1))
+        bits ^= low
+    return dates
+
+
+class ScheduleIndex:
+    """
+    Many medications' rules ({medication_id: Recurrence}), indexed by weekday
+    and by day of the month, so the medications due on a day are two lookups.
+    """
+
+    def __init__(self, rules: Dict[int, Recurrence]):
+        self.rules = rules
+        self._by_weekday: List[Set[int]] = [set() for _ in range(7)]
+        self._by_month_day: Dict[int, Set[int]] = {}
+        for medication_id, rule in rules.items():
+            for weekday in range(7):
+                if rule.weekdays >> weekday & 1:
+                    self._by_weekday[weekday].add(medication_id)
+            if rule.month_day:
+                self._by_month_day.setdefault(rule.month_day, set()).add(medication_id)
+
+    def due_on(self, day: date) -> Set[int]:
+        """IDs of the medications due on 'day'."""
+        return self._by_weekday[day.weekday()] | self._by_month_day.get(day.day, set())
+
+    def occurrences(self, first: date, last: date) -> Dict[int, List[date]]:
+        """Every medication's due days in first..last; each distinct rule is expanded once."""
+        expanded: Dict[Recurrence, List[date]] = {}
+        for rule in self.rules.values():
+            if rule not in expanded:
+                expanded[rule] = rule.occurrences(first, last)
+        return {medication_id: expanded[rule] for medication_id, rule in self.rules.items()}
@@ -1,17 +1,21 @@
 # backend/utils/scheduler.py (VERSION 2.0 - ADVANCED REMINDER LOGIC)
 
-from sqlalchemy import and_
+from collections import defaultdict
 from datetime import datetime
 import pytz
 
 from app.db.database import SessionLocal
+from app.crud import crud_session
 from app.db import models
+from .adherence import day_bit, ist_day_bounds
 from .email_utils import send_email
+from .recurrence import ScheduleIndex, compile_recurrence
 
 def send_daily_reminders():
     """
     The main job that runs daily. It now uses advanced logic to figure out
-    which medications are due today based on their frequency settings.
+    which medications are due today based on their frequency settings
+    (utils/recurrence, the same rules the dashboard uses).
     """
     print(f"--- Running daily reminder job at {datetime.now()} ---")
     db = SessionLocal()
@@ -20,52 +24,48 @@ def send_daily_reminders():
     IST = pytz.timezone('Asia/Kolkata')
     now_in_ist = datetime.now(IST)
     today_in_ist = now_in_ist.date()
-    today_weekday = now_in_ist.strftime('%A') # e.g., "Monday"
-    today_day_of_month = now_in_ist.day # e.g., 15
+    # Today's IST bounds in naive UTC (how datetimes are stored), so the
+    # appointments lookup is a plain index range scan.
+    day_start_utc, day_end_utc = ist_day_bounds(today_in_ist)
 
     try:
         # Get all active users who have notifications enabled
-        users_to_remind = db.query(models.User).filter(
-            models.User.is_active == True,
-            models.User.notifications_enabled == True
-        ).all()
-        
+        reminded_user = (models.User.is_active == True) & (models.User.notifications_enabled == True)
+        users_to_remind = db.query(models.User).filter(reminded_user).all()
+
+        # --- Medications due today, for all these users at once ---
+        # Ek query mein sabki dawaiyan, phir schedule index se aaj wali (har dawai
+        # ke liye alag logic ya alag query nahi).
+        all_meds = db.query(models.Medication).join(
+            models.User, models.User.id == models.Medication.owner_id
+        ).filter(reminded_user).order_by(models.Medication.id).all()
+        schedule = ScheduleIndex({
+            med.id: compile_recurrence(med.frequency_type, med.frequency_details) for med in all_meds
+        })
+        due_ids = schedule.due_on(today_in_ist)
+
+        # Already taken today (today's bit in the adherence bitmaps): one query for everyone
+        taken_ids = {medication_id for (medication_id,) in db.query(models.MedicationAdherence.medication_id).join(
+            models.User, models.User.id == models.MedicationAdherence.owner_id
+        ).filter(
+            reminded_user,
+            models.MedicationAdherence.month == today_in_ist.replace(day=1),
+            models.MedicationAdherence.taken_days.op('&')(day_bit(today_in_ist)) != 0
+        )}
+
+        meds_due_by_user = defaultdict(list)
+        for med in all_meds:
+            if med.id in due_ids and med.id not in taken_ids:
+                meds_due_by_user[med.owner_id].append(med)
+
         for user in users_to_remind:
-            meds_due_today = []
-            
-            # Get all medications for the user
-            all_user_meds = db.query(models.Medication).filter(models.Medication.owner_id == user.id).all()
-
-            # --- YEH NAYA, SMART FILTERING LOGIC HAI ---
-            for med in all_user_meds:
-                is_due = False
-                freq_type = med.frequency_type
-                freq_details = med.frequency_details
-
-                if freq_type == "Daily":
-                    is_due = True
-                elif freq_type == "Weekly" and isinstance(freq_details, list):
-                    if today_weekday in freq_details:
-                        is_due = True
-                elif freq_type == "Monthly" and isinstance(freq_details, int):
-                    if today_day_of_month == freq_details:
-                        is_due = True
-                
-                if is_due:
-                    # Check if it has already been taken today
-                    log_today = db.query(models.MedicationLog).filter(
-                        models.MedicationLog.owner_id == user.id,
-                        models.MedicationLog.medication_id == med.id,
-                        cast(models.MedicationLog.taken_at.op('AT TIME ZONE')('Asia/Kolkata'), Date) == today_in_ist
-                    ).first()
-
-                    if not log_today:
-                        meds_due_today.append(med)
+            meds_due_today = meds_due_by_user.get(user.id, [])
 
             # --- Find appointments for today for this user (logic remains similar) ---
             appts_today = db.query(models.Appointment).filter(
                 models.Appointment.owner_id == user.id,
-                cast(models.Appointment.appointment_datetime.op('AT TIME ZONE')('Asia/Kolkata'), Date) == today_in_ist
+                models.Appointment.appointment_datetime >= day_start_utc,
+                models.Appointment.appointment_datetime < day_end_utc
             ).all()
 
             # If there's nothing to remind, skip to the next user
@@ -90,7 +90,7 @@ def send_daily_reminders():
                 html_content += "<h3>🗓️ Appointments Today:</h3><ul>"
                 text_content += "\n--- Appointments Today ---\n"
                 for appt in appts_today:
-                    appt_dt_ist = appt.appointment_datetime.astimezone(IST)
+                    appt_dt_ist = pytz.utc.localize(appt.appointment_datetime).astimezone(IST)
                     appt_time_str = appt_dt_ist.strftime('%I:%M %p')
                     html_content += f"<li><b>Dr. {appt.doctor_name}</b> at {appt_time_str}</li>"
                     text_content += f"- Dr. {appt.doctor_name} at {appt_time_str}\n"
@@ -103,3 +103,18 @@ def send_daily_reminders():
     finally:
         db.close()
     print("--- Daily reminder job finished ---")
+
+
+def prune_expired_sessions():
+    """
+    Periodic job: deletes refresh-token sessions that have expired, so
+    auth_sessions only holds sessions that can still be used.
+    """
+    db = SessionLocal()
+    try:
+        deleted = crud_session.delete_expired_sessions(db)
+    finally:
+        db.close()
+    if deleted:
+        print(f"--- Pruned {deleted} expired auth sessions ---")
+    return deleted
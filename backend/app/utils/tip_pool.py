@@ -0,0 +1,260 @@
+# backend/app/utils/tip_pool.py
+
+import asyncio
+import bisect
+import heapq
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import models
+
+
+@dataclass(frozen=True)
+class PooledTip:
+    """The fields of a HealthTip the API returns (works with from_attributes schemas)."""
+    id: int
+    tip_text: str
+    category: Optional[str]
+
+
+@dataclass(frozen=True)
+class RankedTip:
+    """A search result: the tip plus its relevance (higher is better)."""
+    id: int
+    tip_text: str
+    category: Optional[str]
+    rank: float
+
+
+# Words too common to help a search (roughly what Postgres' english config drops).
+STOP_WORDS = frozenset(
+    "a an and are as at be but by do for from has have how i if in into is it its "
+    "of on or so than that the their them then there these they this to was we what "
+    "when which while who will with you your".split()
+)
+
+
+def search_terms(text: str) -> List[str]:
+    """Lower-cased words of 'text' without stop words (no stemming, unlike Postgres)."""
+    return [word for word in re.findall(r"[a-z0-9]+", text.lower()) if word not in STOP_WORDS]
+
+
+class _RandomBag:
+    """List + position index: O(1) add, remove by id and random choice."""
+
+    def __init__(self):
+        self.items: List[PooledTip] = []
+        self.positions: Dict[int, int] = {}
+
+    def add(self, tip: PooledTip) -> None:
+        position = self.positions.get(tip.id)
+        if position is None:
+            self.positions[tip.id] = len(self.items)
+            self.items.append(tip)
+        else:
+            self.items[position] = tip
+
+    def remove(self, tip_id: int) -> Optional[PooledTip]:
+        position = self.positions.pop(tip_id, None)
+        if position is None:
+            return None
+        removed, last = self.items[position], self.items.pop()
+        if last.id != tip_id:
+            # Aakhri item ko khaali jagah par rakh do, taaki list mein shift na karna pade
+            self.items[position] = last
+            self.positions[last.id] = position
+        return removed
+
+
+class TipPool:
+    """
+    Process-local copy of the health_tips table, so picking a random tip is a
+    random.choice() instead of ORDER BY random() (a sort of the whole table).
+
+    The pool is loaded on first use and reloaded after 'ttl' seconds, which is
+    how changes made through other workers show up. Tips created or deleted
+    through this worker are applied right away (add/remove).
+    Sync endpoints change it from the threadpool, so changes take a lock.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.loads = 0
+        self._changes = 0  # bumped by add/remove, to spot changes made during a load
+        self._all = _RandomBag()
+        self._by_category: Dict[Optional[str], _RandomBag] = {}
+        # term -> {tip id: times the term appears in it}; built on the first search
+        self._postings: Optional[Dict[str, Dict[int, int]]] = None
+        # term -> its postings as (tip id, count), most occurrences first, then by id;
+        # built when a one-word search needs it, dropped when the term's postings change
+        self._ranked: Dict[str, List[Tuple[int, int]]] = {}
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        self._load_lock = asyncio.Lock()
+
+    async def _ensure_loaded(self, db: AsyncSession) -> None:
+        if time.monotonic() < self._expires_at:
+            return
+        async with self._load_lock:
+            if time.monotonic() < self._expires_at:
+                return  # loaded by another request while this one waited
+            changes_before = self._changes
+            rows = await db.execute(
+                select(models.HealthTip.id, models.HealthTip.tip_text, models.HealthTip.category)
+            )
+            tips = [PooledTip(*row) for row in rows]
+            everything, by_category = _RandomBag(), {}
+            for tip in tips:
+                everything.add(tip)
+                by_category.setdefault(tip.category, _RandomBag()).add(tip)
+            with self._lock:
+                self._all, self._by_category = everything, by_category
+                self._postings = None
+                self._ranked = {}
+                # A tip added/removed while the query ran may be missing from (or
+                # still in) what was read, so load again on the next request.
+                self._expires_at = time.monotonic() + self.ttl if self._changes == changes_before else 0.0
+                self.loads += 1
+
+    async def random_tip(self, db: AsyncSession, category: Optional[str] = None) -> Optional[PooledTip]:
+        """A random tip (from 'category' if given), or None if there are none."""
+        await self._ensure_loaded(db)
+        with self._lock:
+            bag = self._all if category is None else self._by_category.get(category)
+            return random.choice(bag.items) if bag and bag.items else None
+
+    def add(self, tip: models.HealthTip) -> None:
+        pooled = PooledTip(tip.id, tip.tip_text, tip.category)
+        with self._lock:
+            self._changes += 1
+            previous = self._all.remove(pooled.id)
+            if previous is not None:
+                self._forget(previous)
+            self._all.add(pooled)
+            self._by_category.setdefault(pooled.category, _RandomBag()).add(pooled)
+            if self._postings is not None:
+                self._index(pooled)
+
+    def remove(self, tip_id: int) -> None:
+        with self._lock:
+            self._changes += 1
+            removed = self._all.remove(tip_id)
+            if removed is not None:
+                self._forget(removed)
+
+    def _forget(self, tip: PooledTip) -> None:
+        """Drops a tip from the category bag and the search index (lock held)."""
+        if tip.category in self._by_category:
+            self._by_category[tip.category].remove(tip.id)
+        if self._postings is not None:
+            for term in set(search_terms(tip.tip_text)):
+                postings = self._postings.get(term)
+                if postings is not None:
+                    postings.pop(tip.id, None)
+                    self._ranked.pop(term, None)
+                    if not postings:
+                        del self._postings[term]
+
+    def _index(self, tip: PooledTip) -> None:
+        for term, count in Counter(search_terms(tip.tip_text)).items():
+            self._postings.setdefault(term, {})[tip.id] = count
+            self._ranked.pop(term, None)
+
+    async def search(
+        self,
+        db: AsyncSession,
+        q: str,
+        limit: int,
+        after: Optional[Tuple[float, int]] = None,
+        category: Optional[str] = None,
+    ) -> List[RankedTip]:
+        """
+        In-memory full-text search, used where the database has no text index (SQLite).
+        Every word of 'q' must appear (like websearch_to_tsquery); tips are ranked
+        by how often the words appear in them, then by id. 'after' is the (rank, id)
+        keyset cursor. The rank doesn't depend on the rest of the pool (no IDF), so
+        tips added or deleted between pages don't shift the cursor.
+        """
+        await self._ensure_loaded(db)
+        terms = set(search_terms(q))
+        with self._lock:
+            if self._postings is None:
+                self._postings = {}
+                for tip in self._all.items:
+                    self._index(tip)
+            if not terms or any(term not in self._postings for term in terms):
+                return []
+            in_category = None
+            if category is not None:
+                bag = self._by_category.get(category)
+                if not bag:
+                    return []
+                in_category = bag.positions
+            if len(terms) == 1:
+                best = self._search_one_term(next(iter(terms)), limit, after, in_category)
+            else:
+                best = self._search_all_terms([self._postings[term] for term in terms], limit, after, in_category)
+            return [RankedTip(tip_id, self._tip(tip_id).tip_text, self._tip(tip_id).category, rank) for rank, tip_id in best]
+
+    def _search_one_term(
+        self, term: str, limit: int, after: Optional[Tuple[float, int]], in_category: Optional[dict]
+    ) -> List[Tuple[float, int]]:
+        """
+        One-word query (lock held): the rank is the count, so the term's postings
+        sorted by (count desc, id) are already in result order, and a page is a
+        bisect to the cursor plus 'limit' steps.
+        """
+        ranked = self._ranked.get(term)
+        if ranked is None:
+            ranked = self._ranked[term] = sorted(self._postings[term].items(), key=lambda item: (-item[1], item[0]))
+
+        start = 0
+        if after is not None:
+            start = bisect.bisect_right(ranked, (-after[0], after[1]), key=lambda item: (-item[1], item[0]))
+        best = []
+        for index in range(start, len(ranked)):
+            if len(best) == limit:
+                break
+            item = ranked[index]
+            if in_category is None or item[0] in in_category:
+                best.append((float(item[1]), item[0]))
+        return best
+
+    def _search_all_terms(
+        self, postings_per_term: List[Dict[int, int]], limit: int,
+        after: Optional[Tuple[float, int]], in_category: Optional[dict]
+    ) -> List[Tuple[float, int]]:
+        """Several words (lock held): the tips having all of them are found with set intersections."""
+        postings_per_term = sorted(postings_per_term, key=len)
+        tip_ids = postings_per_term[0].keys()
+        for postings in postings_per_term[1:]:
+            tip_ids = tip_ids & postings.keys()
+        if in_category is not None:
+            tip_ids = tip_ids & in_category.keys()
+        hits = []  # (-rank, id), so the smallest are the best
+        for tip_id in tip_ids:
+            rank = float(sum(postings[tip_id] for postings in postings_per_term))
+            if after is not None and (rank > after[0] or (rank == after[0] and tip_id <= after[1])):
+                continue
+            hits.append((-rank, tip_id))
+        return [(-rank, tip_id) for rank, tip_id in heapq.nsmallest(limit, hits)]
+
+    def _tip(self, tip_id: int) -> PooledTip:
+        return self._all.items[self._all.positions[tip_id]]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._all.items),
+                "categories": len(self._by_category),
+                "loads": self.loads,
+                "seconds_until_reload": max(0.0, round(self._expires_at - time.monotonic(), 1)),
+            }
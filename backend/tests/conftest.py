@@ -0,0 +1,67 @@
+# backend/tests/conftest.py
+
+"""
+Shared setup for the backend tests. Run from the backend directory:
+
+    python -m pytest
+
+Every run gets a fresh SQLite database in a temp directory, migrated with
+app.db.migrate like a real deploy. The settings are read when 'app' is first
+imported, so the environment is set up here, before any test module imports it.
+"""
+
+import itertools
+import os
+import tempfile
+
+DB_DIR = tempfile.mkdtemp(prefix="health-companion-tests-")
+
+# Never the developer's own database (or replicas), whatever .env says.
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(DB_DIR, 'app.db')}"
+os.environ["READ_REPLICA_URLS"] = ""
+# Tests log in far more often than the limits allow, and cheap hashes keep them fast.
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["PASSWORD_HASH_SCHEME"] = "bcrypt"
+for name, value in {
+    "SECRET_KEY": "test-secret-key",
+    "MAIL_USERNAME": "",
+    "MAIL_PASSWORD": "",
+    "MAIL_FROM": "noreply@example.com",
+    "MAIL_SERVER": "localhost",
+    "FRONTEND_URL": "http://localhost:8501",
+}.items():
+    os.environ.setdefault(name, value)
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.db import migrate  # noqa: E402
+
+migrate.main()
+
+from app.main import app  # noqa: E402
+
+_emails = itertools.count(1)
+
+PASSWORD = "secret-password"
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def make_user(client):
+    """Creates a user and returns (user_id, auth headers)."""
+    def make(full_name: str = "Asha Rao"):
+        email = f"user{next(_emails)}@example.com"
+        response = client.post("/api/v1/users/", json={"email": email, "full_name": full_name, "password": PASSWORD})
+        assert response.status_code in (200, 201), response.text
+        token = client.post(
+            "/api/v1/auth/login/access-token", data={"username": email, "password": PASSWORD}
+        ).json()["access_token"]
+        return response.json()["id"], {"Authorization": f"Bearer {token}"}
+    return make
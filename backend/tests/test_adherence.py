@@ -0,0 +1,176 @@
+# backend/tests/test_adherence.py
+
+"""
+Adherence bitmaps (utils/adherence.py, crud/crud_adherence.py): the dose
+upsert, windows and streaks that cross month boundaries, and the memoized
+report picking up a new dose.
+"""
+
+import asyncio
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import select
+
+from app.crud import crud_adherence, crud_medication
+from app.crud.crud_adherence import adherence_history_cache
+from app.db import models
+from app.db.database import AsyncSessionLocal, async_engine
+from app.utils.adherence import IST, AdherenceCalendar, DoseBits, bitmaps_from_logs, day_bit, spread_months
+
+
+def _run(make_coroutine):
+    """Runs a coroutine on a fresh loop (the async engine's connections don't outlive it)."""
+    async def run():
+        try:
+            return await make_coroutine()
+        finally:
+            await async_engine.dispose()
+    return asyncio.run(run())
+
+
+def _by_month(days):
+    """{month: taken_days} bitmaps with the given days taken."""
+    months = {}
+    for day in days:
+        months[day.replace(day=1)] = months.get(day.replace(day=1), 0) | day_bit(day)
+    return months
+
+
+def _create_medication(client, headers, **fields):
+    response = client.post("/api/v1/medications/", headers=headers, json={
+        "name": "Metformin", "dosage": "500mg", "timing_type": "Meal-Related", "meal_timing": "After Breakfast",
+        "frequency_type": "Daily", **fields,
+    })
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def _month_rows(medication_id):
+    async def read():
+        async with AsyncSessionLocal() as db:
+            return dict((await db.execute(
+                select(models.MedicationAdherence.month, models.MedicationAdherence.taken_days)
+                .where(models.MedicationAdherence.medication_id == medication_id)
+            )).all())
+    return _run(read)
+
+
+def test_record_dose_ors_the_day_bit_in(client, make_user):
+    user_id, headers = make_user()
+    medication_id = _create_medication(client, headers)
+    doses = [
+        datetime(2026, 1, 5, 3, 0),
+        datetime(2026, 1, 5, 12, 0),  # the same IST day again
+        datetime(2026, 1, 20, 6, 0),
+        datetime(2026, 1, 31, 19, 0),  # already 1 February in IST
+    ]
+
+    async def record():
+        async with AsyncSessionLocal() as db:
+            for taken_at in doses:
+                await crud_adherence.record_dose(db, medication_id=medication_id, owner_id=user_id, taken_at=taken_at)
+            await db.commit()
+    _run(record)
+
+    assert _month_rows(medication_id) == {
+        date(2026, 1, 1): day_bit(date(2026, 1, 5)) | day_bit(date(2026, 1, 20)),
+        date(2026, 2, 1): day_bit(date(2026, 2, 1)),
+    }
+    # The same bitmaps a rebuild from the logs would give
+    assert _month_rows(medication_id) == {
+        month: taken_days for (_, month), (_, taken_days)
+        in bitmaps_from_logs((medication_id, user_id, taken_at) for taken_at in doses).items()
+    }
+
+
+def test_spread_months_across_a_month_boundary():
+    months = {date(2026, 1, 1): day_bit(date(2026, 1, 30)) | day_bit(date(2026, 1, 31)),
+              date(2026, 2, 1): day_bit(date(2026, 2, 1)) | day_bit(date(2026, 2, 28)),
+              date(2026, 3, 1): day_bit(date(2026, 3, 1))}
+    first, last = date(2026, 1, 31), date(2026, 2, 28)
+    bits = spread_months(months, first, last)
+    # Jan 30 is before the window, March after it
+    assert [first + timedelta(days=n) for n in range(bits.bit_length()) if bits >> n & 1] == [
+        date(2026, 1, 31), date(2026, 2, 1), date(2026, 2, 28)
+    ]
+
+
+def test_dose_bits_windows_cross_months():
+    # Daily, taken every day from 25 January to 5 February except 1 February
+    taken = [date(2026, 1, 25) + timedelta(days=n) for n in range(12)]
+    taken.remove(date(2026, 2, 1))
+    calendar = AdherenceCalendar(_by_month(taken), "Daily")
+
+    assert calendar.counts(date(2026, 2, 5), 7) == (6, 7)  # 30 Jan .. 5 Feb, one miss
+    assert calendar.counts(date(2026, 2, 5), 12) == (11, 12)
+    assert calendar.counts(date(2026, 1, 31), 7) == (7, 7)  # 25 .. 31 January
+    assert calendar.ratio(date(2026, 2, 5), 30) == round(11 / 30, 4)
+
+    bits = calendar.dose_bits(date(2026, 1, 25), date(2026, 2, 5))
+    assert bits.length == 12 and bits.counts(90) == (11, 12)  # a window longer than the range is capped
+
+
+def test_streaks_run_across_months():
+    # Daily, taken every day from 20 December 2025 to 3 March 2026
+    first, last = date(2025, 12, 20), date(2026, 3, 3)
+    months = _by_month([first + timedelta(days=n) for n in range((last - first).days + 1)])
+    calendar = AdherenceCalendar(months, "Daily")
+    assert calendar.streak(last) == (last - first).days + 1
+    # Today not taken yet doesn't break it; a missed yesterday does
+    assert calendar.streak(last + timedelta(days=1)) == (last - first).days + 1
+    assert calendar.streak(last + timedelta(days=2)) == 0
+
+    # A miss on 10 February: the streak starts again the day after
+    months[date(2026, 2, 1)] &= ~day_bit(date(2026, 2, 10))
+    assert AdherenceCalendar(months, "Daily").streak(last) == (last - date(2026, 2, 11)).days + 1
+
+    # Weekly (Mondays and Thursdays): only the scheduled days count, over several months
+    weekly = AdherenceCalendar(_by_month(
+        [day for day in (first + timedelta(days=n) for n in range(75)) if day.weekday() in (0, 3)]
+    ), "Weekly", ["Monday", "Thursday"])
+    due = [day for day in (first + timedelta(days=n) for n in range(75)) if day.weekday() in (0, 3)]
+    assert weekly.streak(first + timedelta(days=74)) == len(due)
+
+
+def test_memoized_report_picks_up_a_new_dose(client, make_user):
+    user_id, headers = make_user()
+    medication_id = _create_medication(client, headers)
+    today = datetime.now(IST).date()
+    adherence_history_cache.clear()
+
+    async def report():
+        async with AsyncSessionLocal() as db:
+            taken_today = await crud_adherence.get_taken_ids_on(db, owner_id=user_id, day=today)
+            result = await crud_adherence.get_adherence_report(
+                db, owner_id=user_id, today=today, taken_today_ids=taken_today
+            )
+            return result["medications"][0]
+
+    async def take_dose():
+        async with AsyncSessionLocal() as db:
+            await crud_medication.create_medication_log(db, medication_id=medication_id, owner_id=user_id)
+
+    before = _run(report)
+    assert not before["taken_today"] and before["current_streak"] == 0
+    misses = adherence_history_cache.misses
+
+    _run(take_dose)
+    after = _run(report)
+    assert after["taken_today"] and after["current_streak"] == 1
+    assert after["trend"][0]["taken_doses"] == 1
+    # The day's history came from the cache; only today's dose was read again
+    assert adherence_history_cache.misses == misses
+
+    # Through the API as well: the dashboard shows the dose right after it is logged
+    second = _create_medication(client, headers, name="B12")
+    assert client.post(f"/api/v1/medications/{second}/taken", headers=headers).status_code in (200, 201)
+    dashboard = client.get("/api/v1/dashboard/", headers=headers).json()
+    assert {med["medication_id"] for med in dashboard["adherence"]["medications"] if med["taken_today"]} == {
+        medication_id, second
+    }
+
+
+def test_dose_bits_today_pending_is_not_a_miss():
+    bits = DoseBits(date(2026, 3, 1), date(2026, 3, 3), scheduled=0b111, taken=0b011)
+    assert bits.streak() == 2 and bits.settled().counts(3) == (2, 2)
+    assert bits.with_taken_last(True).streak() == 3
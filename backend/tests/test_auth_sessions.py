@@ -0,0 +1,74 @@
+# backend/tests/test_auth_sessions.py
+
+"""Refresh-token sessions: rotation, logout and pruning (crud/crud_session.py)."""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, update
+
+from app.crud import crud_session
+from app.db import models
+from app.db.database import SessionLocal, engine
+from app.utils.scheduler import prune_expired_sessions
+from tests.conftest import PASSWORD
+
+
+def _login(client, make_user):
+    user_id, _ = make_user()
+    with SessionLocal() as db:
+        email = db.get(models.User, user_id).email
+    response = client.post("/api/v1/auth/login/access-token", data={"username": email, "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    return user_id, response.json()["refresh_token"]
+
+
+def _refresh(client, refresh_token):
+    return client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token})
+
+
+def test_refresh_rotates_the_token(client, make_user):
+    _, refresh_token = _login(client, make_user)
+    response = _refresh(client, refresh_token)
+    assert response.status_code == 200, response.text
+    new_token = response.json()["refresh_token"]
+    assert new_token != refresh_token
+    assert _refresh(client, refresh_token).status_code == 401  # the old one stopped working
+    assert _refresh(client, new_token).status_code == 200
+
+
+def test_concurrent_refreshes_with_one_token_rotate_it_once(client, make_user):
+    user_id, refresh_token = _login(client, make_user)
+
+    def rotate(_):
+        with SessionLocal() as db:
+            return crud_session.rotate_session(db, refresh_token=refresh_token)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(rotate, range(8)))
+    rotated = [result for result in results if result is not None]
+    assert len(rotated) == 1 and rotated[0][0] == user_id
+
+
+def test_expired_token_is_rejected_and_pruned(client, make_user):
+    user_id, refresh_token = _login(client, make_user)
+    with engine.begin() as conn:
+        conn.execute(update(models.AuthSession).where(models.AuthSession.user_id == user_id)
+                     .values(expires_at=datetime.now(timezone.utc) - timedelta(minutes=1)))
+    assert _refresh(client, refresh_token).status_code == 401
+
+    assert prune_expired_sessions() >= 1
+    with engine.connect() as conn:
+        assert conn.scalars(select(models.AuthSession.id).where(models.AuthSession.user_id == user_id)).all() == []
+
+
+def test_logout_ends_the_session(client, make_user):
+    _, refresh_token = _login(client, make_user)
+    response = client.post("/api/v1/auth/logout", json={"refresh_token": refresh_token})
+    assert response.status_code == 200, response.text
+    assert _refresh(client, refresh_token).status_code == 401
+    with engine.connect() as conn:
+        token_hash = crud_session._hash_token(refresh_token)
+        assert conn.scalar(select(models.AuthSession.id).where(models.AuthSession.token_hash == token_hash)) is None
+    # Logging out twice is harmless
+    assert client.post("/api/v1/auth/logout", json={"refresh_token": refresh_token}).status_code == 200
@@ -0,0 +1,72 @@
+# backend/tests/test_bulk.py
+
+"""
+Bulk create endpoints (api/bulk.py and the create_user_* crud functions):
+one INSERT ... RETURNING per batch, rows in input order and owned by the
+caller, and all-or-nothing validation with errors per item index.
+"""
+
+from app.core.config import settings
+
+MEDICATION = {
+    "name": "Metformin", "dosage": "500mg", "timing_type": "Meal-Related",
+    "meal_timing": "After Breakfast", "frequency_type": "Daily",
+}
+
+
+def _contacts(client, headers):
+    response = client.get("/api/v1/contacts/", headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_bulk_contacts_come_back_in_order_and_owned_by_the_caller(client, make_user):
+    user_id, headers = make_user()
+    other_id, _ = make_user()
+    items = [
+        {"contact_name": f"Contact {n}", "phone_number": f"98000000{n:02d}", "owner_id": other_id}
+        for n in range(5)
+    ]
+    response = client.post("/api/v1/contacts/bulk", headers=headers, json=items)
+    assert response.status_code == 201, response.text
+    created = response.json()
+    # owner_id in the body is ignored: everything belongs to the caller
+    assert [(row["contact_name"], row["owner_id"]) for row in created] == [(f"Contact {n}", user_id) for n in range(5)]
+    assert len({row["id"] for row in created}) == 5
+    assert _contacts(client, headers) == created
+
+
+def test_bulk_with_invalid_items_creates_nothing(client, make_user):
+    _, headers = make_user()
+    items = [
+        MEDICATION,
+        {**MEDICATION, "dosage": None},  # schema error
+        MEDICATION,
+        {**MEDICATION, "timing_type": "Specific-Time"},  # rule from POST / (no specific_time)
+    ]
+    response = client.post("/api/v1/medications/bulk", headers=headers, json=items)
+    assert response.status_code == 422, response.text
+    detail = response.json()["detail"]
+    assert detail["msg"] == "2 of 4 items are invalid; nothing was created."
+    assert [error["index"] for error in detail["errors"]] == [1, 3]
+    assert detail["errors"][1]["errors"] == ["Specific time is required for this timing type."]
+    assert client.get("/api/v1/medications/", headers=headers).json() == []
+
+
+def test_bulk_list_length_is_limited(client, make_user, monkeypatch):
+    _, headers = make_user()
+    assert client.post("/api/v1/contacts/bulk", headers=headers, json=[]).status_code == 422
+    too_many = [{"contact_name": "C", "phone_number": "1"}] * (settings.BULK_CREATE_MAX_ITEMS + 1)
+    assert client.post("/api/v1/contacts/bulk", headers=headers, json=too_many).status_code == 422
+    assert _contacts(client, headers) == []
+
+
+def test_bulk_appointments_show_on_the_dashboard(client, make_user):
+    _, headers = make_user()
+    assert client.get("/api/v1/dashboard/", headers=headers).json()["appointments"]["upcoming"] == []  # cached now
+    items = [
+        {"doctor_name": f"Dr. {n}", "appointment_datetime": f"2030-0{n + 1}-01T10:00:00Z"} for n in range(3)
+    ]
+    assert client.post("/api/v1/appointments/bulk", headers=headers, json=items).status_code == 201
+    upcoming = client.get("/api/v1/dashboard/", headers=headers).json()["appointments"]["upcoming"]
+    assert [appointment["doctor_name"] for appointment in upcoming] == ["Dr. 0", "Dr. 1", "Dr. 2"]
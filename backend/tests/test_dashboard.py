@@ -0,0 +1,157 @@
+# backend/tests/test_dashboard.py
+
+"""
+The dashboard asks the database only for today's IST window (and the
+bitmaps for adherence), so five years of history must give the same payload
+as scanning everything and converting each timestamp to IST, without the
+request getting slower.
+"""
+
+import statistics
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import insert, update
+
+from app.crud.crud_adherence import adherence_history_cache
+from app.db import models
+from app.db.database import engine
+from app.utils.adherence import IST, bitmaps_from_logs, ist_date, ist_day_bounds
+from app.utils.dashboard_cache import DashboardCache, dashboard_cache
+
+MEDICATIONS = [
+    {"name": "Metformin", "dosage": "500mg", "frequency_type": "Daily"},
+    {"name": "Vitamin D", "dosage": "1000IU", "frequency_type": "Weekly", "frequency_details": ["Monday", "Thursday"]},
+    {"name": "B12", "dosage": "1mg", "frequency_type": "Daily"},
+]
+
+
+def _create_medications(client, headers):
+    return [
+        client.post("/api/v1/medications/", headers=headers, json={
+            "timing_type": "Meal-Related", "meal_timing": "After Breakfast", **medication,
+        }).json()["id"]
+        for medication in MEDICATIONS
+    ]
+
+
+def _seed_history(owner_id, medication_ids, day_start):
+    """Five years of daily doses and weekly appointments before today, plus the IST-midnight edge cases."""
+    second = timedelta(seconds=1)
+    logs = [
+        (medication_ids[0], day_start - timedelta(days=day) + timedelta(hours=3)) for day in range(1, 5 * 365)
+    ] + [
+        (medication_ids[1], day_start - timedelta(days=day) + timedelta(hours=10)) for day in range(1, 5 * 365, 3)
+    ] + [
+        (medication_ids[0], day_start),            # 00:00:00 IST today: taken today
+        (medication_ids[2], day_start - second),   # 23:59:59 IST yesterday: not today
+    ]
+    appointments = [
+        ("Past", day_start - timedelta(weeks=week)) for week in range(1, 5 * 52)
+    ] + [
+        ("Yesterday 23:59:59", day_start - second),
+        ("Today 00:00", day_start),
+        ("Today 23:59:59", day_start + timedelta(days=1) - second),
+        ("Tomorrow 00:00", day_start + timedelta(days=1)),
+        ("Next week", day_start + timedelta(days=7, hours=5)),
+    ]
+    with engine.begin() as conn:
+        # Added five years ago, like the history (days before created_at aren't scheduled)
+        conn.execute(
+            update(models.Medication).where(models.Medication.id.in_(medication_ids))
+            .values(created_at=day_start - timedelta(days=5 * 365))
+        )
+        conn.execute(insert(models.MedicationLog), [
+            {"owner_id": owner_id, "medication_id": medication_id, "taken_at": taken_at} for medication_id, taken_at in logs
+        ])
+        conn.execute(insert(models.MedicationAdherence), [
+            {"medication_id": medication_id, "month": month, "owner_id": owner_id, "taken_days": taken_days}
+            for (medication_id, month), (owner_id, taken_days)
+            in bitmaps_from_logs((medication_id, owner_id, taken_at) for medication_id, taken_at in logs).items()
+        ])
+        conn.execute(insert(models.Appointment), [
+            {"owner_id": owner_id, "doctor_name": doctor_name, "appointment_datetime": when}
+            for doctor_name, when in appointments
+        ])
+    return logs, appointments
+
+
+def _dashboard(client, headers, user_id):
+    dashboard_cache.invalidate(user_id)
+    adherence_history_cache.clear()
+    started = time.perf_counter()
+    response = client.get("/api/v1/dashboard/", headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json(), time.perf_counter() - started
+
+
+def test_five_years_of_history_same_payload(client, make_user):
+    user_id, headers = make_user()
+    medication_ids = _create_medications(client, headers)
+    today = datetime.now(IST).date()
+    day_start, _ = ist_day_bounds(today)
+    logs, appointments = _seed_history(user_id, medication_ids, day_start)
+
+    payload, _ = _dashboard(client, headers, user_id)
+
+    # What a scan of the whole history, converting every timestamp to IST, finds
+    taken_today = {medication_id for medication_id, taken_at in logs if ist_date(taken_at) == today}
+    todays = [name for name, when in sorted(appointments, key=lambda a: a[1]) if ist_date(when) == today]
+    upcoming = [name for name, when in sorted(appointments, key=lambda a: a[1]) if ist_date(when) >= today]
+
+    assert set(payload["medications_today"]["taken_ids"]) == taken_today == {medication_ids[0]}
+    assert [appt["doctor_name"] for appt in payload["appointments"]["today"]] == todays == ["Today 00:00", "Today 23:59:59"]
+    assert [appt["doctor_name"] for appt in payload["appointments"]["upcoming"]] == upcoming
+    assert upcoming[-2:] == ["Tomorrow 00:00", "Next week"] and "Yesterday 23:59:59" not in upcoming
+    assert payload["summary"]["personalized_message"].endswith("You have 2 appointment(s) today.")
+
+    due_today = {medication_ids[0], medication_ids[2]} | ({medication_ids[1]} if today.weekday() in (0, 3) else set())
+    assert {med["id"] for med in payload["medications_today"]["due_today"]} == due_today
+    # The adherence report sees the old history (the streak runs back to the start of it)
+    streaks = {med["medication_id"]: med["current_streak"] for med in payload["adherence"]["medications"]}
+    assert streaks[medication_ids[0]] > 365
+
+
+def test_history_length_does_not_slow_the_dashboard(client, make_user):
+    fresh_id, fresh_headers = make_user()
+    _create_medications(client, fresh_headers)
+    old_id, old_headers = make_user()
+    old_medication_ids = _create_medications(client, old_headers)
+    _seed_history(old_id, old_medication_ids, ist_day_bounds(datetime.now(IST).date())[0])
+
+    # Uncached (dashboard and adherence memo cleared) every time: the worst case
+    fresh = statistics.median(_dashboard(client, fresh_headers, fresh_id)[1] for _ in range(15))
+    old = statistics.median(_dashboard(client, old_headers, old_id)[1] for _ in range(15))
+    assert old < 3 * fresh + 0.02, (fresh, old)
+
+
+def test_cache_drops_a_payload_read_during_a_write():
+    cache = DashboardCache(maxsize=10, ttl=60)
+    today = date(2026, 10, 17)
+    version = cache.version(1)
+    cache.invalidate(1)  # a write commits while the payload is being read
+    cache.set(1, today, {"medications": "old"}, version)
+    assert cache.get(1, today) is None
+
+    version = cache.version(1)
+    cache.set(1, today, {"medications": "new"}, version)
+    assert cache.get(1, today) == {"medications": "new"}
+    # Another user's write doesn't matter
+    version = cache.version(2)
+    cache.invalidate(3)
+    cache.set(2, today, {"medications": "theirs"}, version)
+    assert cache.get(2, today) == {"medications": "theirs"}
+
+
+def test_cache_versions_are_bounded():
+    cache = DashboardCache(maxsize=100, ttl=60)
+    today = date(2026, 10, 17)
+    version = cache.version(1)
+    for owner_id in range(1000, 11000):
+        cache.invalidate(owner_id)
+    assert cache._versions.stats()["size"] == 100
+    # User 1's version was evicted during the read: nothing is stored, and a
+    # fresh version never matches the old one
+    cache.set(1, today, {"medications": "old"}, version)
+    assert cache.get(1, today) is None
+    assert cache.version(1) != version
@@ -0,0 +1,81 @@
+# backend/tests/test_export.py
+
+"""
+History export (GET /export/history, crud/crud_export.py): CSV and NDJSON
+content, only the caller's own records, and batches that don't change the file.
+"""
+
+import csv
+import io
+import json
+
+from app.api.v1.endpoints.export import EXPORT_FIELDS
+from app.core.config import settings
+
+
+def _history(client, make_user, full_name="Asha Rao"):
+    """A user with two doses of one medication and two appointments; returns their headers."""
+    _, headers = make_user(full_name)
+    medication = client.post("/api/v1/medications/", headers=headers, json={
+        "name": f"{full_name} pill", "dosage": "5mg", "timing_type": "Meal-Related",
+        "meal_timing": "After Breakfast", "frequency_type": "Daily",
+    })
+    assert medication.status_code == 201, medication.text
+    for _ in range(2):
+        taken = client.post(f"/api/v1/medications/{medication.json()['id']}/taken", headers=headers)
+        assert taken.status_code == 200, taken.text
+    for when, purpose in (("2030-01-02T04:30:00Z", "Checkup"), ("2030-03-04T10:00:00Z", None)):
+        appointment = client.post("/api/v1/appointments/", headers=headers, json={
+            "doctor_name": f"Dr. {full_name}", "appointment_datetime": when, "location": "Clinic", "purpose": purpose,
+        })
+        assert appointment.status_code == 201, appointment.text
+    return headers
+
+
+def _csv_rows(client, headers):
+    response = client.get("/api/v1/export/history", headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    assert response.headers["content-disposition"] == 'attachment; filename="health_history.csv"'
+    reader = csv.DictReader(io.StringIO(response.text))
+    assert reader.fieldnames == EXPORT_FIELDS
+    return list(reader)
+
+
+def test_csv_export_has_the_users_history(client, make_user):
+    headers = _history(client, make_user)
+    _history(client, make_user, "Ravi Kumar")  # someone else's history stays out
+
+    rows = _csv_rows(client, headers)
+    assert [row["record_type"] for row in rows] == ["medication_taken"] * 2 + ["appointment"] * 2
+    assert {(row["name"], row["dosage"]) for row in rows[:2]} == {("Asha Rao pill", "5mg")}
+    assert rows[2] == {
+        "record_type": "appointment", "datetime": "2030-01-02T10:00:00+05:30", "name": "Dr. Asha Rao",
+        "dosage": "", "location": "Clinic", "purpose": "Checkup",
+    }
+    assert rows[3]["datetime"] == "2030-03-04T15:30:00+05:30" and rows[3]["purpose"] == ""
+
+
+def test_ndjson_export_matches_csv(client, make_user):
+    headers = _history(client, make_user)
+    response = client.get("/api/v1/export/history", headers=headers, params={"format": "ndjson"})
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert all(list(record) == EXPORT_FIELDS for record in records)
+    # Same records as the CSV, with null where the CSV has an empty field
+    assert [{field: value or "" for field, value in record.items()} for record in records] == _csv_rows(client, headers)
+
+
+def test_export_in_small_batches_is_the_same_file(client, make_user, monkeypatch):
+    headers = _history(client, make_user)
+    whole = client.get("/api/v1/export/history", headers=headers).text
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 1)
+    assert client.get("/api/v1/export/history", headers=headers).text == whole
+
+
+def test_export_without_history_is_just_the_header(client, make_user):
+    _, headers = make_user()
+    assert client.get("/api/v1/export/history", headers=headers).text.splitlines() == [",".join(EXPORT_FIELDS)]
+    assert client.get("/api/v1/export/history", headers=headers, params={"format": "ndjson"}).text == ""
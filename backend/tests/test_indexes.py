@@ -0,0 +1,130 @@
+# backend/tests/test_indexes.py
+
+"""
+The owner-scoped hot queries (list endpoints, dashboard, export) must be index
+searches, never table scans (migrations 0003 and later). The SQL the endpoints
+actually send is captured and run through SQLite's EXPLAIN QUERY PLAN on a
+seeded, ANALYZEd dataset.
+"""
+
+import re
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import event, insert, text
+
+from app.db import models
+from app.db.database import async_engine, engine
+from app.utils.dashboard_cache import dashboard_cache
+
+OWNER_TABLES = ("medications", "medication_logs", "appointments", "emergency_contacts", "medication_adherence")
+
+
+@pytest.fixture(scope="module")
+def seeded():
+    """300 other users with a few months of data each, so the planner has something to choose from."""
+    now = datetime.utcnow().replace(microsecond=0)
+    with engine.begin() as conn:
+        user_ids = conn.execute(insert(models.User).returning(models.User.id), [
+            {"email": f"seed{i}@example.com", "full_name": f"Seed {i}", "hashed_password": "x"} for i in range(300)
+        ]).scalars().all()
+        medication_ids = conn.execute(insert(models.Medication).returning(models.Medication.id, models.Medication.owner_id), [
+            {"owner_id": user_id, "name": f"M{n}", "dosage": "1", "timing_type": "Meal-Related", "frequency_type": "Daily"}
+            for user_id in user_ids for n in range(10)
+        ]).all()
+        conn.execute(insert(models.MedicationLog), [
+            {"owner_id": owner_id, "medication_id": medication_id, "taken_at": now - timedelta(days=day)}
+            for medication_id, owner_id in medication_ids for day in range(10)
+        ])
+        conn.execute(insert(models.MedicationAdherence), [
+            {"owner_id": owner_id, "medication_id": medication_id, "month": date(2026, month, 1), "taken_days": 1}
+            for medication_id, owner_id in medication_ids for month in (7, 8, 9)
+        ])
+        conn.execute(insert(models.Appointment), [
+            {"owner_id": user_id, "doctor_name": f"D{n}", "appointment_datetime": now + timedelta(days=n - 5)}
+            for user_id in user_ids for n in range(10)
+        ])
+        conn.execute(insert(models.EmergencyContact), [
+            {"owner_id": user_id, "contact_name": f"C{n}", "phone_number": "1"} for user_id in user_ids for n in range(3)
+        ])
+        conn.execute(text("ANALYZE"))
+
+
+def _capture(run):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        run()
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    return statements
+
+
+def _plan(statement, parameters):
+    with engine.connect() as conn:
+        return [row[-1] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)]
+
+
+def test_owner_scoped_queries_use_indexes(client, make_user, seeded):
+    user_id, headers = make_user()
+    medication = client.post("/api/v1/medications/", headers=headers, json={
+        "name": "Metformin", "dosage": "500mg", "timing_type": "Meal-Related",
+        "meal_timing": "After Breakfast", "frequency_type": "Daily",
+    }).json()
+    client.post(f"/api/v1/medications/{medication['id']}/taken", headers=headers)
+    client.post("/api/v1/contacts/", headers=headers, json={"contact_name": "Ravi", "phone_number": "98765"})
+    for day in range(3):
+        client.post("/api/v1/appointments/", headers=headers, json={
+            "doctor_name": "Mehta", "appointment_datetime": f"2030-01-0{day + 1}T10:00:00Z",
+        })
+
+    def hot_reads():
+        dashboard_cache.invalidate(user_id)
+        for path, params in [
+            ("/api/v1/medications/", {"limit": 2}),
+            ("/api/v1/appointments/", {"limit": 2}),
+            ("/api/v1/appointments/", {"start": "2030-01-02T00:00:00Z", "end": "2030-01-03T00:00:00Z"}),
+            ("/api/v1/contacts/", {}),
+            ("/api/v1/dashboard/", {}),
+            (f"/api/v1/medications/{medication['id']}/adherence", {}),
+            ("/api/v1/export/history", {}),
+        ]:
+            assert client.get(path, headers=headers, params=params).status_code == 200, path
+        # The next page of the appointments list (keyset cursor)
+        first = client.get("/api/v1/appointments/", headers=headers, params={"limit": 1})
+        client.get("/api/v1/appointments/", headers=headers, params={"limit": 1, "cursor": first.headers["x-next-cursor"]})
+
+    plans = {}
+    for statement, parameters in _capture(hot_reads):
+        tables = [table for table in OWNER_TABLES if re.search(rf"\bFROM {table}\b", statement)]
+        if statement.lstrip().upper().startswith("SELECT") and tables:
+            plans[statement] = _plan(statement, parameters)
+
+    for statement, plan in plans.items():
+        for line in plan:
+            assert not re.match(rf"SCAN ({'|'.join(OWNER_TABLES)})\b", line), (line, statement)
+    used = {index for plan in plans.values() for line in plan for index in re.findall(r"INDEX (\w+)", line)}
+    assert {
+        "ix_medications_owner_id_id",
+        "ix_appointments_owner_id_appointment_datetime_id",
+        "ix_emergency_contacts_owner_id_id",
+        "ix_medication_adherence_owner_id_month",
+        "ix_medication_logs_owner_id_taken_at",
+    } <= used, used
+
+
+def test_list_queries_need_no_sort(client, make_user, seeded):
+    """Keyset pages come out of the index in order: no temp B-tree for ORDER BY."""
+    _, headers = make_user()
+
+    def lists():
+        for path in ("/api/v1/medications/", "/api/v1/appointments/", "/api/v1/contacts/"):
+            assert client.get(path, headers=headers, params={"limit": 5}).status_code == 200
+
+    for statement, parameters in _capture(lists):
+        if statement.lstrip().upper().startswith("SELECT") and "ORDER BY" in statement:
+            assert not any("TEMP B-TREE" in line for line in _plan(statement, parameters)), statement
@@ -0,0 +1,39 @@
+# backend/tests/test_internal_metrics.py
+
+"""
+Access to /internal/metrics (deps.require_metrics_token): hidden without a
+configured token, 401 without the right X-Metrics-Token header.
+"""
+
+import pytest
+
+from app.core.config import settings
+
+METRICS = "/api/v1/internal/metrics"
+
+
+@pytest.fixture
+def metrics_token(monkeypatch):
+    monkeypatch.setattr(settings, "INTERNAL_METRICS_TOKEN", "metrics-secret")
+    return "metrics-secret"
+
+
+def test_metrics_do_not_exist_without_a_configured_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "INTERNAL_METRICS_TOKEN", None)
+    assert client.get(METRICS).status_code == 404
+    assert client.get(METRICS, headers={"X-Metrics-Token": "anything"}).status_code == 404
+
+
+@pytest.mark.parametrize("headers", [{}, {"X-Metrics-Token": "wrong"}, {"X-Metrics-Token": ""}])
+def test_metrics_need_the_right_token(client, metrics_token, headers):
+    response = client.get(METRICS, headers=headers)
+    assert response.status_code == 401
+    assert response.json() == {"detail": "Invalid metrics token"}
+
+
+def test_metrics_with_the_token(client, metrics_token):
+    response = client.get(METRICS, headers={"X-Metrics-Token": metrics_token})
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert {"user_cache", "token_cache", "tip_pool", "dashboard_cache", "db_pool", "read_replicas"} <= set(body)
+    assert body["db_pool"]["sync"]["checkouts"] > 0
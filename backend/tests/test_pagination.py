@@ -0,0 +1,142 @@
+# backend/tests/test_pagination.py
+
+"""Keyset pagination of the list endpoints (api/pagination.py)."""
+
+import base64
+import statistics
+import time
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, insert, select
+
+from app.api.pagination import decode_cursor, encode_cursor
+from app.db import models
+from app.db.database import engine
+
+
+def _pages(client, path, headers, **params):
+    """Every page of a list endpoint: yields (rows, seconds taken)."""
+    cursor = None
+    while True:
+        started = time.perf_counter()
+        response = client.get(path, headers=headers, params={**params, **({"cursor": cursor} if cursor else {})})
+        elapsed = time.perf_counter() - started
+        assert response.status_code == 200, response.text
+        yield response.json(), elapsed
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            return
+
+
+def test_cursor_round_trip():
+    moment = datetime(2030, 1, 2, 10, 30, 15, 250000)
+    assert decode_cursor(encode_cursor((moment, 42)), (datetime, int)) == (moment, 42)
+    assert decode_cursor(encode_cursor((3.141593, 7)), (float, int)) == (3.141593, 7)
+    assert decode_cursor(None, (int,)) is None
+    # URL-safe and without padding, so it can go in a query string as is
+    assert "=" not in encode_cursor((moment, 42))
+
+
+@pytest.mark.parametrize("cursor", [
+    "zzz",                                                      # not base64 of anything
+    "!!!not-base64!!!",
+    base64.urlsafe_b64encode(b"[1]").decode(),                  # one value, two expected
+    base64.urlsafe_b64encode(b'{"id": 1}').decode(),            # not a list
+    base64.urlsafe_b64encode(b'["yesterday", 1]').decode(),     # not a datetime
+])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, (datetime, int))
+    assert error.value.status_code == 400
+
+
+def test_malformed_cursor_returns_400(client, make_user):
+    _, headers = make_user()
+    for path in ("/api/v1/appointments/", "/api/v1/medications/", "/api/v1/contacts/", "/api/v1/tips/"):
+        response = client.get(path, headers=headers, params={"cursor": "zzz"})
+        assert response.status_code == 400, path
+        assert response.json()["detail"] == "Invalid pagination cursor."
+
+
+def test_appointment_pages_descending_across_ties(client, make_user):
+    """Latest first; rows sharing a datetime are split over a page boundary without gaps or repeats."""
+    _, headers = make_user()
+    times = ["2030-01-01T10:00:00Z"] * 3 + ["2030-01-02T10:00:00Z"] * 3 + ["2030-01-03T10:00:00Z"]
+    created = [
+        client.post("/api/v1/appointments/", headers=headers, json={"doctor_name": f"D{n}", "appointment_datetime": when}).json()
+        for n, when in enumerate(times)
+    ]
+    pages = [rows for rows, _ in _pages(client, "/api/v1/appointments/", headers, limit=2)]
+    assert [len(rows) for rows in pages] == [2, 2, 2, 1]
+    seen = [(row["appointment_datetime"], row["id"]) for rows in pages for row in rows]
+    assert seen == sorted(((row["appointment_datetime"], row["id"]) for row in created), reverse=True)
+    # The first page ends inside the 2030-01-02 group; the second picks up right after it
+    assert pages[0][-1]["appointment_datetime"] == pages[1][0]["appointment_datetime"]
+    assert pages[0][-1]["id"] > pages[1][0]["id"]
+
+
+def test_appointment_date_range_filter(client, make_user):
+    _, headers = make_user()
+    for day in (1, 2, 3):
+        client.post("/api/v1/appointments/", headers=headers, json={
+            "doctor_name": f"D{day}", "appointment_datetime": f"2030-01-0{day}T10:00:00Z",
+        })
+    response = client.get("/api/v1/appointments/", headers=headers, params={
+        "start": "2030-01-02T00:00:00Z", "end": "2030-01-03T00:00:00+00:00",
+    })
+    assert [row["doctor_name"] for row in response.json()] == ["D2"]
+
+
+def test_paging_through_100k_tips_has_flat_latency(client, make_user):
+    _, headers = make_user()
+    with engine.begin() as conn:
+        conn.execute(insert(models.HealthTip), [
+            {"tip_text": f"tip number {n}", "category": "Diet" if n % 3 == 0 else "General"} for n in range(100_000)
+        ])
+        total = conn.scalar(select(func.count()).select_from(models.HealthTip))
+        diet_total = conn.scalar(select(func.count()).where(models.HealthTip.category == "Diet"))
+
+    ids, latencies = [], []
+    for rows, elapsed in _pages(client, "/api/v1/tips/", headers, limit=500):
+        ids += [row["id"] for row in rows]
+        latencies.append(elapsed)
+    assert len(ids) == total and ids == sorted(set(ids))
+
+    # A page deep in the table costs about what the first one does (no OFFSET scan).
+    first, last = statistics.median(latencies[:20]), statistics.median(latencies[-20:])
+    assert last < 2 * first + 0.005, (first, last)
+
+    # Category filter pages the same way
+    diet = [row for rows, _ in _pages(client, "/api/v1/tips/", headers, limit=500, category="Diet") for row in rows]
+    assert len(diet) == diet_total and {row["category"] for row in diet} == {"Diet"}
+
+
+def test_tip_search_pages_survive_tip_pool_changes(client, make_user):
+    _, headers = make_user()
+
+    def add_tip(text):
+        response = client.post("/api/v1/tips/", headers=headers, json={"tip_text": text, "category": "General"})
+        assert response.status_code == 201, response.text
+        return response.json()["id"]
+
+    # "quokka" 3, 3, 2, 2, 1, 1 times: ranked by how often it appears, ties by id
+    matches = [add_tip(f"Tip {'quokka ' * times}number {n}") for n, times in enumerate((3, 3, 2, 2, 1, 1))]
+
+    def page(cursor=None):
+        response = client.get("/api/v1/tips/search", headers=headers,
+                              params={"q": "quokka", "limit": 2, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200, response.text
+        return [row["id"] for row in response.json()], response.headers.get("x-next-cursor")
+
+    seen, cursor = page()
+    assert seen == matches[:2]
+    # The pool changes between pages: unrelated tips come in, an unseen match goes
+    for n in range(20):
+        add_tip(f"Unrelated tip number {n}")
+    assert client.delete(f"/api/v1/tips/{matches[3]}", headers=headers).status_code == 200
+    while cursor:
+        ids, cursor = page(cursor)
+        seen += ids
+    assert seen == [tip_id for tip_id in matches if tip_id != matches[3]]
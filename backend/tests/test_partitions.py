@@ -0,0 +1,125 @@
+# backend/tests/test_partitions.py
+
+"""
+Monthly partition upkeep of medication_logs (app/db/partitions.py). Needs
+Postgres: set TEST_POSTGRES_URL to a database the tests may write to, e.g.
+
+    TEST_POSTGRES_URL=postgresql://postgres@localhost/health_test python -m pytest tests/test_partitions.py
+
+Each test works in its own scratch schema (first on the search_path), with
+a minimal partitioned medication_logs and its DEFAULT partition, and drops
+it afterwards. The other tests run on SQLite, where partitioning is a no-op.
+"""
+
+import os
+import uuid
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.db.partitions import (
+    ARCHIVE_SCHEMA, LOG_TABLE, apply_retention, attached_months, ensure_partitions, is_partitioned, partition_name,
+)
+
+TEST_POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+
+pytestmark = pytest.mark.skipif(not TEST_POSTGRES_URL, reason="needs TEST_POSTGRES_URL (a Postgres database)")
+
+
+@pytest.fixture
+def connection():
+    engine = create_engine(TEST_POSTGRES_URL)
+    schema = f"partitions_test_{uuid.uuid4().hex[:12]}"
+    with engine.connect() as conn:
+        conn.execute(text(f"CREATE SCHEMA {schema}"))
+        conn.execute(text(f"SET search_path TO {schema}"))
+        conn.execute(text(f"""
+            CREATE TABLE {LOG_TABLE} (
+                id SERIAL,
+                medication_id INTEGER,
+                owner_id INTEGER,
+                taken_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                PRIMARY KEY (id, taken_at)
+            ) PARTITION BY RANGE (taken_at)
+        """))
+        conn.execute(text(f"CREATE TABLE {LOG_TABLE}_default PARTITION OF {LOG_TABLE} DEFAULT"))
+        conn.commit()
+        try:
+            yield conn
+        finally:
+            conn.rollback()
+            conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+            conn.commit()
+    engine.dispose()
+
+
+def _add_logs(connection, *taken_at):
+    """Inserts one log per timestamp; returns their ids."""
+    insert = text(f"INSERT INTO {LOG_TABLE} (medication_id, owner_id, taken_at) VALUES (1, 1, :taken_at) RETURNING id")
+    return [connection.execute(insert, {"taken_at": moment}).scalar() for moment in taken_at]
+
+
+def _rows_by_partition(connection):
+    """{partition name: [log ids]} for every medication_logs row."""
+    rows = connection.execute(text(f"SELECT tableoid::regclass::text, id FROM {LOG_TABLE} ORDER BY id")).all()
+    partitions = {}
+    for name, log_id in rows:
+        partitions.setdefault(name, []).append(log_id)
+    return partitions
+
+
+def test_new_partition_takes_the_rows_from_the_default_partition(connection):
+    assert is_partitioned(connection) and attached_months(connection) == []
+    january = _add_logs(connection, datetime(2001, 1, 1, 0, 0), datetime(2001, 1, 31, 23, 59, 59))
+    february = _add_logs(connection, datetime(2001, 2, 14, 8, 30))
+    march = _add_logs(connection, datetime(2001, 3, 1, 0, 0))
+    assert _rows_by_partition(connection) == {f"{LOG_TABLE}_default": january + february + march}
+
+    created = ensure_partitions(connection, date(2001, 1, 1), date(2001, 2, 1))
+
+    assert created == [partition_name(date(2001, 1, 1)), partition_name(date(2001, 2, 1))]
+    assert attached_months(connection) == [date(2001, 1, 1), date(2001, 2, 1)]
+    # Same rows and ids, now in their month's partition; March has none yet
+    assert _rows_by_partition(connection) == {
+        f"{LOG_TABLE}_y2001m01": january, f"{LOG_TABLE}_y2001m02": february, f"{LOG_TABLE}_default": march,
+    }
+    # New logs of those months go straight to the partition, and running it again changes nothing
+    _add_logs(connection, datetime(2001, 2, 28, 12, 0))
+    assert ensure_partitions(connection, date(2001, 1, 1), date(2001, 2, 1)) == []
+    assert _rows_by_partition(connection)[f"{LOG_TABLE}_default"] == march
+
+
+@pytest.mark.parametrize("action", ["detach", "archive", "drop"])
+def test_retention_retires_old_months(connection, action):
+    ensure_partitions(connection, date(2001, 1, 1), date(2001, 6, 1))
+    _add_logs(connection, datetime(2001, 1, 10), datetime(2001, 2, 10), datetime(2001, 5, 10))
+    old = [partition_name(date(2001, 1, 1)), partition_name(date(2001, 2, 1))]
+    schema = connection.execute(text("SELECT current_schema()")).scalar()
+
+    try:
+        # Keep three months before June: March onwards stays attached
+        assert apply_retention(connection, date(2001, 6, 1), 3, action) == old
+        assert attached_months(connection) == [date(2001, month, 1) for month in range(3, 7)]
+        assert connection.execute(text(f"SELECT count(*) FROM {LOG_TABLE}")).scalar() == 1
+
+        tables = dict(connection.execute(text(
+            "SELECT table_name, table_schema FROM information_schema.tables WHERE table_name = ANY(:names) "
+            "AND table_schema IN (:schema, :archive)"
+        ), {"names": old, "schema": schema, "archive": ARCHIVE_SCHEMA}).all())
+        expected_schema = {"detach": schema, "archive": ARCHIVE_SCHEMA}.get(action)
+        assert tables == ({name: expected_schema for name in old} if expected_schema else {})
+        if expected_schema:
+            # The retired months keep their rows
+            assert connection.execute(text(f"SELECT count(*) FROM {expected_schema}.{old[0]}")).scalar() == 1
+        assert apply_retention(connection, date(2001, 6, 1), 3, action) == []
+    finally:
+        if action == "archive":
+            for name in old:
+                connection.execute(text(f"DROP TABLE IF EXISTS {ARCHIVE_SCHEMA}.{name}"))
+            connection.commit()
+
+
+def test_unknown_retention_action_is_rejected(connection):
+    with pytest.raises(ValueError):
+        apply_retention(connection, date(2001, 6, 1), 3, "shred")
@@ -0,0 +1,95 @@
+# backend/tests/test_pool.py
+
+"""
+Connection pool options and the idle pre-ping (db/pool.py), on a scratch
+SQLite file with a fake clock standing in for time.monotonic.
+"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+from app.db import pool
+from app.db.pool import PoolMetrics, instrument_engine, pool_options
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(pool, "time", SimpleNamespace(monotonic=lambda: now.value, perf_counter=time.perf_counter))
+    return now
+
+
+def _engine(tmp_path, mode, monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_PRE_PING_MODE", mode)
+    monkeypatch.setattr(settings, "DB_POOL_PRE_PING_IDLE_SECONDS", 30)
+    url = make_url(f"sqlite:///{tmp_path / 'pool.db'}")
+    metrics = PoolMetrics("test")
+    engine = create_engine(url, **pool_options(url, metrics))
+    instrument_engine(engine, metrics)
+    return engine, metrics
+
+
+def _select_one(engine):
+    with engine.connect() as connection:
+        return connection.execute(text("SELECT 1")).scalar()
+
+
+@pytest.mark.parametrize("mode, pre_ping", [("always", True), ("idle", False), ("off", False)])
+def test_pool_options_pre_ping(monkeypatch, mode, pre_ping):
+    monkeypatch.setattr(settings, "DB_POOL_PRE_PING_MODE", mode)
+    options = pool_options(make_url("sqlite:///pool.db"), PoolMetrics("test"))
+    assert options["pool_pre_ping"] is pre_ping
+    assert options["pool_size"] == settings.DB_POOL_SIZE
+
+
+def test_unknown_pre_ping_mode(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_PRE_PING_MODE", "sometimes")
+    with pytest.raises(ValueError):
+        pool_options(make_url("sqlite:///pool.db"), PoolMetrics("test"))
+
+
+def test_idle_connection_is_pinged_once(tmp_path, monkeypatch, clock):
+    engine, metrics = _engine(tmp_path, "idle", monkeypatch)
+    try:
+        _select_one(engine)
+        clock.value += 29  # recently used: no ping
+        _select_one(engine)
+        assert metrics.idle_pings == 0
+
+        clock.value += 31
+        _select_one(engine)
+        _select_one(engine)  # used again just now
+        assert (metrics.idle_pings, metrics.failed_pings, metrics.connects) == (1, 0, 1)
+    finally:
+        engine.dispose()
+
+
+def test_dead_idle_connection_is_replaced(tmp_path, monkeypatch, clock):
+    engine, metrics = _engine(tmp_path, "idle", monkeypatch)
+    try:
+        with engine.connect() as connection:
+            dead = connection.connection.dbapi_connection
+        dead.close()  # like a server or proxy closing an idle connection
+
+        clock.value += 60
+        assert _select_one(engine) == 1  # the caller never sees the dead connection
+        assert (metrics.idle_pings, metrics.failed_pings, metrics.connects) == (1, 1, 2)
+        assert metrics.invalidations == 1
+    finally:
+        engine.dispose()
+
+
+def test_off_mode_never_pings(tmp_path, monkeypatch, clock):
+    engine, metrics = _engine(tmp_path, "off", monkeypatch)
+    try:
+        _select_one(engine)
+        clock.value += 3600
+        _select_one(engine)
+        assert metrics.idle_pings == 0
+    finally:
+        engine.dispose()
@@ -0,0 +1,77 @@
+# backend/tests/test_query_counts.py
+
+"""
+Round trips per write endpoint (db/unit_of_work.py): each user action is
+INSERT/UPDATE ... RETURNING plus one COMMIT, with no SELECT to reload the row.
+The auth caches are warmed first, so only the endpoint's own queries count.
+"""
+
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from app.db.database import async_engine
+
+MEDICATION = {
+    "name": "Metformin", "dosage": "500mg", "timing_type": "Meal-Related",
+    "meal_timing": "After Breakfast", "frequency_type": "Daily",
+}
+
+
+@contextmanager
+def count_queries():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _warm_up(client, headers):
+    assert client.get("/api/v1/medications/", headers=headers).status_code == 200
+
+
+@pytest.mark.parametrize("path, payload, table", [
+    ("/api/v1/medications/", MEDICATION, "MEDICATIONS"),
+    ("/api/v1/appointments/", {"doctor_name": "Mehta", "appointment_datetime": "2030-01-01T10:00:00Z"}, "APPOINTMENTS"),
+    ("/api/v1/contacts/", {"contact_name": "Ravi", "phone_number": "9876543210"}, "EMERGENCY_CONTACTS"),
+])
+def test_create_is_one_insert(client, make_user, path, payload, table):
+    _, headers = make_user()
+    _warm_up(client, headers)
+    with count_queries() as statements:
+        response = client.post(path, headers=headers, json=payload)
+    assert response.status_code == 201, response.text
+    assert len(statements) == 1, statements
+    assert statements[0].lstrip().upper().startswith(f"INSERT INTO {table}")
+    assert "RETURNING" in statements[0].upper()
+
+
+def test_update_medication_is_one_update(client, make_user):
+    _, headers = make_user()
+    medication = client.post("/api/v1/medications/", headers=headers, json=MEDICATION).json()
+    _warm_up(client, headers)
+    with count_queries() as statements:
+        response = client.put(f"/api/v1/medications/{medication['id']}", headers=headers, json={"dosage": "850mg"})
+    assert response.status_code == 200, response.text
+    assert response.json()["dosage"] == "850mg"
+    assert len(statements) == 1, statements
+    assert statements[0].lstrip().upper().startswith("UPDATE MEDICATIONS")
+
+
+def test_mark_taken_writes_in_one_transaction(client, make_user):
+    _, headers = make_user()
+    medication = client.post("/api/v1/medications/", headers=headers, json=MEDICATION).json()
+    _warm_up(client, headers)
+    with count_queries() as statements:
+        response = client.post(f"/api/v1/medications/{medication['id']}/taken", headers=headers)
+    assert response.status_code == 200, response.text
+    kinds = [" ".join(statement.split()[:3]).upper() for statement in statements]
+    # last_taken_at (owner-scoped, RETURNING the row), the log row and the adherence bit; no reloads.
+    assert kinds == ["UPDATE MEDICATIONS SET", "INSERT INTO MEDICATION_LOGS", "INSERT INTO MEDICATION_ADHERENCE"]
@@ -0,0 +1,144 @@
+# backend/tests/test_rate_limit.py
+
+"""
+The auth rate limiter (core/rate_limit.py): per-IP and per-email token
+buckets, 429 with Retry-After, the 413 for oversized bodies, and the body
+reaching the endpoint after the middleware has read it. Runs on a small
+app with an in-memory store and a fake clock, not the real login.
+"""
+
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.rate_limit import BucketPolicy, MemoryRateLimitStore, RateLimitMiddleware
+
+LOGIN = "/api/v1/auth/login/access-token"
+FORGOT = "/api/v1/auth/forgot-password"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def store(clock):
+    return MemoryRateLimitStore(clock=clock)
+
+
+@pytest.fixture
+def limited(store, monkeypatch):
+    """A client for an app whose endpoints echo the body they got: 3/IP (1 per second back), 2/email (1 per 10 s)."""
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUST_FORWARDED_FOR", True)
+    app = FastAPI()
+
+    async def echo(request: Request):
+        return {"body": (await request.body()).decode()}
+
+    for path in (LOGIN, FORGOT, "/api/v1/users/"):
+        app.post(path)(echo)
+    app.add_middleware(
+        RateLimitMiddleware, store=store, paths=(LOGIN, FORGOT),
+        ip_policy=BucketPolicy(capacity=3, refill_per_minute=60), email_policy=BucketPolicy(capacity=2, refill_per_minute=6),
+    )
+    return TestClient(app)
+
+
+def _login(client, email, ip="10.0.0.1"):
+    return client.post(LOGIN, data={"username": email, "password": "x"}, headers={"X-Forwarded-For": ip})
+
+
+def test_per_ip_limit(limited, clock):
+    statuses = [_login(limited, f"user{n}@example.com").status_code for n in range(4)]
+    assert statuses == [200, 200, 200, 429]
+    # Other IPs have their own bucket
+    assert _login(limited, "user9@example.com", ip="10.0.0.2").status_code == 200
+
+    clock.advance(1)  # one token back
+    assert _login(limited, "user5@example.com").status_code == 200
+    assert _login(limited, "user6@example.com").status_code == 429
+
+
+def test_per_email_limit_across_ips(limited, clock):
+    # Case and surrounding spaces don't make a new bucket; JSON (forgot-password) has its own path
+    emails = ["asha@example.com", " Asha@Example.com", "ASHA@example.com"]
+    statuses = [_login(limited, email, ip=f"10.1.0.{n}").status_code for n, email in enumerate(emails)]
+    assert statuses == [200, 200, 429]
+    assert limited.post(FORGOT, json={"email": "asha@example.com"}).status_code == 200
+
+    clock.advance(10)
+    assert _login(limited, "asha@example.com", ip="10.1.0.9").status_code == 200
+
+
+def test_429_has_retry_after(limited, clock):
+    for n in range(2):
+        _login(limited, "ravi@example.com", ip=f"10.2.0.{n}")
+    response = _login(limited, "ravi@example.com", ip="10.2.0.9")
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "10"  # 1 token at 6 per minute
+    assert response.json() == {"detail": "Too many requests. Please try again later."}
+
+    clock.advance(7.5)
+    assert _login(limited, "ravi@example.com", ip="10.2.0.9").headers["retry-after"] == "3"  # rounded up
+
+    for n in range(3):
+        _login(limited, f"other{n}@example.com", ip="10.3.0.1")
+    assert _login(limited, "other9@example.com", ip="10.3.0.1").headers["retry-after"] == "1"
+
+
+def test_body_over_the_limit_gets_413(limited):
+    big = "x" * (RateLimitMiddleware.MAX_BODY_BYTES + 1)
+    response = limited.post(LOGIN, data={"username": "big@example.com", "password": big})
+    assert response.status_code == 413
+    # Not limited paths aren't read by the middleware at all
+    assert limited.post("/api/v1/users/", content=big).status_code == 200
+
+
+def test_streamed_body_is_cut_off_at_the_limit():
+    """Without a Content-Length, reading stops as soon as the body is over the limit."""
+    chunks = [b"x" * 40_000, b"x" * 40_000, b"never read"]
+    messages = iter({"type": "http.request", "body": chunk, "more_body": True} for chunk in chunks)
+    read = []
+
+    async def receive():
+        message = next(messages)
+        read.append(message["body"])
+        return message
+
+    body = asyncio.run(RateLimitMiddleware._read_body({"headers": []}, receive, RateLimitMiddleware.MAX_BODY_BYTES))
+    assert body is None and len(read) == 2
+
+
+def test_endpoint_gets_the_buffered_body(limited):
+    form = _login(limited, "meera@example.com")
+    assert form.status_code == 200
+    assert form.json()["body"] == "username=meera%40example.com&password=x"
+
+    payload = {"email": "meera@example.com", "note": "x" * 1000}
+    response = limited.post(FORGOT, json=payload, headers={"X-Forwarded-For": "10.4.0.1"})
+    assert response.status_code == 200 and json.loads(response.json()["body"]) == payload
+
+
+def test_idle_buckets_are_evicted(store, clock):
+    policy = BucketPolicy(capacity=2, refill_per_minute=60)
+    assert asyncio.run(store.consume("ip:a", policy)) == (True, 0.0)
+    clock.advance(1)
+    assert store.evict_idle() == 0  # half full
+    clock.advance(1)
+    assert store.evict_idle() == 1
@@ -0,0 +1,103 @@
+# backend/tests/test_recurrence.py
+
+"""Medication schedules compiled into Recurrence rules (utils/recurrence.py)."""
+
+from datetime import date, datetime, timedelta
+
+from app.utils.adherence import IST
+from app.utils.recurrence import DAILY, NEVER, Recurrence, ScheduleIndex, compile_recurrence
+
+
+def _days(first: date, last: date):
+    return [first + timedelta(days=n) for n in range((last - first).days + 1)]
+
+
+def test_weekly_rule_is_a_weekday_mask():
+    rule = compile_recurrence("Weekly", ["Monday", "Thursday", "Funday", 3])
+    assert rule == Recurrence(weekdays=0b0001001)
+
+    first, last = date(2026, 9, 27), date(2026, 10, 17)  # starts on a Sunday, so the mask has to wrap
+    expected = [day for day in _days(first, last) if day.weekday() in (0, 3)]
+    assert [day for day in _days(first, last) if rule.is_due(day)] == expected
+    assert rule.occurrences(first, last) == expected
+    assert compile_recurrence("Weekly", []) == compile_recurrence("Weekly", "Monday") == NEVER
+
+
+def test_daily_and_unscheduled_rules():
+    first, last = date(2026, 1, 1), date(2026, 12, 31)
+    assert compile_recurrence("Daily") == DAILY
+    assert DAILY.occurrences(first, last) == _days(first, last)
+    for frequency_type, details in (("As Needed", None), ("Monthly", 0), ("Monthly", 32), ("Monthly", "15"), (None, None)):
+        assert compile_recurrence(frequency_type, details) == NEVER
+    assert NEVER.day_bits(first, last) == 0
+
+
+def test_monthly_day_past_the_end_of_the_month_is_skipped():
+    on_31st = compile_recurrence("Monthly", 31)
+    assert on_31st.month_mask(date(2026, 2, 1)) == 0  # February has no 31st
+    assert on_31st.month_mask(date(2026, 4, 1)) == 0
+    assert on_31st.month_mask(date(2026, 3, 1)) == 1 << 30
+    assert on_31st.occurrences(date(2026, 1, 1), date(2026, 5, 31)) == [
+        date(2026, 1, 31), date(2026, 3, 31), date(2026, 5, 31)
+    ]
+    # 29th: only leap-year Februaries
+    on_29th = compile_recurrence("Monthly", 29)
+    assert on_29th.month_mask(date(2027, 2, 1)) == 0
+    assert on_29th.month_mask(date(2028, 2, 1)) == 1 << 28
+    assert not on_29th.is_due(date(2027, 3, 1))
+
+
+def test_day_bits_matches_is_due_across_months():
+    rules = [DAILY, NEVER, compile_recurrence("Weekly", ["Sunday"]), compile_recurrence("Monthly", 30),
+             Recurrence(weekdays=0b0100010, month_day=1)]
+    first, last = date(2027, 12, 20), date(2028, 3, 10)
+    for rule in rules:
+        bits = rule.day_bits(first, last)
+        assert [day for n, day in enumerate(_days(first, last)) if bits >> n & 1] == \
+            [day for day in _days(first, last) if rule.is_due(day)]
+    assert DAILY.day_bits(last, first) == 0
+
+
+def test_schedule_index_picks_the_medications_due_today():
+    rules = {
+        1: compile_recurrence("Daily"),
+        2: compile_recurrence("Weekly", ["Saturday"]),
+        3: compile_recurrence("Weekly", ["Monday"]),
+        4: compile_recurrence("Monthly", 17),
+        5: compile_recurrence("Monthly", 31),
+        6: compile_recurrence("As Needed"),
+    }
+    index = ScheduleIndex(rules)
+    for day in _days(date(2026, 10, 1), date(2026, 11, 30)):
+        assert index.due_on(day) == {medication_id for medication_id, rule in rules.items() if rule.is_due(day)}
+    assert index.due_on(date(2026, 10, 17)) == {1, 2, 4}  # a Saturday, the 17th
+    assert index.due_on(date(2026, 11, 30)) == {1, 3}  # a Monday, and November has no 31st
+    assert index.occurrences(date(2026, 10, 1), date(2026, 10, 31))[5] == [date(2026, 10, 31)]
+
+
+def test_dashboard_lists_medications_due_today(client, make_user):
+    _, headers = make_user()
+    today = datetime.now(IST).date()
+    other_weekday, other_day = (today + timedelta(days=1)).strftime("%A"), today.day % 28 + 1
+    schedules = {
+        "Daily": ("Daily", None, True),
+        "Weekly today": ("Weekly", [today.strftime("%A")], True),
+        "Weekly other day": ("Weekly", [other_weekday], False),
+        "Monthly today": ("Monthly", today.day, True),
+        "Monthly other day": ("Monthly", other_day, False),
+        "As needed": ("As Needed", None, False),
+    }
+    due = set()
+    for name, (frequency_type, details, is_due) in schedules.items():
+        response = client.post("/api/v1/medications/", headers=headers, json={
+            "name": name, "dosage": "1 tablet", "timing_type": "Meal-Related", "meal_timing": "After Breakfast",
+            "frequency_type": frequency_type, "frequency_details": details,
+        })
+        assert response.status_code in (200, 201), response.text
+        if is_due:
+            due.add(response.json()["id"])
+
+    medications_today = client.get("/api/v1/dashboard/", headers=headers).json()["medications_today"]
+    assert {med["id"] for med in medications_today["due_today"]} == due
+    # The old key, kept for a deprecation period, holds the same list
+    assert medications_today["all_daily"] == medications_today["due_today"]
@@ -0,0 +1,121 @@
+# backend/tests/test_replicas.py
+
+"""
+Read-replica routing (db/database.ReplicaRouter, read_session) with two
+SQLite files standing in for the replicas. Each replica gets a medication
+only it has, so the list response shows where a read went.
+"""
+
+import os
+import sqlite3
+
+import pytest
+
+from app.api.pagination import encode_cursor
+from app.db import database
+from app.db.database import ReplicaRouter, engine
+
+MEDICATION = {
+    "name": "Primary only", "dosage": "1", "timing_type": "Meal-Related",
+    "meal_timing": "After Breakfast", "frequency_type": "Daily",
+}
+
+
+def _copy_primary(path):
+    source, target = sqlite3.connect(engine.url.database), sqlite3.connect(path)
+    source.backup(target)
+    source.close()
+    return target
+
+
+@pytest.fixture
+def replicas(client, make_user, tmp_path, monkeypatch):
+    """Two replica files with the user's data plus a marker medication each; returns (router, user, headers, paths)."""
+    user_id, headers = make_user()
+    paths = [str(tmp_path / f"replica-{n}.db") for n in range(2)]
+    for n, path in enumerate(paths):
+        replica = _copy_primary(path)
+        replica.execute(
+            "INSERT INTO medications (name, dosage, timing_type, frequency_type, owner_id) VALUES (?, '1', 'Meal-Related', 'Daily', ?)",
+            (f"replica-{n}", user_id),
+        )
+        replica.commit()
+        replica.close()
+    router = ReplicaRouter([f"sqlite:///{path}" for path in paths])
+    monkeypatch.setattr(database, "replica_router", router)
+    yield router, user_id, headers, paths
+    client.portal.call(router.dispose)
+
+
+def _names(client, headers):
+    response = client.get("/api/v1/medications/", headers=headers)
+    assert response.status_code == 200, response.text
+    return [medication["name"] for medication in response.json()]
+
+
+def test_reads_round_robin_over_replicas(client, replicas):
+    router, _, headers, _ = replicas
+    seen = [_names(client, headers) for _ in range(4)]
+    assert seen == [["replica-0"], ["replica-1"], ["replica-0"], ["replica-1"]]
+    assert [replica.reads for replica in router.replicas] == [2, 2]
+    assert router.primary_reads == 0
+
+
+def test_reads_pinned_to_primary_after_a_write(client, make_user, replicas):
+    router, user_id, headers, _ = replicas
+    medication = client.post("/api/v1/medications/", headers=headers, json=MEDICATION).json()
+    # The writer reads its own write from the primary, not the (stale) replicas
+    assert _names(client, headers) == ["Primary only"]
+    assert client.post(f"/api/v1/medications/{medication['id']}/taken", headers=headers).status_code == 200
+    dashboard = client.get("/api/v1/dashboard/", headers=headers).json()
+    assert dashboard["medications_today"]["taken_ids"] == [medication["id"]]
+    assert router.primary_reads >= 2
+
+    # Someone who didn't write still reads from a replica
+    _, other_headers = make_user()
+    replica_reads = sum(replica.reads for replica in router.replicas)
+    client.get("/api/v1/medications/", headers=other_headers)
+    assert sum(replica.reads for replica in router.replicas) == replica_reads + 1
+
+
+def test_unhealthy_replica_drops_out_and_comes_back(client, replicas):
+    router, _, headers, paths = replicas
+    broken = paths[0]
+    os.rename(broken, broken + ".bak")
+    os.mkdir(broken)  # can't be opened as a database any more
+    try:
+        client.portal.call(router.check_health)
+        assert [replica.healthy for replica in router.replicas] == [False, True]
+        assert router.replicas[0].last_error
+        assert [_names(client, headers) for _ in range(3)] == [["replica-1"]] * 3
+    finally:
+        os.rmdir(broken)
+        os.rename(broken + ".bak", broken)
+
+    client.portal.call(router.check_health)
+    assert [replica.healthy for replica in router.replicas] == [True, True]
+    assert sorted(name for _ in range(2) for name in _names(client, headers)) == ["replica-0", "replica-1"]
+
+
+def test_all_replicas_down_reads_from_primary(client, replicas):
+    router, _, headers, _ = replicas
+    for replica in router.replicas:
+        replica.mark_unhealthy(RuntimeError("down"))
+    assert _names(client, headers) == []  # the primary has none of the replicas' markers
+    assert router.primary_reads == 1
+
+
+def test_sync_writes_pin_the_user_to_primary(client, make_user, replicas):
+    router, _, headers, _ = replicas
+    tip = client.post("/api/v1/tips/", headers=headers, json={"tip_text": "Only the primary has this tip.", "category": "General"})
+    assert tip.status_code == 201, tip.text
+    # The tips list comes from the primary, with the new tip in it
+    tips = client.get("/api/v1/tips/", headers=headers, params={"cursor": encode_cursor([tip.json()["id"] - 1])})
+    assert [row["id"] for row in tips.json()] == [tip.json()["id"]]
+    assert router.primary_reads == 1
+
+    # A profile update pins its user as well
+    _, other_headers = make_user()
+    assert client.put("/api/v1/users/me", headers=other_headers, json={"full_name": "Renamed User"}).status_code == 200
+    client.get("/api/v1/medications/", headers=other_headers)
+    assert router.primary_reads == 2
@@ -10,7 +10,7 @@ if project_root not in sys.path:
 
 import streamlit as st
 from streamlit_cookies_manager import CookieManager
-from auth.service import login_user, TOKEN_COOKIE_NAME
+from auth.service import login_user, start_auth_session, TOKEN_COOKIE_NAME
 from reset_password import draw_reset_page # <-- Humne helper function import kiya
 import time
 
@@ -61,7 +61,7 @@ else:
             if submitted:
                 is_success, data = login_user(email, password)
                 if is_success:
-                    cookies[TOKEN_COOKIE_NAME] = data.get("access_token")
+                    start_auth_session(cookies, data)
                     st.success("Login Successful!")
                     time.sleep(1)
                     st.rerun()
@@ -1,11 +1,100 @@
 # frontend/auth/service.py (FINAL, VERIFIED AND COMPLETE VERSION)
 
 import requests
+import streamlit as st
 from typing import List, Dict, Any
 
 # Define the base URL of your FastAPI backend
 BASE_URL = "https://health-companion-backend-44ug.onrender.com/api/v1"
 TOKEN_COOKIE_NAME = "senior_citizen_support_token"
+REFRESH_COOKIE_NAME = "senior_citizen_support_refresh_token"
+# List endpoints are paginated; the cursor of the next page comes in this header.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# --- TRANSPARENT TOKEN REFRESH ---
+# Access tokens expire quickly. When the backend answers 401, we exchange the
+# refresh token for a new pair and retry once, instead of sending the user back
+# to the login page (which costs a full password check on the server).
+# The latest tokens live in st.session_state; sync_auth_cookies() saves them to cookies.
+
+def start_auth_session(cookies, token_data: dict) -> None:
+    """ Stores the tokens from a login response in the session and in cookies. """
+    st.session_state["access_token"] = token_data.get("access_token")
+    st.session_state["refresh_token"] = token_data.get("refresh_token")
+    sync_auth_cookies(cookies)
+
+def clear_auth_session(cookies) -> None:
+    """ Forgets both tokens (used on logout). """
+    st.session_state.pop("access_token", None)
+    st.session_state.pop("refresh_token", None)
+    for cookie_name in (TOKEN_COOKIE_NAME, REFRESH_COOKIE_NAME):
+        if cookies.get(cookie_name):
+            del cookies[cookie_name]
+
+def sync_auth_cookies(cookies) -> None:
+    """ Keeps the session tokens and the browser cookies in step. """
+    if "refresh_token" not in st.session_state and cookies.get(REFRESH_COOKIE_NAME):
+        st.session_state["refresh_token"] = cookies.get(REFRESH_COOKIE_NAME)
+    changed = False
+    for cookie_name, state_key in ((TOKEN_COOKIE_NAME, "access_token"), (REFRESH_COOKIE_NAME, "refresh_token")):
+        value = st.session_state.get(state_key)
+        if value and cookies.get(cookie_name) != value:
+            cookies[cookie_name] = value
+            changed = True
+    if changed:
+        cookies.save()
+
+def _refresh_access_token() -> str | None:
+    """ Exchanges the stored refresh token for a new token pair. """
+    refresh_token = st.session_state.get("refresh_token")
+    if not refresh_token: return None
+    try:
+        response = requests.post(f"{BASE_URL}/auth/refresh", json={"refresh_token": refresh_token})
+    except requests.RequestException: return None
+    if response.status_code != 200:
+        # The refresh token was revoked or has expired; the user has to log in again.
+        st.session_state.pop("refresh_token", None)
+        return None
+    data = response.json()
+    st.session_state["access_token"] = data["access_token"]
+    st.session_state["refresh_token"] = data["refresh_token"]
+    return data["access_token"]
+
+def _authorized_request(method: str, url: str, token: str, **kwargs) -> requests.Response:
+    """ Sends a request with the bearer token, refreshing it once if it has expired. """
+    # A token refreshed earlier in this session is newer than the one the page read from the cookie.
+    token = st.session_state.get("access_token") or token
+    response = requests.request(method, url, headers={"Authorization": f"Bearer {token}"}, **kwargs)
+    if response.status_code == 401:
+        new_token = _refresh_access_token()
+        if new_token:
+            response = requests.request(method, url, headers={"Authorization": f"Bearer {new_token}"}, **kwargs)
+    return response
+
+def _get_all_pages(url: str, token: str, params: dict | None = None) -> tuple[requests.Response, list]:
+    """ GETs a paginated list endpoint, following the next-page cursors until the last page. """
+    params = dict(params or {})
+    items = []
+    while True:
+        response = _authorized_request("GET", url, token, params=params)
+        if response.status_code != 200: return response, items
+        items.extend(response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor: return response, items
+        params["cursor"] = cursor
+
+def _bulk_create(url: str, token: str, items: list, noun: str) -> tuple[bool, str]:
+    """ POSTs a list to a /bulk endpoint. All rows are added or none are; errors are reported per row. """
+    try:
+        response = _authorized_request("POST", url, token, json=items)
+        if response.status_code == 201: return True, f"Added {len(response.json())} {noun}."
+        detail = response.json().get("detail", f"Failed to add {noun}.")
+        if isinstance(detail, dict) and detail.get("errors"):
+            rows = [f"Row {e['index'] + 1}: {'; '.join(e['errors'])}" for e in detail["errors"]]
+            detail = "\n".join([detail.get("msg", "")] + rows)
+        elif isinstance(detail, list): detail = " ".join([d.get('msg', '') for d in detail])
+        return False, str(detail)
+    except requests.RequestException: return False, "Server communication error."
 
 # --- AUTHENTICATION & USER MANAGEMENT ---
 
@@ -54,41 +143,50 @@ def set_new_password(token: str, new_password: str) -> tuple[bool, str]:
 def get_dashboard_data(token: str) -> tuple[bool, dict | str]:
     """ Fetches the main dashboard data for the current user. """
     url = f"{BASE_URL}/dashboard/"
-    headers = {"Authorization": f"Bearer {token}"}
     try:
-        response = requests.get(url, headers=headers)
+        response = _authorized_request("GET", url, token)
         if response.status_code == 200: return True, response.json()
         else: return False, response.json().get("detail", "Authentication failed.")
     except requests.RequestException: return False, "Server communication error."
 
+def export_history(token: str, fmt: str = "csv") -> tuple[bool, bytes | str]:
+    """ Downloads the user's medication and appointment history (CSV or NDJSON), streamed in chunks. """
+    url = f"{BASE_URL}/export/history"
+    try:
+        response = _authorized_request("GET", url, token, params={"format": fmt}, stream=True)
+        if response.status_code == 200: return True, b"".join(response.iter_content(chunk_size=64 * 1024))
+        else: return False, response.json().get("detail", "Failed to export history.")
+    except requests.RequestException: return False, "Server communication error."
+
 # --- MEDICATIONS ---
 
 def get_medications(token: str) -> tuple[bool, List[Dict[str, Any]] | str]:
     """ Fetches all medications for the user. """
     url = f"{BASE_URL}/medications/"
-    headers = {"Authorization": f"Bearer {token}"}
     try:
-        response = requests.get(url, headers=headers)
-        if response.status_code == 200: return True, response.json()
+        response, items = _get_all_pages(url, token)
+        if response.status_code == 200: return True, items
         else: return False, response.json().get("detail", "Failed to fetch medications.")
     except requests.RequestException: return False, "Server communication error."
 
 def add_medication(token: str, payload: dict) -> tuple[bool, str]:
     """ Adds a new medication for the user. """
     url = f"{BASE_URL}/medications/"
-    headers = {"Authorization": f"Bearer {token}"}
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        response = _authorized_request("POST", url, token, json=payload)
         if response.status_code == 201: return True, "Medication added successfully!"
         else: return False, response.json().get("detail", "Failed to add medication.")
     except requests.RequestException: return False, "Server communication error."
 
+def add_medications_bulk(token: str, items: list) -> tuple[bool, str]:
+    """ Adds several medications in one request. """
+    return _bulk_create(f"{BASE_URL}/medications/bulk", token, items, "medications")
+
 def delete_medication(token: str, med_id: int) -> tuple[bool, str]:
     """ Deletes a medication for the user. """
     url = f"{BASE_URL}/medications/{med_id}"
-    headers = {"Authorization": f"Bearer {token}"}
     try:
-        response = requests.delete(url, headers=headers)
+        response = _authorized_request("DELETE", url, token)
         if response.status_code == 200: return True, "Medication deleted successfully."
         else: return False, response.json().get("detail", "Failed to delete medication.")
     except requests.RequestException: return False, "Server communication error."
@@ -96,9 +194,8 @@ def delete_medication(token: str, med_id: int) -> tuple[bool, str]:
 def mark_medication_as_taken(token: str, med_id: int) -> tuple[bool, str]:
     """ Marks a medication as taken by creating a log entry. """
     url = f"{BASE_URL}/medications/{med_id}/taken"
-    headers = {"Authorization": f"Bearer {token}"}
     try:
-        response = requests.post(url, headers=headers)
+        response = _authorized_request("POST", url, token)
         if response.status_code == 200: return True, "Medication marked as taken."
         else: return False, response.json().get("detail", "Failed to mark as taken.")
     except requests.RequestException: return False, "Server communication error."
@@ -108,19 +205,17 @@ def mark_medication_as_taken(token: str, med_id: int) -> tuple[bool, str]:
 def get_appointments(token: str) -> tuple[bool, List[Dict[str, Any]] | str]:
     """ Fetches all appointments for the user. """
     url = f"{BASE_URL}/appointments/"
-    headers = {"Authorization": f"Bearer {token}"}
     try:
-        response = requests.get(url, headers=headers)
-        if response.status_code == 200: return True, response.json()
+        response, items = _get_all_pages(url, token)
+        if response.status_code == 200: return True, items
         else: return False, response.json().get("detail", "Failed to fetch appointments.")
     except requests.RequestException: return False, "Server communication error."
 
 def add_appointment(token: str, payload: dict) -> tuple[bool, str]:
     """ Adds a new appointment for the user. """
     url = f"{BASE_URL}/appointments/"
-    headers = {"Authorization": f"Bearer {token}"}
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        response = _authorized_request("POST", url, token, json=payload)
         if response.status_code == 201: return True, "Appointment added successfully!"
         else:
             detail = response.json().get("detail", "Failed to add appointment.")
@@ -128,12 +223,15 @@ def add_appointment(token: str, payload: dict) -> tuple[bool, str]:
             return False, str(detail)
     except requests.RequestException: return False, "Server communication error."
 
+def add_appointments_bulk(token: str, items: list) -> tuple[bool, str]:
+    """ Adds several appointments in one request. """
+    return _bulk_create(f"{BASE_URL}/appointments/bulk", token, items, "appointments")
+
 def delete_appointment(token: str, appt_id: int) -> tuple[bool, str]:
     """ Deletes an appointment for the user. """
     url = f"{BASE_URL}/appointments/{appt_id}"
-    headers = {"Authorization": f"Bearer {token}"}
     try:
-        response = requests.delete(url, headers=headers)
+        response = _authorized_request("DELETE", url, token)
         if response.status_code == 200: return True, "Appointment deleted successfully."
         else: return False, response.json().get("detail", "Failed to delete appointment.")
     except requests.RequestException: return False, "Server communication error."
@@ -143,29 +241,30 @@ def delete_appointment(token: str, appt_id: int) -> tuple[bool, str]:
 def get_contacts(token: str) -> tuple[bool, List[Dict[str, Any]] | str]:
     """ Fetches all emergency contacts for the user. """
     url = f"{BASE_URL}/contacts/"
-    headers = {"Authorization": f"Bearer {token}"}
     try:
-        response = requests.get(url, headers=headers)
-        if response.status_code == 200: return True, response.json()
+        response, items = _get_all_pages(url, token)
+        if response.status_code == 200: return True, items
         else: return False, response.json().get("detail", "Failed to fetch contacts.")
     except requests.RequestException: return False, "Server communication error."
 
 def add_contact(token: str, payload: dict) -> tuple[bool, str]:
     """ Adds a new emergency contact for the user. """
     url = f"{BASE_URL}/contacts/"
-    headers = {"Authorization": f"Bearer {token}"}
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        response = _authorized_request("POST", url, token, json=payload)
         if response.status_code == 201: return True, "Contact added successfully!"
         else: return False, response.json().get("detail", "Failed to add contact.")
     except requests.RequestException: return False, "Server communication error."
 
+def add_contacts_bulk(token: str, items: list) -> tuple[bool, str]:
+    """ Adds several contacts in one request. """
+    return _bulk_create(f"{BASE_URL}/contacts/bulk", token, items, "contacts")
+
 def delete_contact(token: str, contact_id: int) -> tuple[bool, str]:
     """ Deletes an emergency contact for the user. """
     url = f"{BASE_URL}/contacts/{contact_id}"
-    headers = {"Authorization": f"Bearer {token}"}
     try:
-        response = requests.delete(url, headers=headers)
+        response = _authorized_request("DELETE", url, token)
         if response.status_code == 200: return True, "Contact deleted successfully."
         else: return False, response.json().get("detail", "Failed to delete contact.")
     except requests.RequestException: return False, "Server communication error."
@@ -175,9 +274,8 @@ def delete_contact(token: str, contact_id: int) -> tuple[bool, str]:
 def get_profile(token: str) -> tuple[bool, dict | str]:
     """ Fetches the profile for the current logged-in user. """
     url = f"{BASE_URL}/users/me"
-    headers = {"Authorization": f"Bearer {token}"}
     try:
-        response = requests.get(url, headers=headers)
+        response = _authorized_request("GET", url, token)
         if response.status_code == 200: return True, response.json()
         else: return False, response.json().get("detail", "Failed to fetch profile.")
     except requests.RequestException: return False, "Server communication error."
@@ -185,9 +283,8 @@ def get_profile(token: str) -> tuple[bool, dict | str]:
 def update_profile(token: str, payload: dict) -> tuple[bool, str]:
     """ Updates the current user's profile information. """
     url = f"{BASE_URL}/users/me"
-    headers = {"Authorization": f"Bearer {token}"}
     try:
-        response = requests.put(url, headers=headers, json=payload)
+        response = _authorized_request("PUT", url, token, json=payload)
         if response.status_code == 200: return True, "Profile updated successfully!"
         else: return False, response.json().get("detail", "Failed to update profile.")
     except requests.RequestException: return False, "Server communication error."
@@ -197,19 +294,28 @@ def update_profile(token: str, payload: dict) -> tuple[bool, str]:
 def get_all_tips(token: str) -> tuple[bool, List[Dict[str, Any]] | str]:
     """ Fetches all health tips from the database. """
     url = f"{BASE_URL}/tips/"
-    headers = {"Authorization": f"Bearer {token}"}
     try:
-        response = requests.get(url, headers=headers)
-        if response.status_code == 200: return True, response.json()
+        response, items = _get_all_pages(url, token)
+        if response.status_code == 200: return True, items
         else: return False, response.json().get("detail", "Failed to fetch tips.")
     except requests.RequestException: return False, "Server communication error."
 
+def search_tips(token: str, query: str, category: str | None = None, limit: int = 50) -> tuple[bool, List[Dict[str, Any]] | str]:
+    """ Full-text search over the health tips, most relevant first (only the first 'limit' results). """
+    url = f"{BASE_URL}/tips/search"
+    params = {"q": query, "limit": limit}
+    if category: params["category"] = category
+    try:
+        response = _authorized_request("GET", url, token, params=params)
+        if response.status_code == 200: return True, response.json()
+        else: return False, response.json().get("detail", "Failed to search tips.")
+    except requests.RequestException: return False, "Server communication error."
+
 def add_health_tip(token: str, payload: dict) -> tuple[bool, str]:
     """ Adds a new health tip to the database. """
     url = f"{BASE_URL}/tips/"
-    headers = {"Authorization": f"Bearer {token}"}
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        response = _authorized_request("POST", url, token, json=payload)
         if response.status_code == 201:
             return True, "Health tip added successfully!"
         else:
@@ -219,9 +325,8 @@ def add_health_tip(token: str, payload: dict) -> tuple[bool, str]:
 def delete_health_tip(token: str, tip_id: int) -> tuple[bool, str]:
     """ Deletes a specific health tip from the database. """
     url = f"{BASE_URL}/tips/{tip_id}"
-    headers = {"Authorization": f"Bearer {token}"}
     try:
-        response = requests.delete(url, headers=headers)
+        response = _authorized_request("DELETE", url, token)
         if response.status_code == 200: return True, "Tip deleted successfully."
         else: return False, response.json().get("detail", "Failed to delete tip.")
     except requests.RequestException: return False, "Server communication error."
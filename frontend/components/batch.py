@@ -0,0 +1,19 @@
+# frontend/components/batch.py
+
+import pandas as pd
+
+def empty_table(columns: list[str]) -> pd.DataFrame:
+    """ A blank table for st.data_editor(num_rows="dynamic"); rows are added by the user. """
+    return pd.DataFrame({column: pd.Series(dtype="object") for column in columns})
+
+def editor_rows(edited: pd.DataFrame) -> list[dict]:
+    """
+    Rows from an edited table as dicts, with empty cells as None.
+    Rows the user left completely blank are skipped.
+    """
+    rows = []
+    for row in edited.astype(object).to_dict("records"):
+        row = {k: (None if isinstance(v, str) and not v.strip() or pd.isna(v) else v) for k, v in row.items()}
+        if any(v is not None for v in row.values()):
+            rows.append(row)
+    return rows
@@ -1,7 +1,7 @@
 # frontend/components/sidebar.py (VERSION 2.0 - MODERN & BEHTREEN)
 
 import streamlit as st
-from auth.service import TOKEN_COOKIE_NAME
+from auth.service import sync_auth_cookies, clear_auth_session
 
 def authenticated_sidebar(cookies):
     """
@@ -57,6 +57,9 @@ def authenticated_sidebar(cookies):
     </style>
     """, unsafe_allow_html=True)
     
+    # Agar is session mein token refresh hua hai, toh naye tokens cookies mein save karo
+    sync_auth_cookies(cookies)
+
     # --- Sidebar Content ---
     with st.sidebar:
         # st.title("Navigation Menu")
@@ -83,9 +86,8 @@ def authenticated_sidebar(cookies):
         st.write("")
 
         if st.button("Logout", use_container_width=True, type="primary"):
-            # Agar cookie mein token hai, toh use delete kar do
-            if cookies.get(TOKEN_COOKIE_NAME):
-                del cookies[TOKEN_COOKIE_NAME]
+            # Access aur refresh, dono tokens ko session aur cookies se hata do
+            clear_auth_session(cookies)
             
             # User ko Home page par wapas bhej do
             st.switch_page("Home.py")
@@ -2,10 +2,9 @@
 
 import streamlit as st
 from streamlit_cookies_manager import CookieManager
-import requests # API calls ke liye zaroori hai
 
-# --- FIX: Galti se import kiye gaye functions ko hatana ---
-from auth.service import TOKEN_COOKIE_NAME
+# API calls auth.service se hoti hain, taaki expired token apne aap refresh ho jaaye
+from auth.service import TOKEN_COOKIE_NAME, get_all_tips, add_health_tip, delete_health_tip, search_tips
 from components.sidebar import authenticated_sidebar
 
 # --- 1. PAGE CONFIGURATION & AUTHENTICATION ---
@@ -23,49 +22,6 @@ if not token:
 
 authenticated_sidebar(cookies)
 
-# --- NAYA SECTION: API SERVICE FUNCTIONS (ERROR KA FIX) ---
-# Yeh functions aam taur par auth/service.py mein hone chahiye,
-# lekin error theek karne ke liye inhein yahan joda gaya hai.
-
-API_BASE_URL = "https://health-companion-backend-44ug.onrender.com" # Isko production mein settings se lena chahiye
-
-def get_all_tips(token: str):
-    """ Backend se saari health tips ko fetch karta hai. """
-    headers = {"Authorization": f"Bearer {token}"}
-    try:
-        response = requests.get(f"{API_BASE_URL}/api/v1/tips/", headers=headers)
-        if response.status_code == 200:
-            return True, response.json()
-        else:
-            return False, response.json().get("detail", "Unknown error")
-    except requests.exceptions.RequestException as e:
-        return False, f"Server communication error: {e}"
-
-def add_health_tip(token: str, payload: dict):
-    """ Backend mein ek nayi health tip add karta hai. """
-    headers = {"Authorization": f"Bearer {token}"}
-    try:
-        response = requests.post(f"{API_BASE_URL}/api/v1/tips/", headers=headers, json=payload)
-        # HTTP 201 ka matlab hai "Created" (safalta se ban gaya)
-        if response.status_code == 201:
-            return True, response.json()
-        else:
-            return False, response.json().get("detail", "Failed to add tip")
-    except requests.exceptions.RequestException as e:
-        return False, f"Server communication error: {e}"
-
-def delete_health_tip(token: str, tip_id: int):
-    """ Backend se ek specific health tip ko delete karta hai. """
-    headers = {"Authorization": f"Bearer {token}"}
-    try:
-        response = requests.delete(f"{API_BASE_URL}/api/v1/tips/{tip_id}", headers=headers)
-        if response.status_code == 200:
-            return True, "Tip deleted successfully."
-        else:
-            return False, response.json().get("detail", "Failed to delete tip")
-    except requests.exceptions.RequestException as e:
-        return False, f"Server communication error: {e}"
-
 # Asli application mein, yahan user ka role (e.g., 'admin') check karna chahiye
 # user_profile = get_user_profile(token)
 # if user_profile.get('role') != 'admin':
@@ -85,6 +41,24 @@ def load_tips_data(token_param):
 
 all_tips = load_tips_data(token)
 
+
+def render_tip(tip, key_prefix):
+    """ Ek tip ka card, delete button ke saath. """
+    with st.container(border=True):
+        cols = st.columns([4, 1])
+        with cols[0]:
+            st.markdown(f"**[{tip.get('category', 'General')}]**")
+            st.write(tip['tip_text'])
+        with cols[1]:
+            if st.button("Delete Tip", key=f"{key_prefix}_{tip['id']}", use_container_width=True, type="primary"):
+                is_deleted, msg = delete_health_tip(token, tip['id'])
+                if is_deleted:
+                    st.success("Tip deleted successfully!")
+                    st.cache_data.clear()
+                    st.rerun()
+                else:
+                    st.error(f"Failed to delete: {msg}")
+
 # --- 3. PAGE UI ---
 st.title("💡 Manage Health Tips")
 st.markdown("Is page ka istemal karke aap users ko unke dashboard par dikhne wali health tips ko jod ya hata sakte hain.")
@@ -123,25 +97,26 @@ with st.expander("➕ Add a New Health Tip", expanded=True):
 
 st.markdown("---")
 
+# Tip dhoondhne ke liye search (backend par full-text search, poori list scroll nahi karni padti)
+st.subheader("🔍 Search Health Tips")
+search_query = st.text_input("Search", placeholder="e.g., water, sleep, blood pressure", label_visibility="collapsed")
+if search_query.strip():
+    is_found, results = search_tips(token, search_query.strip())
+    if not is_found:
+        st.error(f"Search failed: {results}")
+    elif not results:
+        st.info("No tips match your search.")
+    else:
+        st.caption(f"Top {len(results)} matching tips, most relevant first.")
+        for tip in results:
+            render_tip(tip, "del_found_tip")
+
+st.markdown("---")
+
 # Pehle se maujood tips ko display karna
 st.subheader("All Saved Health Tips in the Database")
 if not all_tips:
     st.info("There are no health tips in the database yet. Add one using the form above.")
 else:
     for tip in reversed(all_tips): # reversed() taaki nayi tip sabse upar dikhe
-        with st.container(border=True):
-            cols = st.columns([4, 1])
-            with cols[0]:
-                st.markdown(f"**[{tip.get('category', 'General')}]**")
-                st.write(tip['tip_text'])
-            with cols[1]:
-                if st.button("Delete Tip", key=f"del_tip_{tip['id']}", use_container_width=True, type="primary"):
-                    is_deleted, msg = delete_health_tip(token, tip['id'])
-                    if is_deleted:
-                        st.success("Tip deleted successfully!")
-                        st.cache_data.clear()
-                        st.rerun()
-                    else:
-                        st.error(f"Failed to delete: {msg}")
-
-
+        render_tip(tip, "del_tip")
@@ -9,9 +9,11 @@ from auth.service import (
     TOKEN_COOKIE_NAME,
     get_appointments,
     add_appointment,
+    add_appointments_bulk,
     delete_appointment
 )
 from components.sidebar import authenticated_sidebar
+from components.batch import empty_table, editor_rows
 
 # --- 1. PAGE CONFIGURATION & AUTHENTICATION ---
 st.set_page_config(page_title="Manage Appointments", page_icon="🗓️", layout="wide")
@@ -93,6 +95,42 @@ with st.expander("➕ Add a New Appointment", expanded=True):
                 else:
                     st.error(f"Failed to add appointment: {message}")
 
+# Kai appointments ek saath jodne ke liye (ek hi request, sab ya kuch nahi)
+with st.expander("📋 Add Several Appointments at Once"):
+    st.caption("One row per appointment. Times are in IST, like the form above.")
+    appt_table = st.data_editor(
+        empty_table(["doctor_name", "date", "time", "location", "purpose"]),
+        num_rows="dynamic", use_container_width=True, key="batch_appts_editor",
+        column_config={
+            "doctor_name": st.column_config.TextColumn("Doctor's Name", required=True),
+            "date": st.column_config.DateColumn("Date", min_value=date.today(), required=True),
+            "time": st.column_config.TimeColumn("Time", format="hh:mm a", required=True),
+            "location": st.column_config.TextColumn("Location"),
+            "purpose": st.column_config.TextColumn("Purpose"),
+        },
+    )
+    if st.button("Add All Appointments", key="batch_appts_submit"):
+        rows = editor_rows(appt_table)
+        if not rows:
+            st.warning("Add at least one row to the table.")
+        elif any(not row["date"] or not row["time"] for row in rows):
+            st.warning("Every row needs a Date and a Time.")
+        else:
+            local_tz = pytz.timezone('Asia/Kolkata')
+            payloads = [{
+                "doctor_name": row["doctor_name"],
+                "appointment_datetime": local_tz.localize(datetime.combine(row["date"], row["time"])).isoformat(),
+                "location": row["location"],
+                "purpose": row["purpose"]
+            } for row in rows]
+            is_success, message = add_appointments_bulk(token, payloads)
+            if is_success:
+                st.success(message)
+                st.cache_data.clear()
+                st.rerun()
+            else:
+                st.error(f"Nothing was added. {message}")
+
 st.markdown("---")
 
 # Maujooda appointments ki list
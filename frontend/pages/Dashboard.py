@@ -4,9 +4,8 @@
 import streamlit as st
 from streamlit_cookies_manager import CookieManager
 import time
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timezone
 import pytz
-import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
@@ -14,7 +13,7 @@ import numpy as np
 import os # To handle file paths
 
 # Custom local imports
-from auth.service import TOKEN_COOKIE_NAME, get_dashboard_data, mark_medication_as_taken
+from auth.service import TOKEN_COOKIE_NAME, get_dashboard_data, mark_medication_as_taken, export_history
 from components.sidebar import authenticated_sidebar
 
 # --- 2. PAGE CONFIGURATION & INITIALIZATION ---
@@ -281,16 +280,18 @@ if dashboard_data is None:
 
 # --- 7. DATA EXTRACTION & PRE-PROCESSING ---
 summary_data = dashboard_data.get("summary", {})
+adherence_data = dashboard_data.get("adherence", {})
 meds_data = dashboard_data.get("medications_today", {})
 appt_data = dashboard_data.get("appointments", {})
 emergency_contacts = dashboard_data.get("emergency_contacts", [])
 health_tip = dashboard_data.get("health_tip", "Remember to stay hydrated and have a great day!")
 user_name = dashboard_data.get("user_full_name", "User")
 primary_contact = emergency_contacts[0] if emergency_contacts else None
-all_daily_meds = sorted(meds_data.get("all_daily", []), key=lambda x: x.get('specific_time') or "23:59")
+# Aaj due dawaiyan: Daily, aaj ke din wali Weekly aur aaj ki date wali Monthly
+due_today_meds = sorted(meds_data.get("due_today", []), key=lambda x: x.get('specific_time') or "23:59")
 taken_today_ids = set(meds_data.get("taken_ids", []))
-pending_meds = [med for med in all_daily_meds if med['id'] not in taken_today_ids]
-completed_meds = [med for med in all_daily_meds if med['id'] in taken_today_ids]
+pending_meds = [med for med in due_today_meds if med['id'] not in taken_today_ids]
+completed_meds = [med for med in due_today_meds if med['id'] in taken_today_ids]
 todays_appointments = appt_data.get("today", [])
 upcoming_appointments = appt_data.get("upcoming", [])
 
@@ -345,7 +346,24 @@ def render_left_panel():
         st.markdown("<p style='font-size: 1rem; color: white;'>Please add an emergency contact in your profile.</p>", unsafe_allow_html=True)
     st.markdown('</div>', unsafe_allow_html=True)
 
-    # NOTE: The "Weekly Adherence" card is now removed.
+    # ADHERENCE CARD (score aur trends backend ke adherence engine se aate hain)
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.markdown("<h5>📈 Medication Adherence</h5>", unsafe_allow_html=True)
+    score = summary_data.get("adherence_score")
+    if score is None:
+        st.info(summary_data.get("adherence_message", "No doses due yet."))
+    else:
+        st.metric("Last 30 days", f"{score}%")
+        st.caption(summary_data.get("adherence_message", ""))
+        trends = {window["days"]: window.get("adherence_ratio") for window in adherence_data.get("overall", {}).get("trend", [])}
+        trend_cols = st.columns(2)
+        for col, days in zip(trend_cols, (7, 90)):
+            ratio = trends.get(days)
+            col.metric(f"Last {days} days", f"{round(ratio * 100)}%" if ratio is not None else "–")
+        streak = adherence_data.get("overall", {}).get("current_streak", 0)
+        st.markdown(f"<small>🔥 Days in a row with every dose taken: <b>{streak}</b></small>", unsafe_allow_html=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+
     # NOTE: The "Health Metrics" card is now removed.
 
 def render_center_panel():
@@ -408,19 +426,22 @@ def render_right_panel():
     st.markdown(f"<h5>📄 Data & Reports</h5>", unsafe_allow_html=True)
     st.markdown("<small>Export your medication and appointment history for your doctor's visit.</small>", unsafe_allow_html=True)
     
-    med_history_df = pd.DataFrame({
-        'Date': [(datetime.now(IST) - timedelta(days=i)).strftime('%Y-%m-%d') for i in range(7)],
-        'Medication': ['Lisinopril', 'Metformin', 'Lisinopril', 'Atorvastatin', 'Metformin', 'Lisinopril', 'Metformin'],
-        'Status': ['Taken', 'Taken', 'Missed', 'Taken', 'Taken', 'Taken', 'Missed']
-    })
-    
-    st.download_button(
-        label="📥 Export Report (CSV)",
-        data=med_history_df.to_csv(index=False).encode('utf-8'),
-        file_name='wellness_report.csv',
-        mime='text/csv',
-        use_container_width=True
-    )
+    # Report backend se stream hota hai, aur sirf button dabane par (har rerun par nahi)
+    if st.button("📄 Prepare Report", use_container_width=True):
+        is_ready, report = export_history(token, "csv")
+        if is_ready:
+            st.session_state.history_report = report
+        else:
+            st.error(f"Could not export your history: {report}")
+
+    if st.session_state.get("history_report"):
+        st.download_button(
+            label="📥 Export Report (CSV)",
+            data=st.session_state.history_report,
+            file_name='health_history.csv',
+            mime='text/csv',
+            use_container_width=True
+        )
     st.markdown('</div>', unsafe_allow_html=True)
 
 # --- 9. MAIN LAYOUT & APP EXECUTION ---
@@ -7,9 +7,11 @@ from auth.service import (
     TOKEN_COOKIE_NAME,
     get_contacts,
     add_contact,
+    add_contacts_bulk,
     delete_contact
 )
 from components.sidebar import authenticated_sidebar
+from components.batch import empty_table, editor_rows
 
 # --- 1. PAGE CONFIGURATION & AUTHENTICATION ---
 st.set_page_config(page_title="Manage Emergency Contacts", page_icon="📞", layout="wide")
@@ -101,6 +103,30 @@ with st.expander("➕ Add a New Contact", expanded=True):
                     st.rerun()
                 else:
                     st.error(f"Failed to add contact: {message}")
+
+with st.expander("📋 Add Several Contacts at Once"):
+    st.caption("One row per contact. All rows are saved together, or none if any row has a problem.")
+    contact_table = st.data_editor(
+        empty_table(["contact_name", "phone_number", "relationship_type"]),
+        num_rows="dynamic", use_container_width=True, key="batch_contacts_editor",
+        column_config={
+            "contact_name": st.column_config.TextColumn("Contact's Full Name", required=True),
+            "phone_number": st.column_config.TextColumn("Phone Number", required=True),
+            "relationship_type": st.column_config.TextColumn("Relationship"),
+        },
+    )
+    if st.button("Add All Contacts", key="batch_contacts_submit", use_container_width=True):
+        rows = editor_rows(contact_table)
+        if not rows:
+            st.warning("Add at least one row to the table.")
+        else:
+            is_success, message = add_contacts_bulk(token, rows)
+            if is_success:
+                st.success(message)
+                st.cache_data.clear()
+                st.rerun()
+            else:
+                st.error(f"Nothing was added. {message}")
 st.markdown('</div>', unsafe_allow_html=True)
 
 
@@ -8,9 +8,11 @@ from auth.service import (
     TOKEN_COOKIE_NAME,
     get_medications,
     add_medication,
+    add_medications_bulk,
     delete_medication
 )
 from components.sidebar import authenticated_sidebar
+from components.batch import empty_table, editor_rows
 
 # --- 1. PAGE CONFIGURATION & AUTHENTICATION ---
 st.set_page_config(page_title="Manage Medications", page_icon="💊", layout="wide")
@@ -108,6 +110,52 @@ with st.expander("➕ Add a New Medication", expanded=True):
             else:
                 st.warning("Please fill in the Medication Name and Dosage.")
 
+# --- BATCH ADD: kai medications ek saath, ek hi request mein ---
+with st.expander("📋 Add Several Medications at Once"):
+    st.caption("One row per medication. Weekly: days separated by commas (e.g. Monday, Friday). Monthly: day of the month (e.g. 15).")
+    med_table = st.data_editor(
+        empty_table(["name", "dosage", "frequency_type", "frequency_details", "timing_type", "meal_timing", "specific_time"]),
+        num_rows="dynamic", use_container_width=True, key="batch_meds_editor",
+        column_config={
+            "name": st.column_config.TextColumn("Medication Name", required=True),
+            "dosage": st.column_config.TextColumn("Dosage", required=True),
+            "frequency_type": st.column_config.SelectboxColumn("Frequency", options=["Daily", "Weekly", "Monthly", "As Needed"], default="Daily"),
+            "frequency_details": st.column_config.TextColumn("Days"),
+            "timing_type": st.column_config.SelectboxColumn("Timing", options=["Meal-Related", "Specific Time"], default="Meal-Related"),
+            "meal_timing": st.column_config.SelectboxColumn("Meal Timing", options=["Before Breakfast", "After Breakfast", "Before Lunch", "After Lunch", "Before Dinner", "After Dinner", "Bedtime"]),
+            "specific_time": st.column_config.TimeColumn("Time", format="hh:mm a"),
+        },
+    )
+    if st.button("Add All Medications", key="batch_meds_submit"):
+        payloads = []
+        for row in editor_rows(med_table):
+            details = row["frequency_details"]
+            if details is not None and row["frequency_type"] == "Weekly":
+                details = [d.strip().title() for d in str(details).split(",") if d.strip()]
+            elif details is not None and row["frequency_type"] == "Monthly":
+                details = int(details) if str(details).strip().isdigit() else details
+            else:
+                details = None
+            specific_time = row["specific_time"].isoformat() if row["timing_type"] == "Specific Time" and row["specific_time"] else None
+            payloads.append({
+                "name": row["name"], "dosage": row["dosage"],
+                "timing_type": row["timing_type"] or "Meal-Related",
+                "meal_timing": row["meal_timing"] if row["timing_type"] != "Specific Time" else None,
+                "specific_time": specific_time,
+                "frequency_type": row["frequency_type"] or "Daily",
+                "frequency_details": details
+            })
+        if not payloads:
+            st.warning("Add at least one row to the table.")
+        else:
+            is_added, msg = add_medications_bulk(token, payloads)
+            if is_added:
+                st.success(msg)
+                st.cache_data.clear()
+                st.rerun()
+            else:
+                st.error(f"Nothing was added. {msg}")
+
 st.markdown("---")
 
 # --- DISPLAY EXISTING MEDICATIONS (COMPLETED SECTION) ---